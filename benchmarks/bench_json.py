@@ -0,0 +1,80 @@
+"""
+Compare ``to_json`` (``asdict`` then ``json.dumps``) with the streaming ``iter_json``.
+
+Usage::
+
+    python benchmarks/bench_json.py [--number N] [--items N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import timeit
+import tracemalloc
+
+from attrs import define
+
+from xattrs import serde
+from xattrs.preconf.json import dump, to_json
+
+
+@define
+class Item:
+    item_id: int
+    name: str
+    price: float
+    tags: list[str]
+
+
+@serde(rename="camelCase")
+@define
+class Response:
+    request_id: str
+    items: list[Item]
+
+
+def make_response(num_items: int) -> Response:
+    return Response(
+        "req", [Item(i, f"item-{i}", i * 0.5, ["a", "b"]) for i in range(num_items)]
+    )
+
+
+def peak_memory(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument("--items", type=int, default=100_000)
+    args = parser.parse_args()
+
+    response = make_response(args.items)
+    funcs = {
+        "to_json": lambda: to_json(response),
+        "dump (StringIO)": lambda: dump(response, io.StringIO()),
+        "dump (null file)": lambda: dump(response, NullWriter()),
+    }
+
+    print(f"{'func':<20}{'time':>12}{'peak memory':>16}")
+    for name, func in funcs.items():
+        timing = timeit.timeit(func, number=args.number) / args.number
+        peak = peak_memory(func)
+        print(f"{name:<20}{timing * 1e3:>10.1f}ms{peak / 2**20:>14.1f}MiB")
+
+
+class NullWriter:
+    """Discard the output to measure the encoder alone."""
+
+    def write(self, s: str) -> int:
+        return len(s)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Compare the engines of ``asdict`` / ``astuple`` / ``astree`` on wide and deep trees.
+
+Usage::
+
+    python benchmarks/bench_struct_engines.py [--number N]
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import argparse
+import sys
+import timeit
+
+from attrs import define
+
+from xattrs import asdict, astree, astuple
+
+
+@define
+class Leaf:
+    a: int
+    b: str
+    c: float
+
+
+@define
+class Node:
+    value: int
+    children: Any
+
+
+def wide_tree(width: int = 1_000) -> Node:
+    """One node with many leaf children."""
+    return Node(0, [Leaf(i, str(i), float(i)) for i in range(width)])
+
+
+def deep_tree(depth: int = 200) -> Node:
+    """A linked list of nodes, kept below the default recursion limit."""
+    node: Any = None
+    for i in range(depth):
+        node = Node(i, node)
+    return node
+
+
+def balanced_tree(depth: int = 10, fanout: int = 2) -> Node | Leaf:
+    if depth == 0:
+        return Leaf(depth, "leaf", 0.0)
+    return Node(depth, [balanced_tree(depth - 1, fanout) for _ in range(fanout)])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    trees = {"wide": wide_tree(), "deep": deep_tree(), "balanced": balanced_tree()}
+    funcs = {"asdict": asdict, "astuple": astuple, "astree": astree}
+    engines = ("recursive", "iterative", "codegen")
+
+    print(f"{'tree':<10}{'func':<10}" + "".join(f"{e:>12}" for e in engines))
+    for tree_name, tree in trees.items():
+        for func_name, func in funcs.items():
+            timings = [
+                timeit.timeit(
+                    lambda tree=tree, func=func, engine=engine: func(
+                        tree, engine=engine
+                    ),
+                    number=args.number,
+                )
+                / args.number
+                for engine in engines
+            ]
+            print(
+                f"{tree_name:<10}{func_name:<10}"
+                + "".join(f"{t * 1e3:>10.3f}ms" for t in timings)
+            )
+
+    depth = sys.getrecursionlimit() * 10
+    timing = timeit.timeit(
+        lambda: asdict(deep_tree(depth), engine="iterative"), number=1
+    )
+    print(
+        f"asdict of a {depth} levels deep tree (iterative only): {timing * 1e3:.3f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Measure flatten / unflatten throughput of classes registered by `xattrs.attrs.define`.
+
+Usage::
+
+    python benchmarks/bench_tree.py [--number N] [--instances N] [--width N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from xattrs._tree import flatten, unflatten
+from xattrs.attrs import define
+
+
+@define
+class Point:
+    x: float
+    y: float
+    z: float
+
+
+def wide_class(width: int) -> type:
+    """A class with ``width`` fields."""
+    names = [f"f{i}" for i in range(width)]
+    return define(type("Wide", (), {"__annotations__": dict.fromkeys(names, "int")}))
+
+
+def report(name: str, number: int, count: int, func) -> None:
+    timing = timeit.timeit(func, number=number) / number
+    print(f"{name:<32}{timing * 1e3:>10.3f}ms{count / timing:>16,.0f} nodes/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=5)
+    parser.add_argument("--instances", type=int, default=1_000_000)
+    parser.add_argument("--width", type=int, default=1_000)
+    args = parser.parse_args()
+
+    wide_cls = wide_class(args.width)
+    wide = [wide_cls(*range(args.width)) for _ in range(100)]
+    leaves, treespec = flatten(wide)
+    report("flatten (wide x 100)", args.number, 100, lambda: flatten(wide))
+    report(
+        "unflatten (wide x 100)", args.number, 100, lambda: unflatten(treespec, leaves)
+    )
+
+    points = [Point(i, i, i) for i in range(args.instances)]
+    leaves, treespec = flatten(points)
+    report(
+        f"flatten ({args.instances:,} points)",
+        1,
+        args.instances,
+        lambda: flatten(points),
+    )
+    report(
+        f"unflatten ({args.instances:,} points)",
+        1,
+        args.instances,
+        lambda: unflatten(treespec, leaves),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,20 @@ from xattrs._compat.typing import TYPE_CHECKING, Callable
 from attr import dataclass
 from attrs import define, evolve, field, fields, frozen, mutable
 
+from xattrs._columns import from_columns, to_columns
+from xattrs._de_funcs import fromdict, fromtuple, get_unknown_fields
+from xattrs._events import iter_events
 from xattrs._serde import serde
-from xattrs._struct_funcs import asdict, astree, astuple
+from xattrs._struct_funcs import (
+    asdict,
+    asdict_many,
+    astree,
+    astuple,
+    astuple_many,
+    get_default_engine,
+    set_default_engine,
+)
+from xattrs._tree import tree_map
 
 if TYPE_CHECKING:
     from xattrs._typing import Decorator, P, R_co
@@ -15,18 +27,29 @@ if TYPE_CHECKING:
 
 __all__ = (
     "asdict",
+    "asdict_many",
     "astree",
     "astuple",
+    "astuple_many",
     "dataclass",
     "define",
     "derive",
     "evolve",
     "field",
     "fields",
+    "from_columns",
+    "fromdict",
+    "fromtuple",
     "frozen",
+    "get_default_engine",
+    "get_unknown_fields",
+    "iter_events",
     "mutable",
     "replace",
     "serde",
+    "set_default_engine",
+    "to_columns",
+    "tree_map",
 )
 
 replace = evolve
@@ -0,0 +1,189 @@
+# SPDX-License-Identifier: MIT
+"""
+Generate specialized ``asdict`` functions per class from serialization plans.
+
+Inspired by how ``attrs`` generates ``__init__`` / ``__repr__`` methods: the
+source is rendered once per class and scope, registered in ``linecache`` for
+readable tracebacks, then executed.
+"""
+
+from __future__ import annotations
+
+from xattrs._compat.typing import Any, Callable
+from xattrs.typing import FilterCallable, KeyConverter, SerializeFunc
+
+import linecache
+from collections import defaultdict
+
+from xattrs._plan import _AS_DICT, _get_ser_plan, _SerPlan
+from xattrs._types import _ATOMIC_TYPES
+from xattrs._uni import _is_data_class_like_instance
+from xattrs.converters import identity
+from xattrs.filters import keep_include
+
+_ARGS = "dict_factory, filter_, key_serializer, value_serializer, copy, memo"
+
+
+def _generate_unique_filename(cls: type, func_name: str) -> str:
+    """Create a "filename" suitable for a function being generated."""
+    return (
+        f"<xattrs generated {func_name} {cls.__module__}."
+        f"{getattr(cls, '__qualname__', cls.__name__)}>"
+    )
+
+
+def _linecache_and_compile(
+    script: str, filename: str, globs: dict[str, Any]
+) -> dict[str, Any]:
+    """Cache the script with ``linecache``, compile it and return the locals."""
+    locs: dict[str, Any] = {}
+
+    # Add a fake linecache entry, so debuggers and tracebacks could show the
+    # generated source. Bump the filename if the same one was used for a
+    # different script (e.g. a re-defined class or a different scope).
+    count = 1
+    base_filename = filename
+    while True:
+        linecache_tuple = (len(script), None, script.splitlines(True), filename)
+        old_val = linecache.cache.setdefault(filename, linecache_tuple)
+        if old_val == linecache_tuple:
+            break
+        filename = f"{base_filename[:-1]}-{count}>"
+        count += 1
+
+    eval(compile(script, filename, "exec"), globs, locs)  # noqa: S307
+    return locs
+
+
+def _value_expr(var: str) -> str:
+    return f"{var} if type({var}) in _atomic else _inner({var}, {_ARGS})"
+
+
+def _make_asdict_script(cls: type, plan: _SerPlan) -> tuple[str, dict[str, Any]]:
+    globs: dict[str, Any] = {"_atomic": _ATOMIC_TYPES, "_inner": _asdict_compiled}
+    lines = [f"def asdict(inst, {_ARGS}):"]
+
+    if hasattr(cls, _AS_DICT):
+        globs["_ks"] = plan.key_serializer or identity
+        lines.append(
+            f"    return dict_factory((_ks(k), {_value_expr('v')}) "
+            f"for k, v in inst.{_AS_DICT}().items())"
+        )
+        return "\n".join(lines) + "\n", globs
+
+    # Inline the leading run of unconditional fields as a dict literal, then
+    # assign the remaining ones one by one to keep the order of fields.
+    literal: list[str] = []
+    rest: list[str] = []
+    if plan.tag is not None:
+        globs["_tag_field"], globs["_tag"] = plan.tag
+        literal.append("        _tag_field: _tag,")
+    for i, fp in enumerate(plan.fields):
+        var = f"_{i}"
+        if isinstance(fp.key, str):
+            key = repr(fp.key)
+        else:
+            key = f"_key_{i}"
+            globs[key] = fp.key
+
+        if fp.filter is keep_include:
+            if not rest:
+                lines.append(f"    {var} = inst.{fp.name}")
+                literal.append(f"        {key}: {_value_expr(var)},")
+            else:
+                rest.append(f"    {var} = inst.{fp.name}")
+                rest.append(f"    result[{key}] = {_value_expr(var)}")
+        else:
+            globs[f"_filter_{i}"] = fp.filter
+            globs[f"_field_{i}"] = fp.field
+            rest.append(f"    {var} = inst.{fp.name}")
+            rest.append(f"    if _filter_{i}(_field_{i}, {var}):")
+            rest.append(f"        result[{key}] = {_value_expr(var)}")
+
+    lines.append("    result = {")
+    lines.extend(literal)
+    lines.append("    }")
+    lines.extend(rest)
+    lines.append("    if dict_factory is dict:")
+    lines.append("        return result")
+    lines.append("    return dict_factory(result.items())")
+    return "\n".join(lines) + "\n", globs
+
+
+def _make_asdict_func(cls: type, plan: _SerPlan) -> Callable[..., Any]:
+    """Generate the specialized ``asdict`` function of ``cls`` for ``plan``."""
+    script, globs = _make_asdict_script(cls, plan)
+    filename = _generate_unique_filename(cls, "asdict")
+    return _linecache_and_compile(script, filename, globs)["asdict"]  # type: ignore[no-any-return]
+
+
+def _asdict_compiled(
+    inst: Any,
+    dict_factory: Callable[..., Any],
+    filter_: FilterCallable[Any] | None,
+    key_serializer: KeyConverter | None,
+    value_serializer: SerializeFunc[Any, Any] | None,
+    copy: Callable[[Any], Any],
+    memo: dict[int, tuple[Any, Any]] | None,
+) -> Any:
+    cls = type(inst)
+    if cls in _ATOMIC_TYPES:
+        return inst
+    elif memo is None:
+        return _asdict_compiled_node(
+            inst, dict_factory, filter_, key_serializer, value_serializer, copy, memo
+        )
+
+    # hold on ``inst`` in memo as well, so its id could not be reused
+    hit = memo.get(id(inst))
+    if hit is not None and hit[0] is inst:
+        return hit[1]
+    result = _asdict_compiled_node(
+        inst, dict_factory, filter_, key_serializer, value_serializer, copy, memo
+    )
+    memo[id(inst)] = (inst, result)
+    return result
+
+
+def _asdict_compiled_node(
+    inst: Any,
+    dict_factory: Callable[..., Any],
+    filter_: FilterCallable[Any] | None,
+    key_serializer: KeyConverter | None,
+    value_serializer: SerializeFunc[Any, Any] | None,
+    copy: Callable[[Any], Any],
+    memo: dict[int, tuple[Any, Any]] | None,
+) -> Any:
+    cls = type(inst)
+    args = (filter_, key_serializer, value_serializer, copy, memo)
+
+    if _is_data_class_like_instance(inst):
+        plan = _get_ser_plan(cls, filter_, key_serializer)
+        func = plan.asdict_func
+        if func is None:
+            func = plan.asdict_func = _make_asdict_func(cls, plan)
+        return func(inst, dict_factory, *args)
+    elif isinstance(inst, tuple) and hasattr(inst, "_fields"):
+        # instance is a namedtuple.
+        return cls(*(_asdict_compiled(v, dict_factory, *args) for v in inst))
+    elif isinstance(inst, (list, tuple)):
+        return cls(_asdict_compiled(v, dict_factory, *args) for v in inst)
+    elif isinstance(inst, dict):
+        if isinstance(inst, defaultdict):
+            # inst is a defaultdict, which requires the default_factory as its
+            # first arg.
+            result = cls(inst.default_factory)
+            for k, v in inst.items():
+                result[_asdict_compiled(k, dict_factory, *args)] = _asdict_compiled(
+                    v, dict_factory, *args
+                )
+            return result
+        return cls(
+            (
+                _asdict_compiled(k, dict_factory, *args),
+                _asdict_compiled(v, dict_factory, *args),
+            )
+            for k, v in inst.items()
+        )
+    else:
+        return copy(inst)
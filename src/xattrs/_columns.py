@@ -0,0 +1,146 @@
+# SPDX-License-Identifier: MIT
+"""
+Columnar (struct of arrays) export of collections of dataclass-like instances.
+"""
+
+from __future__ import annotations
+
+from xattrs._compat.typing import (
+    Any,
+    Callable,
+    Iterable,
+    Mapping,
+    MutableSequence,
+    Sequence,
+)
+from xattrs._typing import T
+
+from array import array
+from copy import deepcopy
+
+from xattrs._de_funcs import _field_converter, _fromdict_inner
+from xattrs._plan import _get_de_plan, _get_ser_plan
+from xattrs._struct_funcs import _asdict_inner
+from xattrs._typedesc import _ClassDesc, _describe, _unwrap
+from xattrs._types import _ATOMIC_TYPES
+from xattrs._uni import _field_types, _is_data_class_like
+from xattrs.converters import identity
+from xattrs.filters import keep_include
+
+__all__ = ("from_columns", "to_columns")
+
+# typecodes of `array.array` for fields annotated with exactly these types, or
+# ``NewType`` / ``Annotated`` of them
+_ARRAY_TYPECODES: dict[Any, str] = {int: "q", float: "d"}
+
+
+def _array_type(tp: Any) -> type | None:
+    """Return the type of the values of a column packed into `array.array`."""
+    desc = _unwrap(_describe(tp))
+    if isinstance(desc, _ClassDesc) and desc.cls in _ARRAY_TYPECODES:
+        return desc.cls
+    return None
+
+
+def to_columns(
+    insts: Iterable[T],
+    cls: type[T],
+    *,
+    filter=None,
+    key_serializer=None,
+    copy=deepcopy,
+    arrays: bool = True,
+) -> dict[Any, MutableSequence[Any]]:
+    """
+    Convert instances of ``cls`` into a mapping of output keys to columns.
+
+    Keys and filters are resolved the same way as `asdict`. A field excluded by
+    its filter for some instances is set to ``None`` for them, and dropped if it
+    is excluded for all instances. Nested values are converted with `asdict`.
+
+    If ``arrays`` is true, columns of fields annotated as ``int`` or ``float``
+    are filled as `array.array` while all of their values are of exactly that
+    type, and converted to lists at the first value which is not.
+    """
+    if not _is_data_class_like(cls):
+        raise TypeError(f"Expected a dataclass-like type, got {cls!r}")
+
+    plan = _get_ser_plan(cls, filter, key_serializer)
+    fields = plan.fields
+    types = _field_types(cls) if arrays else {}
+    # the type of values of packed columns, None once a column is a list
+    packed = [_array_type(types.get(fp.name)) for fp in fields]
+    columns: list[MutableSequence[Any]] = [
+        array(_ARRAY_TYPECODES[tp]) if tp else [] for tp in packed
+    ]
+    included = [False] * len(fields)
+    args = (filter, key_serializer, None, copy or identity, None)
+
+    num_rows = 0
+    for inst in insts:
+        if not isinstance(inst, cls):
+            raise TypeError(f"Expected an instance of {cls!r}, got {type(inst)!r}")
+        num_rows += 1
+        for i, fp in enumerate(fields):
+            value = getattr(inst, fp.name)
+            if fp.filter is not keep_include and not fp.filter(fp.field, value):
+                value = None
+            else:
+                included[i] = True
+                if type(value) not in _ATOMIC_TYPES:
+                    value = _asdict_inner(value, dict, *args)
+            column = columns[i]
+            if packed[i] is not None:
+                if type(value) is packed[i]:
+                    try:
+                        column.append(value)
+                        continue
+                    except OverflowError:
+                        pass
+                # values do not follow the annotation (e.g. ``None``, a bool
+                # or a big int)
+                column = columns[i] = column.tolist()  # type: ignore[attr-defined]
+                packed[i] = None
+            column.append(value)
+
+    return {
+        fp.key: column
+        for fp, column, is_included in zip(fields, columns, included)
+        if is_included or not num_rows
+    }
+
+
+def from_columns(
+    columns: Mapping[Any, Sequence[Any]], cls: type[T], *, key_serializer=None
+) -> list[T]:
+    """
+    Construct instances of ``cls`` from columns produced by `to_columns`.
+
+    Columns are matched to fields by their output keys, and values are
+    converted according to the type hints of fields the same way as
+    `fromdict`, e.g. nested dataclass-like classes are constructed from dicts.
+    ``None`` values, the holes of excluded fields, are passed as they are.
+    Fields without a column fall back to their defaults.
+    """
+    if not _is_data_class_like(cls):
+        raise TypeError(f"Expected a dataclass-like type, got {cls!r}")
+
+    def struct(nested: type) -> Callable[[Any], Any]:
+        return lambda v: _fromdict_inner(v, nested, key_serializer, False)
+
+    names: list[str] = []
+    cols: list[Sequence[Any]] = []
+    for fp in _get_de_plan(cls, key_serializer).fields:
+        if fp.key not in columns or fp.init_name is None:
+            continue
+        names.append(fp.init_name)
+        col = columns[fp.key]
+        conv = _field_converter(fp, struct, key_serializer)
+        if conv is not None:
+            col = [value if value is None else conv(value) for value in col]
+        cols.append(col)
+
+    if len({len(col) for col in cols}) > 1:
+        raise ValueError("All columns must have the same length.")
+
+    return [cls(**dict(zip(names, row))) for row in zip(*cols)]
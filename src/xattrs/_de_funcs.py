@@ -0,0 +1,651 @@
+# SPDX-License-Identifier: MIT
+"""
+Construct dataclass-like instances from the output of `asdict` / `astuple`.
+
+Type hints of a class are resolved once into a deserialization plan. A
+specialized constructor function is generated from the plan, so every
+following call only looks up keys, converts values and calls ``__init__``.
+"""
+
+from __future__ import annotations
+
+from types import MappingProxyType, MemberDescriptorType
+from xattrs._compat.typing import TYPE_CHECKING, Any, Callable, Mapping
+from xattrs._typing import T
+from xattrs.typing import KeyConverter
+
+import weakref
+from collections import defaultdict
+from dataclasses import MISSING, Field
+
+from attrs import NOTHING, Factory
+
+from xattrs._codegen import _generate_unique_filename, _linecache_and_compile
+from xattrs._plan import (
+    _FROM_DICT,
+    _FROM_TUPLE,
+    _DeFieldPlan,
+    _DePlan,
+    _get_de_plan,
+    _get_union_plan,
+)
+from xattrs._serde import _get_tag_table
+from xattrs._typedesc import (
+    _AnnotatedDesc,
+    _AnyDesc,
+    _ClassDesc,
+    _EnumDesc,
+    _MappingDesc,
+    _NewTypeDesc,
+    _OptionalDesc,
+    _SequenceDesc,
+    _StructDesc,
+    _TupleDesc,
+    _TypeDesc,
+    _UnionDesc,
+    _unwrap,
+)
+from xattrs._uni import _is_data_class_like
+from xattrs.converters import identity
+from xattrs.exceptions import DeserializeError
+
+if TYPE_CHECKING:
+    from attrs import Attribute
+
+__all__ = ("fromdict", "fromtuple", "get_unknown_fields")
+
+_Converter = Callable[[Any], Any]
+
+
+def _gen_converter(
+    desc: _TypeDesc,
+    struct: Callable[[type], _Converter],
+    key_serializer: KeyConverter | None = None,
+) -> _Converter | None:
+    """
+    Return a function converting input values into the type of ``desc``, or
+    None if values are used as they are.
+
+    Nested dataclass-like classes are converted by the function returned from
+    ``struct``. Mappings in unions other than ``Optional[T]`` are discriminated
+    among the dataclass-like arms by tag or by keys, other values are used as
+    they are.
+    """
+    if isinstance(desc, _StructDesc):
+        return struct(desc.cls)
+    elif isinstance(desc, _EnumDesc):
+        return desc.cls
+    elif isinstance(desc, _AnnotatedDesc):
+        return _gen_converter(desc.inner, struct, key_serializer)
+    elif isinstance(desc, _NewTypeDesc):
+        return _gen_converter(desc.supertype, struct, key_serializer)
+    elif isinstance(desc, _OptionalDesc):
+        inner_conv = _gen_converter(desc.inner, struct, key_serializer)
+        if inner_conv is None:
+            return None
+        return lambda v: None if v is None else inner_conv(v)
+    elif isinstance(desc, _TupleDesc):
+        convs = [
+            _gen_converter(item, struct, key_serializer) or identity
+            for item in desc.items
+        ]
+        num = len(convs)
+
+        def convert_tuple(v: Any) -> tuple[Any, ...]:
+            if len(v) != num:
+                raise DeserializeError(f"Expected {num} values, got {len(v)}")
+            return tuple([conv(x) for conv, x in zip(convs, v)])
+
+        return convert_tuple
+    elif isinstance(desc, _SequenceDesc):
+        cls = desc.container
+        conv = _gen_converter(desc.item, struct, key_serializer)
+        if conv is None:
+            return None if cls is list else cls
+        return lambda v: cls([conv(x) for x in v])
+    elif isinstance(desc, _MappingDesc):
+        cls = desc.container
+        key_conv = _gen_converter(desc.key, struct, key_serializer)
+        val_conv = _gen_converter(desc.value, struct, key_serializer)
+        if cls is defaultdict:
+            return _gen_defaultdict_converter(desc, key_conv, val_conv)
+        if key_conv is None and val_conv is None:
+            return None if cls is dict else cls
+        key_conv = key_conv or identity
+        val_conv = val_conv or identity
+        return lambda v: cls({key_conv(k): val_conv(x) for k, x in v.items()})
+    elif isinstance(desc, _UnionDesc):
+        return _gen_union_converter(desc, struct, key_serializer)
+    return None
+
+
+def _default_factory(desc: _TypeDesc) -> Callable[[], Any] | None:
+    """
+    Return the ``default_factory`` for values of ``desc``: the class of
+    containers and of builtin types, e.g. ``list`` or ``int``, else None.
+    """
+    desc = _unwrap(desc)
+    if isinstance(desc, (_SequenceDesc, _MappingDesc)):
+        return desc.container
+    elif isinstance(desc, _ClassDesc) and desc.cls.__module__ == "builtins":
+        return desc.cls
+    return None
+
+
+def _gen_defaultdict_converter(
+    desc: _MappingDesc, key_conv: _Converter | None, val_conv: _Converter | None
+) -> _Converter:
+    """
+    Return a function converting mappings into ``defaultdict``. The
+    ``default_factory`` of input defaultdicts is kept, other inputs get the one
+    of the value type.
+    """
+    factory = _default_factory(desc.value)
+    key_conv = key_conv or identity
+    val_conv = val_conv or identity
+
+    def convert_defaultdict(v: Any) -> defaultdict[Any, Any]:
+        return defaultdict(
+            getattr(v, "default_factory", factory),
+            {key_conv(k): val_conv(x) for k, x in v.items()},
+        )
+
+    return convert_defaultdict
+
+
+def _gen_union_converter(
+    desc: _UnionDesc,
+    struct: Callable[[type], _Converter],
+    key_serializer: KeyConverter | None,
+) -> _Converter | None:
+    """
+    Return a function picking the dataclass-like arm of ``desc`` for mappings.
+
+    Arms are looked up by tag first, then by the keys of mappings according to
+    the structural discriminators of `_UnionPlan`. No arm is tried and failed.
+    Raises `DeserializeError` if no arm matches, unless other arms of the union
+    accept mappings as they are, e.g. ``dict[str, Any]``.
+    """
+    plan = _get_union_plan(desc, key_serializer)
+    if plan is None:
+        return None
+    bases = plan.arms
+    convs = {arm: struct(arm) for arm in bases}
+    discriminators = {key: convs[arm] for key, arm in plan.discriminators.items()}
+    fallbacks = [(required, convs[arm]) for required, arm in plan.fallbacks]
+    passthrough = any(_accepts_mapping(arm) for arm in desc.arms)
+    names = ", ".join(arm.__qualname__ for arm in bases)
+
+    def convert(v: Any) -> Any:
+        if not isinstance(v, Mapping):
+            return v
+        if table := _get_tag_table(bases):
+            if (cls := _resolve_tag(table, v)) is not None:
+                return struct(cls)(v)
+            elif any(tag_field in v for tag_field in table):
+                # tagged by an unknown tag, do not guess by keys
+                if passthrough:
+                    return v
+                tags = {f: v[f] for f in table if f in v}
+                raise DeserializeError(f"Unknown tag {tags!r} for {names}")
+        for key in v:
+            if (conv := discriminators.get(key)) is not None:
+                return conv(v)
+        keys = v.keys()
+        for required, conv in fallbacks:
+            if required <= keys:
+                return conv(v)
+        if passthrough:
+            return v
+        raise DeserializeError(f"No arm of {names} matches the keys {list(keys)!r}")
+
+    return convert
+
+
+def _accepts_mapping(desc: _TypeDesc) -> bool:
+    """Return True if mappings are values of ``desc`` as they are."""
+    desc = _unwrap(desc)
+    if isinstance(desc, _ClassDesc):
+        return desc.cls is object or issubclass(desc.cls, Mapping)
+    return isinstance(desc, (_AnyDesc, _MappingDesc))
+
+
+def _field_converter(
+    plan_field: _DeFieldPlan,
+    struct: Callable[[type], _Converter],
+    key_serializer: KeyConverter | None = None,
+) -> _Converter | None:
+    # ``converter_from`` of field metadata takes precedence over the type
+    converter_from = plan_field.field.metadata.get("converter_from")
+    if converter_from is not None:
+        return converter_from  # type: ignore[no-any-return]
+    return _gen_converter(plan_field.type, struct, key_serializer)
+
+
+def _make_fromdict_func(
+    cls: type, plan: _DePlan, key_serializer: KeyConverter | None
+) -> Callable[[Mapping[Any, Any], type], Any]:
+    """Generate the specialized ``fromdict`` function of ``cls`` for ``plan``."""
+
+    def struct(nested: type) -> _Converter:
+        return lambda v: _fromdict_inner(v, nested, key_serializer, False)
+
+    globs: dict[str, Any] = {"_missing": _missing_field, "_NOTHING": _NOTHING}
+    head, tail = _unknown_fields_lines(cls, plan, globs)
+    lines = ["def fromdict(data, _cls):", *head]
+    required: list[str] = []
+    optional: list[str] = []
+    args: list[str] = []
+    for i, fp in enumerate(plan.fields):
+        if fp.init_name is None:
+            continue
+        var = f"_{i}"
+        key, *aliases = _input_keys(i, fp, globs)
+
+        value = var
+        if (conv := _field_converter(fp, struct, key_serializer)) is not None:
+            globs[f"_conv_{i}"] = conv
+            value = f"_conv_{i}({var})"
+
+        if fp.required and not aliases:
+            required.append(f"        {var} = data[{key}]")
+            args.append(f"{fp.init_name}={value}")
+        elif fp.required:
+            lines.extend(_lookup_lines(var, key, aliases))
+            lines.append(f"    if {var} is _NOTHING:")
+            lines.append(f"        raise _missing(_cls, {key})")
+            args.append(f"{fp.init_name}={value}")
+        elif not aliases:
+            optional.append(
+                f"    if ({var} := data.get({key}, _NOTHING)) is not _NOTHING:"
+            )
+            optional.append(f"        kwargs[{fp.init_name!r}] = {value}")
+        else:
+            optional.extend(_lookup_lines(var, key, aliases))
+            optional.append(f"    if {var} is not _NOTHING:")
+            optional.append(f"        kwargs[{fp.init_name!r}] = {value}")
+
+    if required:
+        lines.append("    try:")
+        lines.extend(required)
+        lines.append("    except KeyError as e:")
+        lines.append("        raise _missing(_cls, e.args[0]) from None")
+    if optional:
+        lines.append("    kwargs = {}")
+        lines.extend(optional)
+        args.append("**kwargs")
+    lines.append(f"    inst = _cls({', '.join(args)})")
+    lines.extend(tail)
+    lines.append("    return inst")
+
+    script = "\n".join(lines) + "\n"
+    filename = _generate_unique_filename(cls, "fromdict")
+    return _linecache_and_compile(script, filename, globs)["fromdict"]  # type: ignore[no-any-return]
+
+
+def _field_default(f: Field[Any] | Attribute[Any]) -> tuple[str, Any]:
+    """Return how to compute the default of ``f``: a value, a factory or none."""
+    if isinstance(f, Field):
+        if f.default_factory is not MISSING:
+            return "factory", f.default_factory
+        elif f.default is not MISSING:
+            return "value", f.default
+    elif isinstance(f.default, Factory):  # type: ignore[arg-type]
+        factory: Any = f.default
+        return "factory_self" if factory.takes_self else "factory", factory.factory
+    elif f.default is not NOTHING:
+        return "value", f.default
+    return "none", None
+
+
+def _make_fromdict_trusted_func(
+    cls: type, plan: _DePlan, key_serializer: KeyConverter | None
+) -> Callable[[Mapping[Any, Any], type], Any]:
+    """
+    Generate the ``fromdict`` function of ``cls`` which bypasses ``__init__``.
+
+    The instance is created by ``object.__new__`` and fields are assigned one by
+    one in order, through slot descriptors or the instance ``__dict__``, which
+    works for frozen classes as well. Converters, validators and post init hooks
+    of ``cls`` are not run. Missing fields fall back to their defaults.
+    """
+
+    def struct(nested: type) -> _Converter:
+        return lambda v: _fromdict_inner(v, nested, key_serializer, True)
+
+    globs: dict[str, Any] = {
+        "_new": object.__new__,
+        "_setattr": object.__setattr__,
+        "_missing": _missing_field,
+        "_NOTHING": _NOTHING,
+    }
+    head, tail = _unknown_fields_lines(cls, plan, globs)
+    lines = ["def fromdict(data, _cls):", *head, "    inst = _new(_cls)"]
+    slotted = {
+        fp.name
+        for fp in plan.fields
+        if isinstance(getattr(cls, fp.name, None), MemberDescriptorType)
+    }
+    if len(slotted) < len(plan.fields):
+        lines.append("    _dict = inst.__dict__")
+
+    for i, fp in enumerate(plan.fields):
+        var = f"_{i}"
+        key, *aliases = _input_keys(i, fp, globs)
+
+        value = var
+        if (conv := _field_converter(fp, struct, key_serializer)) is not None:
+            globs[f"_conv_{i}"] = conv
+            value = f"_conv_{i}({var})"
+
+        if fp.name in slotted:
+            assign = f"_setattr(inst, {fp.name!r}, {{}})"
+        else:
+            assign = f"_dict[{fp.name!r}] = {{}}"
+
+        if fp.required and not aliases:
+            lines.append("    try:")
+            lines.append(f"        {var} = data[{key}]")
+            lines.append("    except KeyError as e:")
+            lines.append("        raise _missing(_cls, e.args[0]) from None")
+            lines.append(f"    {assign.format(value)}")
+            continue
+        elif fp.required:
+            lines.extend(_lookup_lines(var, key, aliases))
+            lines.append(f"    if {var} is _NOTHING:")
+            lines.append(f"        raise _missing(_cls, {key})")
+            lines.append(f"    {assign.format(value)}")
+            continue
+
+        if aliases:
+            lines.extend(_lookup_lines(var, key, aliases))
+            lines.append(f"    if {var} is not _NOTHING:")
+        else:
+            lines.append(
+                f"    if ({var} := data.get({key}, _NOTHING)) is not _NOTHING:"
+            )
+        lines.append(f"        {assign.format(value)}")
+        kind, default = _field_default(fp.field)
+        if kind == "none":
+            # same as ``__init__``, leave fields without any default unset
+            continue
+        lines.append("    else:")
+        globs[f"_default_{i}"] = default
+        if kind == "value":
+            lines.append(f"        {assign.format(f'_default_{i}')}")
+        elif kind == "factory":
+            lines.append(f"        {assign.format(f'_default_{i}()')}")
+        else:
+            lines.append(f"        {assign.format(f'_default_{i}(inst)')}")
+
+    lines.extend(tail)
+    lines.append("    return inst")
+
+    script = "\n".join(lines) + "\n"
+    filename = _generate_unique_filename(cls, "fromdict_trusted")
+    return _linecache_and_compile(script, filename, globs)["fromdict"]  # type: ignore[no-any-return]
+
+
+def _make_fromtuple_func(
+    cls: type, plan: _DePlan
+) -> Callable[[tuple[Any, ...], type], Any]:
+    """Generate the specialized ``fromtuple`` function of ``cls`` for ``plan``."""
+
+    def struct(nested: type) -> _Converter:
+        return lambda v: _fromtuple_inner(v, nested)
+
+    globs: dict[str, Any] = {"_DeserializeError": DeserializeError}
+    names: list[str] = []
+    args: list[str] = []
+    for i, fp in enumerate(plan.fields):
+        var = f"_{i}"
+        names.append(var)
+        if fp.init_name is None:
+            continue
+        value = var
+        if (conv := _field_converter(fp, struct)) is not None:
+            globs[f"_conv_{i}"] = conv
+            value = f"_conv_{i}({var})"
+        args.append(f"{fp.init_name}={value}")
+
+    num = len(names)
+    lines = [
+        "def fromtuple(data, _cls):",
+        f"    if len(data) != {num}:",
+        "        raise _DeserializeError(",
+        f"            f'Expected {num} values for {cls.__qualname__}, '",
+        "            f'got {len(data)}'",
+        "        )",
+    ]
+    if names:
+        lines.append(f"    {', '.join(names)}, = data")
+    lines.append(f"    return _cls({', '.join(args)})")
+
+    script = "\n".join(lines) + "\n"
+    filename = _generate_unique_filename(cls, "fromtuple")
+    return _linecache_and_compile(script, filename, globs)["fromtuple"]  # type: ignore[no-any-return]
+
+
+_NOTHING: Any = object()
+
+# Unknown keys kept for instances of classes with ``unknown_fields="allow"``,
+# by the id of instances. Entries are dropped once instances are collected.
+_unknown_fields: dict[int, dict[Any, Any]] = {}
+
+
+def _keep_unknown_fields(inst: Any, data: Mapping[Any, Any], keys: set[Any]) -> None:
+    key = id(inst)
+    _unknown_fields[key] = {k: data[k] for k in keys}
+    weakref.finalize(inst, _unknown_fields.pop, key, None)
+
+
+def _input_keys(i: int, fp: _DeFieldPlan, globs: dict[str, Any]) -> list[str]:
+    """
+    Return expressions of the input keys of the ``i``-th field, its key first
+    and then its aliases in order. Keys other than strings go into ``globs``.
+    """
+    exprs: list[str] = []
+    for j, key in enumerate((fp.key, *(a for a in fp.aliases if a != fp.key))):
+        if isinstance(key, str):
+            exprs.append(repr(key))
+        else:
+            exprs.append(f"_key_{i}_{j}")
+            globs[f"_key_{i}_{j}"] = key
+    return exprs
+
+
+def _lookup_lines(var: str, key: str, aliases: list[str]) -> list[str]:
+    """
+    Return lines getting the value of ``key`` into ``var``, falling back to the
+    values of ``aliases`` in order, or else `_NOTHING`. Aliases are looked up
+    only if ``key`` is missing, so values of keys take precedence.
+    """
+    lines = [f"    {var} = data.get({key}, _NOTHING)"]
+    for alias in aliases:
+        lines.append(f"    if {var} is _NOTHING:")
+        lines.append(f"        {var} = data.get({alias}, _NOTHING)")
+    return lines
+
+
+def _unknown_fields_lines(
+    cls: type, plan: _DePlan, globs: dict[str, Any]
+) -> tuple[list[str], list[str]]:
+    """
+    Return lines checking unknown keys of ``data`` before and after ``inst`` is
+    constructed, according to ``unknown_fields`` of ``plan``.
+
+    Unknown keys are found by a single set difference with the keys of ``plan``.
+    """
+    if plan.unknown_fields == "deny":
+        globs["_keys"] = plan.keys
+        globs["_unknown"] = _unknown_field_error
+        return [
+            "    if _extra := data.keys() - _keys:",
+            "        raise _unknown(_cls, _extra)",
+        ], []
+    elif plan.unknown_fields == "allow":
+        if not hasattr(cls, "__weakref__"):
+            raise TypeError(
+                f'unknown_fields="allow" requires weakly referenceable instances, '
+                f"{cls.__qualname__} has no __weakref__ slot"
+            )
+        globs["_keys"] = plan.keys
+        globs["_keep"] = _keep_unknown_fields
+        return [], [
+            "    if _extra := data.keys() - _keys:",
+            "        _keep(inst, data, _extra)",
+        ]
+    return [], []
+
+
+def _resolve_tag(table: dict[str, dict[Any, type]], data: Mapping[Any, Any]):
+    """Return the class tagged by ``data`` in ``table``, or None."""
+    for tag_field, tags in table.items():
+        tag = data.get(tag_field, _NOTHING)
+        if tag is not _NOTHING and (cls := tags.get(tag)) is not None:
+            return cls
+    return None
+
+
+def _missing_field(cls: type, key: Any) -> DeserializeError:
+    return DeserializeError(f"Missing required field {key!r} for {cls.__qualname__}")
+
+
+def _unknown_field_error(cls: type, keys: set[Any]) -> DeserializeError:
+    names = ", ".join(sorted(map(repr, keys)))
+    return DeserializeError(f"Unknown fields {names} for {cls.__qualname__}")
+
+
+def _fromdict_inner(data: Any, cls: type[T], key_serializer, trusted: bool) -> T:
+    if (table := _get_tag_table((cls,))) and isinstance(data, Mapping):
+        # polymorphic fields of a base class, dispatched by tag
+        cls = _resolve_tag(table, data) or cls
+    if hasattr(cls, _FROM_DICT):
+        return getattr(cls, _FROM_DICT)(data)  # type: ignore[no-any-return]
+    elif isinstance(data, cls):
+        # e.g. leaves of `asdict` which are kept as they are
+        return data
+    elif not isinstance(data, Mapping):
+        raise DeserializeError(
+            f"Expected a mapping for {cls.__qualname__}, got {type(data)!r}"
+        )
+    func = _get_fromdict_func(cls, key_serializer, trusted)
+    return func(data, cls)  # type: ignore[no-any-return]
+
+
+def _get_fromdict_func(
+    cls: type, key_serializer: KeyConverter | None, trusted: bool
+) -> Callable[[Mapping[Any, Any], type], Any]:
+    """Return the generated ``fromdict`` function of the plan of ``cls``."""
+    plan = _get_de_plan(cls, key_serializer)
+    if trusted:
+        func = plan.fromdict_trusted_func
+        if func is None:
+            func = plan.fromdict_trusted_func = _make_fromdict_trusted_func(
+                cls, plan, key_serializer
+            )
+    else:
+        func = plan.fromdict_func
+        if func is None:
+            func = plan.fromdict_func = _make_fromdict_func(cls, plan, key_serializer)
+    return func
+
+
+def _fromdict_many(
+    cls: type[T], key_serializer: KeyConverter | None, trusted: bool
+) -> Callable[[Any], T]:
+    """
+    Return a function of ``data`` doing the same as `_fromdict_inner` for
+    ``cls``, for many inputs of the same class.
+
+    The generated ``fromdict`` function is looked up once here, instead of per
+    input, unless inputs may be dispatched to tagged subclasses, or the class
+    has its own hook.
+    """
+    tagged = _get_tag_table((cls,)).values()
+    if hasattr(cls, _FROM_DICT) or any(
+        sub is not cls for tags in tagged for sub in tags.values()
+    ):
+        return lambda data: _fromdict_inner(data, cls, key_serializer, trusted)
+    func = _get_fromdict_func(cls, key_serializer, trusted)
+
+    def convert(data: Any) -> T:
+        if not isinstance(data, Mapping):
+            raise DeserializeError(
+                f"Expected a mapping for {cls.__qualname__}, got {type(data)!r}"
+            )
+        return func(data, cls)  # type: ignore[no-any-return]
+
+    return convert
+
+
+def _fromtuple_inner(data: Any, cls: type[T]) -> T:
+    if hasattr(cls, _FROM_TUPLE):
+        return getattr(cls, _FROM_TUPLE)(data)  # type: ignore[no-any-return]
+    elif isinstance(data, cls):
+        return data
+    plan = _get_de_plan(cls)
+    func = plan.fromtuple_func
+    if func is None:
+        func = plan.fromtuple_func = _make_fromtuple_func(cls, plan)
+    return func(data, cls)  # type: ignore[no-any-return]
+
+
+def fromdict(
+    data: Mapping[Any, Any], cls: type[T], *, key_serializer=None, trusted: bool = False
+) -> T:
+    """
+    Construct an instance of the dataclass or attrs class ``cls`` from ``data``.
+
+    This is the inverse of `asdict`: keys are looked up by the same (renamed)
+    names `asdict` would output, nested dataclass-like classes, enums and
+    containers are converted according to the type hints of fields. Fields
+    accept the extra input keys of their ``alias`` / ``aliases`` metadata as
+    well. Missing fields fall back to their defaults, unknown keys are ignored.
+
+    Classes tagged by ``serde(tag=...)`` are looked up by the ``tag_field`` of
+    ``data``: a base class or a union of classes is constructed as the tagged
+    subclass or arm, in constant time regardless of the number of candidates.
+
+    Type hints are resolved on the first call per class and ``key_serializer``.
+    Raises `DeserializeError` if a required field is missing.
+
+    Unknown keys are handled according to ``serde(unknown_fields=...)`` of the
+    class: ``"ignore"`` them (the default), ``"deny"`` them by raising
+    `DeserializeError`, or ``"allow"`` them to be kept for
+    `get_unknown_fields`.
+
+    With ``trusted=True``, ``__init__`` is bypassed for data produced by
+    ourselves: instances are created with ``object.__new__`` and fields are
+    assigned directly, even for frozen classes. Validators, converters and post
+    init hooks of classes are skipped, and fields with ``init=False`` are read
+    from ``data`` as well.
+    """
+    if not _is_data_class_like(cls):
+        raise TypeError(f"Expected a dataclass-like type, got {cls!r}")
+    return _fromdict_inner(data, cls, key_serializer, trusted)
+
+
+def fromtuple(data: tuple[Any, ...], cls: type[T]) -> T:
+    """
+    Construct an instance of the dataclass or attrs class ``cls`` from ``data``.
+
+    This is the inverse of `astuple`: values are matched to all fields by
+    position, values of fields with ``init=False`` are skipped. Nested values
+    are converted the same way as `fromdict`, except that nested dataclass-like
+    classes are constructed from tuples.
+    """
+    if not _is_data_class_like(cls):
+        raise TypeError(f"Expected a dataclass-like type, got {cls!r}")
+    return _fromtuple_inner(data, cls)
+
+
+def get_unknown_fields(inst: Any) -> Mapping[Any, Any]:
+    """
+    Return the unknown keys and values of the data ``inst`` was constructed
+    from by `fromdict`.
+
+    Only kept for classes with ``serde(unknown_fields="allow")``, empty for all
+    other instances.
+    """
+    return MappingProxyType(_unknown_fields.get(id(inst), {}))
@@ -0,0 +1,119 @@
+# SPDX-License-Identifier: MIT
+"""
+Walk nested instances as a flat stream of events.
+
+Events follow the same rules as `asdict`, but no intermediate containers are
+built, so encoders could write their output incrementally.
+"""
+
+from __future__ import annotations
+
+from xattrs._compat.typing import Any, Iterator
+from xattrs.typing import Event
+
+from xattrs._plan import _AS_DICT, _get_ser_plan
+from xattrs._struct_funcs import (
+    _asdict_defaultdict,
+    _asdict_handlers,
+    _asdict_inner,
+    _asdict_mapping,
+    _asdict_namedtuple,
+    _asdict_sequence,
+    _asdict_struct,
+    _resolve_asdict_handler,
+)
+from xattrs._types import _ATOMIC_TYPES
+from xattrs.converters import identity
+from xattrs.filters import keep_include
+
+__all__ = ("iter_events",)
+
+START_MAP: Event = "start_map"
+MAP_KEY: Event = "map_key"
+END_MAP: Event = "end_map"
+START_ARRAY: Event = "start_array"
+END_ARRAY: Event = "end_array"
+SCALAR: Event = "scalar"
+
+_MAP_HANDLERS = frozenset({_asdict_struct, _asdict_mapping, _asdict_defaultdict})
+_ARRAY_HANDLERS = frozenset({_asdict_sequence, _asdict_namedtuple})
+
+# marks children of arrays, which have no keys
+_NO_KEY: Any = object()
+
+
+def _struct_items(inst: Any, filter_, key_serializer) -> Iterator[tuple[Any, Any]]:
+    plan = _get_ser_plan(type(inst), filter_, key_serializer)
+    if hasattr(inst, _AS_DICT):
+        _ks = plan.key_serializer or identity
+        for k, v in getattr(inst, _AS_DICT)().items():
+            yield _ks(k), v
+    else:
+        if plan.tag is not None:
+            yield plan.tag
+        for fp in plan.fields:
+            value = getattr(inst, fp.name)
+            if fp.filter is keep_include or fp.filter(fp.field, value):
+                yield fp.key, value
+
+
+def iter_events(
+    inst: Any, *, filter=None, key_serializer=None
+) -> Iterator[tuple[Event, Any]]:
+    """
+    Walk ``inst`` and yield ``(event, value)`` pairs.
+
+    Dataclass-like instances and dicts emit ``start_map``, then a ``map_key``
+    event before every value, and ``end_map``. Lists and tuples (including
+    namedtuples) emit ``start_array``, their values and ``end_array``. All
+    other values are emitted as they are with ``scalar``, without copying.
+    The value of start and end events is ``None``.
+
+    >>> list(iter_events(Point(1, [2])))  # doctest: +SKIP
+    [('start_map', None), ('map_key', 'x'), ('scalar', 1), ('map_key', 'y'),
+     ('start_array', None), ('scalar', 2), ('end_array', None), ('end_map', None)]
+    """
+    if isinstance(inst, type):
+        raise TypeError("Must be an instance")
+
+    args = (filter, key_serializer, None, identity, None)
+    stack: list[tuple[Event | None, Iterator[tuple[Any, Any]]]] = [
+        (None, iter(((_NO_KEY, inst),)))
+    ]
+    while stack:
+        end, it = stack[-1]
+        for key, value in it:
+            if key is not _NO_KEY:
+                yield (
+                    MAP_KEY,
+                    (
+                        key
+                        if type(key) in _ATOMIC_TYPES
+                        else _asdict_inner(key, dict, *args)
+                    ),
+                )
+
+            cls = type(value)
+            if cls in _ATOMIC_TYPES:
+                yield SCALAR, value
+                continue
+
+            handler = _asdict_handlers.get(cls) or _resolve_asdict_handler(cls)
+            if handler in _MAP_HANDLERS:
+                yield START_MAP, None
+                if handler is _asdict_struct:
+                    items = _struct_items(value, filter, key_serializer)
+                else:
+                    items = iter(value.items())
+                stack.append((END_MAP, items))
+                break
+            elif handler in _ARRAY_HANDLERS:
+                yield START_ARRAY, None
+                stack.append((END_ARRAY, ((_NO_KEY, v) for v in value)))
+                break
+            else:
+                yield SCALAR, value
+        else:
+            stack.pop()
+            if end is not None:
+                yield end, None
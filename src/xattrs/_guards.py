@@ -1,6 +1,7 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
+import types
 from collections.abc import Sequence
 from xattrs._compat.typing import (
     Annotated,
@@ -10,43 +11,76 @@ from xattrs._compat.typing import (
     Type,
     TypedDict,
     TypeGuard,
+    Union,
+    get_args,
+    get_origin,
 )
+from xattrs._compat.typing import is_typeddict as _is_typeddict
 
 from collections import defaultdict
 from enum import Enum
 
 from xattrs._types import _ATOMIC_TYPES
 
+_UNION_TYPES = (Union, types.UnionType)
+_NOT_SEQUENCES = (str, bytes, bytearray, memoryview)
+
 
 def is_atomic(typ: Any) -> bool:
     return type(typ) in _ATOMIC_TYPES
 
 
-def is_optional(typ: Type) -> TypeGuard[Optional[Any]]: ...
+def is_union(typ: Any) -> bool:
+    return get_origin(typ) in _UNION_TYPES
+
+
+def is_optional(typ: Type) -> TypeGuard[Optional[Any]]:
+    return is_union(typ) and type(None) in get_args(typ)
 
 
-def is_annotated(typ: Any) -> TypeGuard[Annotated]: ...
+def is_annotated(typ: Any) -> TypeGuard[Annotated]:
+    return get_origin(typ) is Annotated
 
 
-def is_sequence(typ: Any) -> TypeGuard[Sequence]: ...
+def is_sequence(typ: Any) -> TypeGuard[Sequence]:
+    """Return True for homogeneous sequences, e.g. ``list[T]`` or ``tuple[T, ...]``."""
+    origin = get_origin(typ) or typ
+    if origin is tuple:
+        return not is_hetero_tuple(typ)
+    return (
+        isinstance(origin, type)
+        and issubclass(origin, Sequence)
+        and not issubclass(origin, _NOT_SEQUENCES)
+    )
 
 
-def is_hetero_sequence(typ: Any) -> TypeGuard[Sequence]: ...
+def is_hetero_sequence(typ: Any) -> TypeGuard[Sequence]:
+    return is_hetero_tuple(typ)
 
 
-def is_tuple(typ: Any) -> TypeGuard[tuple]: ...
+def is_tuple(typ: Any) -> TypeGuard[tuple]:
+    return typ is tuple or get_origin(typ) is tuple
 
 
-def is_hetero_tuple(typ: Any) -> TypeGuard[tuple]: ...
+def is_hetero_tuple(typ: Any) -> TypeGuard[tuple]:
+    """Return True for tuples of fixed length, e.g. ``tuple[int, str]``."""
+    if get_origin(typ) is not tuple:
+        return False
+    args = get_args(typ)
+    return not (len(args) == 2 and args[1] is Ellipsis)
 
 
-def is_typeddict(typ: Any): ...
+def is_typeddict(typ: Any) -> TypeGuard[type[TypedDict]]:  # type: ignore[valid-type]
+    return _is_typeddict(typ)
 
 
-def is_defaultdict(typ: Any) -> TypeGuard[dict]: ...
+def is_defaultdict(typ: Any) -> TypeGuard[dict]:
+    return (get_origin(typ) or typ) is defaultdict
 
 
-def is_dataclass_transform(typ: Any) -> TypeGuard[Annotated]: ...
+def is_dataclass_transform(typ: Any) -> TypeGuard[Annotated]:
+    """Return True if ``typ`` is decorated by ``dataclass_transform``."""
+    return hasattr(typ, "__dataclass_transform__")
 
 
 def is_enum(typ: Any) -> TypeGuard[Enum]:
@@ -56,4 +90,5 @@ def is_enum(typ: Any) -> TypeGuard[Enum]:
         return isinstance(typ, Enum)
 
 
-def is_new_type(type: Any) -> TypeGuard[NewType]: ...
+def is_new_type(type: Any) -> TypeGuard[NewType]:
+    return isinstance(type, NewType) or hasattr(type, "__supertype__")
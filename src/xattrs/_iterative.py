@@ -0,0 +1,172 @@
+# SPDX-License-Identifier: MIT
+"""
+Traverse nested instances with an explicit work stack instead of recursion.
+
+Every container node is expanded into its children and a ``finish`` callback
+which builds the output from the converted children. Leaves are converted
+in place, so the depth of a structure is only bounded by memory rather than
+the recursion limit of the interpreter.
+"""
+
+from __future__ import annotations
+
+from xattrs._compat.typing import Any, Callable, Iterable, Mapping
+
+from collections import defaultdict
+
+from xattrs._plan import _AS_DICT, _get_ser_plan
+from xattrs._types import _ATOMIC_TYPES
+from xattrs._uni import _fields, _is_data_class_like_instance
+from xattrs.converters import identity
+from xattrs.filters import keep_include
+
+# (is_leaf, leaf value) or (is_leaf, (finish, children))
+_Expanded = tuple[bool, Any]
+
+
+def _walk(inst: Any, expand: Callable[[Any], _Expanded]) -> Any:
+    is_leaf, payload = expand(inst)
+    if is_leaf:
+        return payload
+
+    finish, children = payload
+    stack: list[tuple[Callable[[list[Any]], Any], Any, list[Any]]] = [
+        (finish, iter(children), [])
+    ]
+    while stack:
+        finish, it, out = stack[-1]
+        for child in it:
+            if type(child) in _ATOMIC_TYPES:
+                out.append(child)
+                continue
+            is_leaf, payload = expand(child)
+            if is_leaf:
+                out.append(payload)
+            else:
+                # descend, and resume the iterator of this frame later
+                stack.append((payload[0], iter(payload[1]), []))
+                break
+        else:
+            stack.pop()
+            value = finish(out)
+            if not stack:
+                return value
+            stack[-1][2].append(value)
+
+    raise RuntimeError("Unreachable code")
+
+
+def _flatten_items(inst: Mapping[Any, Any]) -> list[Any]:
+    return [x for kv in inst.items() for x in kv]
+
+
+def _pairs(values: list[Any]) -> Iterable[tuple[Any, Any]]:
+    it = iter(values)
+    return zip(it, it)
+
+
+def _expand_sequence(inst: Any) -> _Expanded | None:
+    cls = type(inst)
+    if isinstance(inst, tuple) and hasattr(inst, "_fields"):
+        # instance is a namedtuple.
+        return False, (lambda vals: cls(*vals), inst)
+    elif isinstance(inst, (list, tuple)):
+        return False, (cls, inst)
+    return None
+
+
+def _expand_dict(inst: Any) -> _Expanded | None:
+    if not isinstance(inst, dict):
+        return None
+
+    cls = type(inst)
+    if isinstance(inst, defaultdict):
+        # inst is a defaultdict, which requires the default_factory as its
+        # first arg.
+        def finish(vals: list[Any]) -> Any:
+            result = type(inst)(inst.default_factory)
+            result.update(_pairs(vals))
+            return result
+
+        return False, (finish, _flatten_items(inst))
+    return False, (lambda vals: cls(_pairs(vals)), _flatten_items(inst))
+
+
+def _asdict_iterative(
+    inst: Any, dict_factory, filter_, key_serializer, value_serializer, copy, memo
+):
+    def expand(inst: Any) -> _Expanded:
+        cls = type(inst)
+        if cls in _ATOMIC_TYPES:
+            return True, inst
+        elif memo is None:
+            return expand_node(inst)
+
+        # hold on ``inst`` in memo as well, so its id could not be reused
+        hit = memo.get(id(inst))
+        if hit is not None and hit[0] is inst:
+            return True, hit[1]
+        is_leaf, payload = expand_node(inst)
+        if is_leaf:
+            memo[id(inst)] = (inst, payload)
+            return is_leaf, payload
+
+        finish, children = payload
+
+        def memo_finish(vals: list[Any]) -> Any:
+            result = memo[id(inst)] = (inst, finish(vals))
+            return result[1]
+
+        return False, (memo_finish, children)
+
+    def expand_node(inst: Any) -> _Expanded:
+        if _is_data_class_like_instance(inst):
+            plan = _get_ser_plan(type(inst), filter_, key_serializer)
+            keys: list[Any] = []
+            values: list[Any] = []
+            if hasattr(inst, _AS_DICT):
+                _ks = plan.key_serializer or identity
+                for k, v in getattr(inst, _AS_DICT)().items():
+                    keys.append(_ks(k))
+                    values.append(v)
+            else:
+                if plan.tag is not None:
+                    keys.append(plan.tag[0])
+                    values.append(plan.tag[1])
+                for fp in plan.fields:
+                    value = getattr(inst, fp.name)
+                    if fp.filter is keep_include or fp.filter(fp.field, value):
+                        keys.append(fp.key)
+                        values.append(value)
+            return False, (lambda vals: dict_factory(zip(keys, vals)), values)
+        return _expand_sequence(inst) or _expand_dict(inst) or (True, copy(inst))
+
+    return _walk(inst, expand)
+
+
+def _astuple_iterative(
+    inst: Any, tuple_factory, key_serializer, value_serializer, copy
+):
+    def expand(inst: Any) -> _Expanded:
+        if type(inst) in _ATOMIC_TYPES:
+            return True, inst
+        elif _is_data_class_like_instance(inst):
+            values = [getattr(inst, f.name) for f in _fields(inst)]
+            return False, (tuple_factory, values)
+        return _expand_sequence(inst) or _expand_dict(inst) or (True, copy(inst))
+
+    return _walk(inst, expand)
+
+
+def _astree_iterative(inst: Any, tuple_factory, key_serializer, value_serializer, copy):
+    def expand(inst: Any) -> _Expanded:
+        if type(inst) in _ATOMIC_TYPES:
+            return True, inst
+        elif _is_data_class_like_instance(inst):
+            values = [getattr(inst, f.name) for f in _fields(inst)]
+            return False, (tuple_factory, values)
+        elif isinstance(inst, Mapping):
+            return False, (lambda vals: tuple(_pairs(vals)), _flatten_items(inst))
+        return _expand_sequence(inst) or (True, copy(inst))
+
+    return _walk(inst, expand)
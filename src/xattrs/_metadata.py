@@ -9,7 +9,9 @@ from xattrs._compat.typing import (
     Any,
     Callable,
     Generic,
+    Hashable,
     Mapping,
+    Sequence,
     TypedDict,
     TypeGuard,
     cast,
@@ -22,10 +24,11 @@ from dataclasses import Field, asdict, dataclass
 
 from attr._make import _CountingAttr
 
+from xattrs.constants import ALIAS, ALIASES
 from xattrs.converters import _CASE_CONVERTER_MAPPING, identity
 from xattrs.filters import exclude_if_default as exclude_if_default_filter
 from xattrs.filters import exclude_if_false as exclude_if_false_filter
-from xattrs.filters import keep_include
+from xattrs.filters import keep_exclude, keep_include
 
 if TYPE_CHECKING:
     from attrs import Attribute
@@ -35,6 +38,9 @@ if TYPE_CHECKING:
 class _Metadata(Generic[T]):
     name: str | None = None
     rename: CaseConvention | CaseConverter | None = None
+    # extra input keys accepted by `fromdict` besides the output key
+    alias: str | None = None
+    aliases: Sequence[str] | None = None
     # rename_ser: str | None = None
     # rename_de: str | None = None
 
@@ -113,24 +119,46 @@ def _has_filter_params(meta: Mapping) -> TypeGuard[FilterConf]:  # type: ignore[
     )
 
 
-# FIXME(@lqhuang): update to pipeline scope filter rather than replace scope filter
+def _chain_filters(*filters: FilterCallable[T] | None) -> FilterCallable[T]:
+    """
+    Chain ``filters`` into one, which includes a value only if all of them do.
+
+    Statically decided filters are folded away: `keep_exclude` excludes always,
+    `keep_include` and None are dropped. Callers can check the result against
+    `keep_include` and `keep_exclude` to skip calling it for every value.
+    """
+    checks = [f for f in filters if f is not None and f is not keep_include]
+    if keep_exclude in checks:
+        return keep_exclude
+    elif not checks:
+        return keep_include
+    elif len(checks) == 1:
+        return checks[0]
+    elif len(checks) == 2:
+        first, second = checks
+        return lambda field, value: first(field, value) and second(field, value)
+    return lambda field, value: all(check(field, value) for check in checks)
+
+
 def _gen_field_filter(
     attribute: Field[T] | Attribute[T], scope_filter: FilterCallable[T] | None = None
 ) -> FilterCallable[T]:
-    """Gen a filter function by merging the field and scope filter."""
+    """Gen a filter function by chaining the scope filter and the field filter."""
     _meta = attribute.metadata
+    field_filter: FilterCallable[Any] | None
     if not _has_filter_params(_meta):
-        return scope_filter or keep_include
+        field_filter = None
     elif _meta.get("exclude"):
-        return lambda _, __: False  # return False to exclude this field
+        field_filter = keep_exclude
     elif (exclude_if_filter := _meta.get("exclude_if")) is not None:
-        return exclude_if_filter
+        field_filter = exclude_if_filter
     elif _meta.get("exclude_if_default"):
-        return exclude_if_default_filter
+        field_filter = exclude_if_default_filter
     elif _meta.get("exclude_if_false"):
-        return exclude_if_false_filter
+        field_filter = exclude_if_false_filter
     else:
-        return keep_include  # only right for replacing scope filter
+        field_filter = None
+    return _chain_filters(scope_filter, field_filter)
 
 
 class RenameConf(TypedDict):
@@ -168,3 +196,13 @@ def _gen_field_key_serializer(
             return _rename
     else:
         raise RuntimeError("Unreachable code")
+
+
+def _gen_field_aliases(attribute: Field[T] | Attribute[T]) -> tuple[Hashable, ...]:
+    """Return extra input keys of ``attribute`` from ``alias`` and ``aliases``."""
+    _meta = attribute.metadata
+    aliases: list[Hashable] = []
+    if (alias := _meta.get(ALIAS)) is not None:
+        aliases.append(alias)
+    aliases.extend(_meta.get(ALIASES) or ())
+    return tuple(aliases)
@@ -0,0 +1,340 @@
+# SPDX-License-Identifier: MIT
+"""
+Per class plans which resolve field level metadata once and are reused by all
+following calls on instances of the same class.
+"""
+
+from __future__ import annotations
+
+from xattrs._compat.typing import TYPE_CHECKING, Any, Callable, Hashable, Sequence
+from xattrs.typing import FilterCallable, KeyConverter, UnknownFields
+
+from dataclasses import MISSING, Field, dataclass
+from dataclasses import field as dataclass_field
+from operator import attrgetter
+from weakref import WeakKeyDictionary
+
+from attrs import NOTHING
+
+from xattrs._metadata import (
+    _chain_filters,
+    _gen_field_aliases,
+    _gen_field_filter,
+    _gen_field_key_serializer,
+)
+from xattrs._serde import (
+    SerdeParams,
+    _get_class_tag,
+    _maybe_serde,
+    gen_serializer_helpers,
+)
+from xattrs._typedesc import _describe, _StructDesc, _TypeDesc, _UnionDesc, _unwrap
+from xattrs._uni import _field_types, _fields, _init_name
+from xattrs.filters import keep_exclude
+
+if TYPE_CHECKING:
+    from attrs import Attribute
+
+# Per class hooks to customize (de)serialization
+_AS_DICT = "__attrs_asdict__"
+_AS_TUPLE = "__attrs_astuple__"
+_FROM_DICT = "__attrs_fromdict__"
+_FROM_TUPLE = "__attrs_fromtuple__"
+
+# Keep a few scopes (call level ``filter`` / ``key_serializer`` pairs) per class.
+# Scopes are usually module level functions, but a fresh lambda per call would
+# grow the cache without bound.
+_MAX_SCOPES_PER_CLASS = 32
+
+
+@dataclass(slots=True, frozen=True)
+class _FieldPlan:
+    name: str
+    key: Hashable
+    field: Field[Any] | Attribute[Any]
+    # a `FilterCallable` of ``field``
+    filter: Callable[[Any, Any], bool]
+
+
+@dataclass(slots=True)
+class _SerPlan:
+    serde: SerdeParams | None
+    key_serializer: KeyConverter | None
+    value_serializer: Callable[..., Any] | None
+    # fields excluded by their filters for every value are left out
+    fields: tuple[_FieldPlan, ...]
+    # ``(tag_field, tag)`` emitted before fields by tagged classes
+    tag: tuple[str, Any] | None = None
+    # specialized function generated from this plan, see `xattrs._codegen`
+    asdict_func: Callable[..., Any] | None = dataclass_field(default=None, repr=False)
+
+
+_ser_plans: WeakKeyDictionary[type, dict[tuple[Any, Any], _SerPlan]] = (
+    WeakKeyDictionary()
+)
+
+
+def _gen_ser_plan(
+    cls: type,
+    scope_filter: FilterCallable[Any] | None = None,
+    scope_key_serializer: KeyConverter | None = None,
+) -> _SerPlan:
+    """Resolve output keys and filters of all fields of ``cls``.
+
+    Filters of the scope, of ``serde(filter=...)`` and of field metadata are
+    chained into one filter per field.
+    """
+    cls_filter, cls_key_ser, cls_val_ser = gen_serializer_helpers(cls)
+    _filter = _chain_filters(scope_filter, cls_filter)
+    _key_ser = cls_key_ser or scope_key_serializer
+
+    plans = (
+        _FieldPlan(
+            name=f.name,
+            key=_gen_field_key_serializer(f, _key_ser)(f.name),
+            field=f,
+            filter=_gen_field_filter(f, _filter),
+        )
+        for f in _fields(cls)
+    )
+    fields = tuple(fp for fp in plans if fp.filter is not keep_exclude)
+    return _SerPlan(
+        serde=_maybe_serde(cls),
+        key_serializer=_key_ser,
+        value_serializer=cls_val_ser,
+        fields=fields,
+        tag=_get_class_tag(cls),
+    )
+
+
+def _get_ser_plan(
+    cls: type,
+    scope_filter: FilterCallable[Any] | None = None,
+    scope_key_serializer: KeyConverter | None = None,
+) -> _SerPlan:
+    """Return the cached serialization plan of ``cls`` for the given scope.
+
+    The plan is rebuilt once ``serde()`` params of the class are replaced.
+    """
+    try:
+        plans = _ser_plans[cls]
+    except KeyError:
+        plans = _ser_plans[cls] = {}
+
+    scope = (scope_filter, scope_key_serializer)
+    plan = plans.get(scope)
+    if plan is None or plan.serde is not _maybe_serde(cls):
+        if len(plans) >= _MAX_SCOPES_PER_CLASS:
+            plans.clear()
+        plan = plans[scope] = _gen_ser_plan(cls, scope_filter, scope_key_serializer)
+    return plan
+
+
+def _clear_ser_plans(cls: type | None = None) -> None:
+    """Drop cached plans of ``cls``, or of all classes if ``cls`` is None."""
+    if cls is None:
+        _ser_plans.clear()
+        _de_plans.clear()
+        _union_plans.clear()
+    else:
+        _ser_plans.pop(cls, None)
+        _de_plans.pop(cls, None)
+
+
+@dataclass(slots=True, frozen=True)
+class _DeFieldPlan:
+    name: str
+    key: Hashable
+    # extra input keys accepted besides ``key``
+    aliases: tuple[Hashable, ...]
+    # name of the argument of ``__init__``, None if the field is not in it
+    init_name: str | None
+    type: _TypeDesc
+    required: bool
+    field: Field[Any] | Attribute[Any]
+
+
+@dataclass(slots=True)
+class _DePlan:
+    serde: SerdeParams | None
+    fields: tuple[_DeFieldPlan, ...]
+    # rename tables, field name -> output key, input key or alias -> field name
+    names: dict[str, Hashable]
+    reverse: dict[Hashable, str]
+    # all input keys of the class, i.e. keys and aliases of fields and the tag field
+    keys: frozenset[Hashable]
+    unknown_fields: UnknownFields
+    # specialized functions generated from this plan, see `xattrs._de_funcs`
+    fromdict_func: Callable[..., Any] | None = dataclass_field(default=None, repr=False)
+    fromdict_trusted_func: Callable[..., Any] | None = dataclass_field(
+        default=None, repr=False
+    )
+    fromtuple_func: Callable[..., Any] | None = dataclass_field(
+        default=None, repr=False
+    )
+
+
+_de_plans: WeakKeyDictionary[type, dict[Any, _DePlan]] = WeakKeyDictionary()
+
+_UNKNOWN_FIELDS = frozenset({"ignore", "allow", "deny"})
+
+
+def _is_required(f: Field[Any] | Attribute[Any]) -> bool:
+    if isinstance(f, Field):
+        return f.default is MISSING and f.default_factory is MISSING
+    return f.default is NOTHING
+
+
+def _gen_de_plan(
+    cls: type, scope_key_serializer: KeyConverter | None = None
+) -> _DePlan:
+    """Resolve input keys, ``__init__`` arguments and types of all fields of ``cls``."""
+    _, cls_key_ser, _ = gen_serializer_helpers(cls)
+    _key_ser = cls_key_ser or scope_key_serializer
+    types = _field_types(cls, strict=True)
+    serde = _maybe_serde(cls)
+
+    unknown_fields = (serde and serde.unknown_fields) or "ignore"
+    if unknown_fields not in _UNKNOWN_FIELDS:
+        raise ValueError(f"unknown unknown_fields: {unknown_fields!r}")
+
+    fields = tuple(
+        _DeFieldPlan(
+            name=f.name,
+            key=_gen_field_key_serializer(f, _key_ser)(f.name),
+            aliases=_gen_field_aliases(f),
+            init_name=_init_name(f) if f.init else None,
+            type=_describe(types.get(f.name, Any)),
+            required=f.init and _is_required(f),
+            field=f,
+        )
+        for f in _fields(cls)
+    )
+    names = {fp.name: fp.key for fp in fields}
+    reverse: dict[Hashable, str] = {}
+    for fp in fields:
+        for key in (fp.key, *fp.aliases):
+            if reverse.setdefault(key, fp.name) != fp.name:
+                raise ValueError(
+                    f"Input key {key!r} of {cls.__qualname__} is used by both "
+                    f"{reverse[key]!r} and {fp.name!r}"
+                )
+    keys = set(reverse)
+    if (tag := _get_class_tag(cls)) is not None:
+        keys.add(tag[0])
+    elif serde is not None and serde.tag is not None:
+        # instances could not be told apart from instances of the base class
+        raise ValueError(
+            f"{cls.__qualname__} inherits serde(tag=...) from a base class, "
+            "apply serde(tag=...) to it as well"
+        )
+
+    return _DePlan(
+        serde=serde,
+        fields=fields,
+        names=names,
+        reverse=reverse,
+        keys=frozenset(keys),
+        unknown_fields=unknown_fields,
+    )
+
+
+def _get_de_plan(
+    cls: type, scope_key_serializer: KeyConverter | None = None
+) -> _DePlan:
+    """Return the cached deserialization plan of ``cls`` for the given scope.
+
+    Type hints are resolved only once per plan. Like `_get_ser_plan`, the plan
+    is rebuilt once ``serde()`` params of the class are replaced.
+    """
+    try:
+        plans = _de_plans[cls]
+    except KeyError:
+        plans = _de_plans[cls] = {}
+
+    plan = plans.get(scope_key_serializer)
+    if plan is None or plan.serde is not _maybe_serde(cls):
+        if len(plans) >= _MAX_SCOPES_PER_CLASS:
+            plans.clear()
+        plan = plans[scope_key_serializer] = _gen_de_plan(cls, scope_key_serializer)
+    return plan
+
+
+@dataclass(slots=True, frozen=True)
+class _UnionPlan:
+    """
+    Structural discriminators of the dataclass-like arms of an untagged union.
+
+    An arm is picked by the first input key which only this arm accepts, or
+    else by the first arm with all of its required keys present, arms with more
+    required keys first.
+    """
+
+    arms: tuple[type, ...]
+    serdes: tuple[SerdeParams | None, ...]
+    # input keys and aliases of a single arm, which no other arm accepts -> arm
+    discriminators: dict[Hashable, type]
+    fallbacks: tuple[tuple[frozenset[Hashable], type], ...]
+
+
+_union_plans: dict[tuple[_UnionDesc, Any], _UnionPlan] = {}
+_UNION_PLANS_MAXSIZE = 1024
+
+
+def _gen_union_plan(
+    arms: tuple[type, ...], scope_key_serializer: KeyConverter | None = None
+) -> _UnionPlan:
+    plans = [_get_de_plan(arm, scope_key_serializer) for arm in arms]
+    discriminators: dict[Hashable, type] = {}
+    fallbacks: list[tuple[frozenset[Hashable], type]] = []
+    for i, (arm, plan) in enumerate(zip(arms, plans)):
+        required = frozenset(fp.key for fp in plan.fields if fp.required)
+        others = frozenset().union(*(p.keys for j, p in enumerate(plans) if j != i))
+        for key in plan.keys - others:
+            discriminators[key] = arm
+        fallbacks.append((required, arm))
+    fallbacks.sort(key=lambda item: -len(item[0]))
+
+    return _UnionPlan(
+        arms=arms,
+        serdes=tuple(plan.serde for plan in plans),
+        discriminators=discriminators,
+        fallbacks=tuple(fallbacks),
+    )
+
+
+def _get_union_plan(
+    desc: _UnionDesc, scope_key_serializer: KeyConverter | None = None
+) -> _UnionPlan | None:
+    """Return the cached plan of ``desc``, None if no arm is dataclass-like.
+
+    Like `_get_de_plan`, the plan is rebuilt once ``serde()`` params of any arm
+    are replaced.
+    """
+    key = (desc, scope_key_serializer)
+    plan = _union_plans.get(key)
+    if plan is not None and all(
+        serde is _maybe_serde(arm) for arm, serde in zip(plan.arms, plan.serdes)
+    ):
+        return plan
+
+    arms = tuple(
+        arm.cls for arm in map(_unwrap, desc.arms) if isinstance(arm, _StructDesc)
+    )
+    if not arms:
+        return None
+    if len(_union_plans) >= _UNION_PLANS_MAXSIZE:
+        _union_plans.clear()
+    plan = _union_plans[key] = _gen_union_plan(arms, scope_key_serializer)
+    return plan
+
+
+def _gen_fields_getter(names: Sequence[str]) -> Callable[[Any], tuple[Any, ...]]:
+    """Return a callable which gets values of ``names`` from an instance as a tuple."""
+    if len(names) > 1:
+        return attrgetter(*names)
+    elif names:
+        name = names[0]
+        return lambda inst: (getattr(inst, name),)
+    else:
+        return lambda inst: ()
@@ -24,7 +24,7 @@ from dataclasses import dataclass
 
 from attrs import Attribute, fields
 
-from xattrs._uni import _is_frozen
+from xattrs._uni import _is_data_class_like, _is_frozen
 from xattrs.converters import _CASE_CONVERTER_MAPPING
 from xattrs.filters import keep_include
 
@@ -38,6 +38,7 @@ class SerdeParams:
     # alias_converter: str | CaseConvention | None = None
     kind: StructAs | None = None
     filter: FilterCallable[Any] | None = None
+    # the tag of the class, or a callable computing it from the class
     tag: str | Callable | None = None  # type: ignore[type-arg]
     tag_field: str = "type"
     unknown_fields: UnknownFields | None = None
@@ -62,6 +63,7 @@ def serde(
     value_deserializer: None = None,
     schema: None = None,
     metadata: MappingProxyType | None = None,  # type: ignore[type-arg]
+    lazy: bool = False,
 ) -> type[T]: ...
 
 
@@ -80,6 +82,7 @@ def serde(
     value_deserializer: None = None,
     schema: None = None,
     metadata: MappingProxyType | None = None,  # type: ignore[type-arg]
+    lazy: bool = False,
 ) -> Callable[[type[T]], type[T]]: ...
 
 
@@ -98,6 +101,7 @@ def serde(
     value_deserializer: None = None,
     schema: None = None,
     metadata: MappingProxyType | None = None,  # type: ignore[type-arg]
+    lazy: bool = False,
 ):
     def wrapper(cls: type[T]) -> type[T]:
         return _process_serde(  # type: ignore[no-any-return]
@@ -112,6 +116,7 @@ def serde(
             value_deserializer=value_deserializer,
             schema=schema,
             metadata=metadata,
+            lazy=lazy,
         )
 
     if cls is None:
@@ -120,16 +125,85 @@ def serde(
     return wrapper(cls)
 
 
-def _process_serde(cls: type[T], **kwargs):
-    """Process the `serde` decorator."""
+def _process_serde(cls: type[T], *, lazy: bool = False, **kwargs):
+    """Process the `serde` decorator.
+
+    Unless ``lazy``, the serialization plan of the class (key converter, output
+    keys, filters and value serializer of fields) is built right away, so the
+    cost is paid at import time instead of by the first call of `asdict`.
+    """
+    from xattrs._plan import _get_ser_plan
+
     _serde = SerdeParams(**kwargs)
     if _is_frozen(cls):
         raise NotImplementedError("Frozen classes are not supported.")
     else:
         setattr(cls, _ATTRS_SERDE, _serde)
+    _register_tag(cls, _serde)
+    if not lazy and _is_data_class_like(cls):
+        _get_ser_plan(cls)
     return cls
 
 
+# Tagged classes indexed by every class of their MRO:
+# base class -> tag field -> tag -> tagged class
+_tag_index: dict[type, dict[str, dict[Any, type]]] = {}
+# tagged class -> (tag field, tag)
+_class_tags: dict[type, tuple[str, Any]] = {}
+# merged indexes of tuples of base classes, e.g. the arms of unions
+_tag_tables: dict[tuple[type, ...], dict[str, dict[Any, type]]] = {}
+
+
+def _register_tag(cls: type, params: SerdeParams) -> None:
+    """Index ``cls`` by its tag under all of its base classes."""
+    if (old := _class_tags.pop(cls, None)) is not None:
+        for base in cls.__mro__:
+            _tag_index.get(base, {}).get(old[0], {}).pop(old[1], None)
+    if params.tag is not None:
+        tag = params.tag(cls) if callable(params.tag) else params.tag
+        _class_tags[cls] = (params.tag_field, tag)
+        for base in cls.__mro__[:-1]:
+            tags = _tag_index.setdefault(base, {}).setdefault(params.tag_field, {})
+            tags[tag] = cls
+    _tag_tables.clear()
+
+
+def _get_class_tag(cls: type) -> tuple[str, Any] | None:
+    """
+    Return the tag field and the tag of ``cls``, or None if it is not tagged.
+
+    Classes which inherit ``serde(tag=...)`` from a base class are not tagged
+    unless ``serde(tag=...)`` is applied to them as well.
+    """
+    return _class_tags.get(cls)
+
+
+def _get_tag_table(bases: tuple[type, ...]) -> dict[str, dict[Any, type]]:
+    """
+    Return the tagged subclasses of ``bases`` as ``{tag_field: {tag: cls}}``.
+
+    Tables are merged once per tuple of bases and cached until the next class
+    is tagged, so looking up the class of a tag stays O(1) for any number of
+    tagged classes. The first base wins on conflicting tags.
+    """
+    try:
+        return _tag_tables[bases]
+    except KeyError:
+        pass
+    if not any(base in _tag_index for base in bases):
+        # not cached, to not hold on to untagged classes forever
+        return {}
+
+    table: dict[str, dict[Any, type]] = {}
+    for base in bases:
+        for tag_field, tags in _tag_index.get(base, {}).items():
+            merged = table.setdefault(tag_field, {})
+            for tag, cls in tags.items():
+                merged.setdefault(tag, cls)
+    _tag_tables[bases] = table
+    return table
+
+
 # def _get_serde(obj: XattrsInstance) -> SerdeParams:
 #     """Get the `SerdeParams` object from class or instance"""
 #     cls = obj if isinstance(obj, type) else type(obj)
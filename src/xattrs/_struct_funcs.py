@@ -1,34 +1,66 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
-from xattrs._compat.typing import Any, Callable, Hashable, Mapping
+from xattrs._compat.typing import Any, Callable, Hashable, Iterable, Iterator, Mapping
 from xattrs._typing import T
-from xattrs.typing import StructAs
+from xattrs.typing import KeyConverter, SerializeFunc, StructEngine
 
+from collections import defaultdict
 from copy import copy as shallowcopy
 from copy import deepcopy
 from functools import partial
+from itertools import chain
 
-from xattrs._metadata import _gen_field_filter, _gen_field_key_serializer
-from xattrs._serde import gen_serializer_helpers
+from xattrs._codegen import _asdict_compiled, _make_asdict_func
+from xattrs._iterative import _asdict_iterative, _astree_iterative, _astuple_iterative
+from xattrs._plan import _AS_DICT, _gen_fields_getter, _get_ser_plan
+from xattrs._tree import _astree_optree, _astuple_optree, _NotATree, _struct_leaves
 from xattrs._types import _ATOMIC_TYPES
-from xattrs._uni import _fields, _is_data_class_like_instance
+from xattrs._uni import _fields, _is_data_class_like, _is_data_class_like_instance
 from xattrs.converters import identity
+from xattrs.filters import keep_include
 
 __all__ = (
     "asdict",
+    "asdict_many",
     "asdict_shallow",
     "astree",
     "astree_shallow",
     "astuple",
+    "astuple_many",
     "astuple_shallow",
+    "get_default_engine",
+    "set_default_engine",
 )
 
+_default_engine: StructEngine = "recursive"
 
-_AS_DICT = "__attrs_asdict__"
-_AS_TUPLE = "__attrs_astuple__"
-_FROM_DICT = "__attrs_fromdict__"
-_FROM_TUPLE = "__attrs_fromtuple__"
+
+def set_default_engine(engine: StructEngine) -> None:
+    """
+    Set the engine used by `asdict`, `astuple` and `astree` if ``engine`` is
+    not given.
+    """
+    global _default_engine  # noqa: PLW0603
+    if engine not in _AS_DICT_ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}.")
+    _default_engine = engine
+
+
+def get_default_engine() -> StructEngine:
+    """Return the engine used by `asdict`, `astuple` and `astree` by default."""
+    return _default_engine
+
+
+def _get_engine(
+    engines: Mapping[StructEngine, Callable[..., Any]],
+    engine: StructEngine | None,
+    name: str,
+) -> Callable[..., Any]:
+    try:
+        return engines[engine or _default_engine]
+    except KeyError:
+        raise ValueError(f"Unknown engine {engine!r} for {name}.") from None
 
 
 def _as_primitive(
@@ -61,79 +93,257 @@ def _as_primitive(
 def asdict(
     inst: Any,
     *,
-    dict_factory: type[Mapping] = dict,
+    dict_factory: type[Mapping[Any, Any]] = dict,
     filter=None,
     key_serializer=None,
     value_serializer=None,
     copy=deepcopy,
+    engine: StructEngine | None = None,
+    memo: dict[int, Any] | None = None,
 ) -> Mapping[Hashable, Any]:
     """
     Return the fields of a dataclass or attrs instance as a new dictionary mapping
     field names to field values.
+
+    ``engine="codegen"`` generates (and caches) a specialized function per class
+    which reads fields directly and builds the dictionary inline.
+    ``engine="iterative"`` walks nested structures with an explicit stack, so
+    the nesting depth is not limited by the recursion limit.
+
+    ``copy=None`` passes unknown leaves through by reference instead of copying
+    them. If a ``memo`` dict is given, subobjects referenced multiple times are
+    converted once and the same result is shared in the output, which should
+    then be treated as read-only.
     """
     if isinstance(inst, type):
         raise TypeError("Must be an instance")
-    return _asdict_inner(
-        inst, dict_factory, filter, key_serializer, value_serializer, copy
+    inner = _get_engine(_AS_DICT_ENGINES, engine, "asdict")
+    return inner(
+        inst,
+        dict_factory,
+        filter,
+        key_serializer,
+        value_serializer,
+        copy or identity,
+        memo,
     )
 
 
-def _asdict_inner(  # noqa: PLR0911
-    inst: Any, dict_factory, filter_, key_serializer, value_serializer, copy
+def _asdict_inner(
+    inst: Any, dict_factory, filter_, key_serializer, value_serializer, copy, memo
 ):
     cls = type(inst)
-    args = (filter_, key_serializer, value_serializer, copy)
+    handler = _asdict_handlers.get(cls)
+    if handler is None:
+        handler = _resolve_asdict_handler(cls)
+    if memo is None or handler is _asdict_atomic:
+        return handler(
+            inst, dict_factory, filter_, key_serializer, value_serializer, copy, memo
+        )
+
+    # hold on ``inst`` in memo as well, so its id could not be reused
+    hit = memo.get(id(inst))
+    if hit is not None and hit[0] is inst:
+        return hit[1]
+    result = handler(
+        inst, dict_factory, filter_, key_serializer, value_serializer, copy, memo
+    )
+    memo[id(inst)] = (inst, result)
+    return result
+
+
+def _asdict_atomic(
+    inst, dict_factory, filter_, key_serializer, value_serializer, copy, memo
+):
+    return inst
 
+
+def _asdict_struct(
+    inst, dict_factory, filter_, key_serializer, value_serializer, copy, memo
+):
+    # fast path for the common case of a dataclass / attrs instance
+    args = (filter_, key_serializer, value_serializer, copy, memo)
+    plan = _get_ser_plan(type(inst), filter_, key_serializer)
+
+    if hasattr(inst, _AS_DICT):
+        _ks = plan.key_serializer or identity
+        return dict_factory(
+            (_ks(k), _asdict_inner(v, dict_factory, *args))
+            for k, v in getattr(inst, _AS_DICT)().items()
+        )
+    else:
+        pairs: Iterable[tuple[Hashable, Any]] = (
+            (fp.key, _asdict_inner(value, dict_factory, *args))
+            for fp in plan.fields
+            for value in (getattr(inst, fp.name),)
+            if fp.filter is keep_include or fp.filter(fp.field, value)
+        )
+        if plan.tag is not None:
+            pairs = chain((plan.tag,), pairs)
+        return dict_factory(pairs)
+
+
+def _asdict_namedtuple(
+    inst, dict_factory, filter_, key_serializer, value_serializer, copy, memo
+):
+    # keep namedtuple instances as they are, then recurse into their fields.
+    args = (filter_, key_serializer, value_serializer, copy, memo)
+    return type(inst)(*(_asdict_inner(v, dict_factory, *args) for v in inst))
+
+
+def _asdict_sequence(
+    inst, dict_factory, filter_, key_serializer, value_serializer, copy, memo
+):
+    args = (filter_, key_serializer, value_serializer, copy, memo)
+    return type(inst)(_asdict_inner(v, dict_factory, *args) for v in inst)
+
+
+def _asdict_defaultdict(
+    inst, dict_factory, filter_, key_serializer, value_serializer, copy, memo
+):
+    # defaultdict has a different constructor from dict as it requires the
+    # default_factory as its first arg.
+    args = (filter_, key_serializer, value_serializer, copy, memo)
+    result = type(inst)(inst.default_factory)
+    for k, v in inst.items():
+        result[_asdict_inner(k, dict_factory, *args)] = _asdict_inner(
+            v, dict_factory, *args
+        )
+    return result
+
+
+def _asdict_mapping(
+    inst, dict_factory, filter_, key_serializer, value_serializer, copy, memo
+):
+    args = (filter_, key_serializer, value_serializer, copy, memo)
+    return type(inst)(
+        (_asdict_inner(k, dict_factory, *args), _asdict_inner(v, dict_factory, *args))
+        for k, v in inst.items()
+    )
+
+
+def _asdict_other(
+    inst, dict_factory, filter_, key_serializer, value_serializer, copy, memo
+):
+    return copy(inst)
+
+
+# Handlers are resolved once per concrete type, later values of the same type
+# take a single dict lookup instead of running the whole chain of checks.
+_asdict_handlers: dict[type, Callable[..., Any]] = dict.fromkeys(
+    _ATOMIC_TYPES, _asdict_atomic
+)
+# Avoid holding on too many (dynamically created) classes forever
+_MAX_ASDICT_HANDLERS = 4096
+
+
+def _resolve_asdict_handler(cls: type) -> Callable[..., Any]:
+    """Resolve and cache the handler of ``cls`` for `asdict`."""
     if cls in _ATOMIC_TYPES:
-        return inst
-    elif _is_data_class_like_instance(inst):
-        # fast path for the common case of a dataclass / attrs instance
-        inst_filter, inst_key_ser, inst_val_ser = gen_serializer_helpers(inst)
-        _filter = inst_filter or filter_
-        _key_ser = inst_key_ser or key_serializer
-        _val_ser = inst_val_ser or value_serializer
-
-        if hasattr(inst, _AS_DICT):
-            _ks = _key_ser or identity
-            return dict_factory(
-                (_ks(k), _asdict_inner(v, dict_factory, *args))
-                for k, v in getattr(inst, _AS_DICT)().items()
-            )
+        handler = _asdict_atomic
+    elif _is_data_class_like(cls):
+        handler = _asdict_struct
+    elif issubclass(cls, tuple) and hasattr(cls, "_fields"):
+        handler = _asdict_namedtuple
+    elif issubclass(cls, (list, tuple)):
+        handler = _asdict_sequence
+    elif issubclass(cls, dict):
+        if hasattr(cls, "default_factory"):
+            handler = _asdict_defaultdict
+        else:
+            handler = _asdict_mapping
+    else:
+        handler = _asdict_other
+
+    if len(_asdict_handlers) >= _MAX_ASDICT_HANDLERS:
+        _asdict_handlers.clear()
+        _asdict_handlers.update(dict.fromkeys(_ATOMIC_TYPES, _asdict_atomic))
+    _asdict_handlers[cls] = handler
+    return handler
+
+
+def asdict_many(
+    insts: Iterable[Any],
+    *,
+    dict_factory: type[Mapping[Any, Any]] = dict,
+    filter=None,
+    key_serializer=None,
+    value_serializer=None,
+    copy=deepcopy,
+    engine: StructEngine | None = None,
+    memo: dict[int, Any] | None = None,
+    lazy: bool = False,
+) -> list[Mapping[Hashable, Any]] | Iterator[Mapping[Hashable, Any]]:
+    """
+    Return `asdict` of every instance in ``insts``.
+
+    The serialization plan is resolved once per run of instances of the same
+    class, so homogeneous collections skip the per instance dispatching. With
+    ``lazy=True`` a generator is returned to stream the output.
+    """
+    inner = _get_engine(_AS_DICT_ENGINES, engine, "asdict_many")
+    results = _iter_asdict_many(
+        insts,
+        inner,
+        engine == "codegen",
+        dict_factory,
+        filter,
+        key_serializer,
+        value_serializer,
+        copy or identity,
+        memo,
+    )
+    return results if lazy else list(results)
+
+
+def _iter_asdict_many(  # noqa: PLR0913
+    insts: Iterable[Any],
+    inner: Callable[..., Any],
+    compiled: bool,
+    dict_factory,
+    filter_,
+    key_serializer,
+    value_serializer,
+    copy,
+    memo,
+) -> Iterator[Mapping[Hashable, Any]]:
+    args = (filter_, key_serializer, value_serializer, copy, memo)
+    last_cls = None
+    plan = None
+
+    for inst in insts:
+        cls = type(inst)
+        if cls is not last_cls:
+            last_cls = cls
+            if _is_data_class_like(cls) and not hasattr(cls, _AS_DICT):
+                plan = _get_ser_plan(cls, filter_, key_serializer)
+                if compiled and plan.asdict_func is None:
+                    plan.asdict_func = _make_asdict_func(cls, plan)
+            else:
+                plan = None
+
+        if plan is None:
+            if isinstance(inst, type):
+                raise TypeError("Must be an instance")
+            yield inner(inst, dict_factory, *args)
+        elif compiled:
+            yield plan.asdict_func(inst, dict_factory, *args)  # type: ignore[misc]
         else:
-            pairs = (
+            pairs = [
                 (
-                    _gen_field_key_serializer(f, _key_ser)(f.name),
-                    _asdict_inner(getattr(inst, f.name), dict_factory, *args),
-                )
-                for f in _fields(inst)
-                if _gen_field_filter(f, _filter)(f, getattr(inst, f.name))
-            )
-            return dict_factory(pairs)
-    elif isinstance(inst, tuple) and hasattr(inst, "_fields"):
-        # instance is a namedtuple.
-        # keep namedtuple instances as they are, then recurse into their fields.
-        return cls(*(_asdict_inner(v, dict_factory, *args) for v in inst))
-    elif isinstance(inst, (list, tuple)):
-        return cls(_asdict_inner(v, dict_factory, *args) for v in inst)
-    elif isinstance(inst, dict):
-        if hasattr(cls, "default_factory"):
-            # inst is a defaultdict, which has a different constructor from
-            # dict as it requires the default_factory as its first arg.
-            result = cls.default_factory  # type: ignore
-            for k, v in inst.items():
-                result[_asdict_inner(k, dict_factory, *args)] = _asdict_inner(
-                    v, dict_factory, *args
+                    fp.key,
+                    value
+                    if type(value) in _ATOMIC_TYPES
+                    else inner(value, dict_factory, *args),
                 )
-            return result
-        return cls(
-            (
-                _asdict_inner(k, dict_factory, *args),
-                _asdict_inner(v, dict_factory, *args),
-            )
-            for k, v in inst.items()
-        )
-    else:
-        return copy(inst)
+                for fp in plan.fields
+                # a single element loop binds the value without any call
+                for value in (getattr(inst, fp.name),)
+                if fp.filter is keep_include or fp.filter(fp.field, value)
+            ]
+            if plan.tag is not None:
+                pairs.insert(0, plan.tag)
+            yield dict_factory(pairs)
 
 
 def astuple(
@@ -143,16 +353,28 @@ def astuple(
     key_serializer=None,
     value_serializer=None,
     copy=deepcopy,
+    engine: StructEngine | None = None,
 ):
     """
     Return the fields of a dataclass or attrs instance as a new tuple of field values
+
+    With the default ``engine="recursive"``, instances built only of classes
+    created by `xattrs.define` / `xattrs.dataclass` and builtin containers are
+    flattened by ``optree`` instead of walked in Python.
     """
-    return _astuple_inner(inst, tuple_factory, key_serializer, value_serializer, copy)
+    inner = _get_engine(_AS_TUPLE_ENGINES, engine, "astuple")
+    return inner(
+        inst, tuple_factory, key_serializer, value_serializer, copy or identity
+    )
 
 
 def _astuple_inner(  # noqa: PLR0911
-    inst, tuple_factory, key_serializer, value_serializer, copy
-):
+    inst: Any,
+    tuple_factory: Callable[[list[Any]], Any],
+    key_serializer: KeyConverter | None,
+    value_serializer: SerializeFunc[Any, Any] | None,
+    copy: Callable[[Any], Any],
+) -> Any:
     args = (key_serializer, value_serializer, copy)
     cls = type(inst)
 
@@ -175,10 +397,10 @@ def _astuple_inner(  # noqa: PLR0911
         return cls(_astuple_inner(v, tuple_factory, *args) for v in inst)
     elif isinstance(inst, dict):
         dict_cls = cls
-        if hasattr(dict_cls, "default_factory"):
+        if isinstance(inst, defaultdict):
             # obj is a defaultdict, which has a different constructor from
             # dict as it requires the default_factory as its first arg.
-            result = dict_cls.default_factory  # type: ignore
+            result = dict_cls(inst.default_factory)
             for k, v in inst.items():
                 result[_astuple_inner(k, tuple_factory, *args)] = _astuple_inner(
                     v, tuple_factory, *args
@@ -195,6 +417,61 @@ def _astuple_inner(  # noqa: PLR0911
         return copy(inst)
 
 
+def astuple_many(
+    insts: Iterable[Any],
+    *,
+    tuple_factory=tuple,
+    key_serializer=None,
+    value_serializer=None,
+    copy=deepcopy,
+    engine: StructEngine | None = None,
+    lazy: bool = False,
+) -> list[Any] | Iterator[Any]:
+    """
+    Return `astuple` of every instance in ``insts``.
+
+    Field names are resolved once per run of instances of the same class. With
+    ``lazy=True`` a generator is returned to stream the output.
+    """
+    inner = _get_engine(_AS_TUPLE_ENGINES, engine, "astuple_many")
+    results = _iter_astuple_many(
+        insts, inner, tuple_factory, key_serializer, value_serializer, copy or identity
+    )
+    return results if lazy else list(results)
+
+
+def _iter_astuple_many(  # noqa: PLR0913
+    insts: Iterable[Any],
+    inner: Callable[..., Any],
+    tuple_factory: Callable[[list[Any]], Any],
+    key_serializer: KeyConverter | None,
+    value_serializer: SerializeFunc[Any, Any] | None,
+    copy: Callable[[Any], Any],
+) -> Iterator[Any]:
+    args = (key_serializer, value_serializer, copy)
+    last_cls = None
+    getter = None
+
+    for inst in insts:
+        cls = type(inst)
+        if cls is not last_cls:
+            last_cls = cls
+            if _is_data_class_like(cls):
+                getter = _gen_fields_getter([f.name for f in _fields(cls)])
+            else:
+                getter = None
+
+        if getter is None:
+            yield inner(inst, tuple_factory, *args)
+        else:
+            yield tuple_factory([
+                value
+                if type(value) in _ATOMIC_TYPES
+                else inner(value, tuple_factory, *args)
+                for value in getter(inst)
+            ])
+
+
 def astree(
     inst,
     *,
@@ -202,14 +479,27 @@ def astree(
     key_serializer=None,
     value_serializer=None,
     copy=deepcopy,
+    engine: StructEngine | None = None,
 ):
     """
     Return the fields of a dataclass or attrs instance as a new tuple of field values
+
+    Mappings are converted into tuples of key-value pairs. The ``optree`` fast
+    path of `astuple` applies as well.
     """
-    return _astree_inner(inst, tuple_factory, key_serializer, value_serializer, copy)
+    inner = _get_engine(_AS_TREE_ENGINES, engine, "astree")
+    return inner(
+        inst, tuple_factory, key_serializer, value_serializer, copy or identity
+    )
 
 
-def _astree_inner(inst, tuple_factory, key_serializer, value_serializer, copy):
+def _astree_inner(
+    inst: Any,
+    tuple_factory: Callable[[list[Any]], Any],
+    key_serializer: KeyConverter | None,
+    value_serializer: SerializeFunc[Any, Any] | None,
+    copy: Callable[[Any], Any],
+) -> Any:
     args = (key_serializer, value_serializer, copy)
     cls = type(inst)
 
@@ -242,11 +532,66 @@ def _astree_inner(inst, tuple_factory, key_serializer, value_serializer, copy):
         return copy(inst)
 
 
+def _astuple_tree(
+    inst: Any,
+    tuple_factory: Callable[[list[Any]], Any],
+    key_serializer: KeyConverter | None,
+    value_serializer: SerializeFunc[Any, Any] | None,
+    copy: Callable[[Any], Any],
+) -> Any:
+    # keys of dicts are not part of the pytree, convert them in Python
+    args = (tuple_factory, key_serializer, value_serializer, copy)
+    if type(inst) in _struct_leaves:
+        return _astuple_inner(inst, *args)
+    try:
+        return _astuple_optree(
+            inst, tuple_factory, copy, lambda k: _astuple_inner(k, *args)
+        )
+    except _NotATree:
+        return _astuple_inner(inst, *args)
+
+
+def _astree_tree(
+    inst: Any,
+    tuple_factory: Callable[[list[Any]], Any],
+    key_serializer: KeyConverter | None,
+    value_serializer: SerializeFunc[Any, Any] | None,
+    copy: Callable[[Any], Any],
+) -> Any:
+    args = (tuple_factory, key_serializer, value_serializer, copy)
+    if type(inst) in _struct_leaves:
+        return _astree_inner(inst, *args)
+    try:
+        return _astree_optree(
+            inst, tuple_factory, copy, lambda k: _astree_inner(k, *args)
+        )
+    except _NotATree:
+        return _astree_inner(inst, *args)
+
+
 asdict_shallow = partial(asdict, copy=shallowcopy)
 astuple_shallow = partial(astuple, copy=shallowcopy)
 astree_shallow = partial(astree, copy=shallowcopy)
 
-_AS_FUNCS_MAPPING: dict[StructAs, Callable] = {
+_AS_DICT_ENGINES: dict[StructEngine, Callable[..., Any]] = {
+    "recursive": _asdict_inner,
+    "iterative": _asdict_iterative,
+    "codegen": _asdict_compiled,
+}
+# There are no generated functions for tuples and trees yet, fallback to the
+# recursive engine for "codegen". The recursive engine tries ``optree`` first.
+_AS_TUPLE_ENGINES: dict[StructEngine, Callable[..., Any]] = {
+    "recursive": _astuple_tree,
+    "iterative": _astuple_iterative,
+    "codegen": _astuple_tree,
+}
+_AS_TREE_ENGINES: dict[StructEngine, Callable[..., Any]] = {
+    "recursive": _astree_tree,
+    "iterative": _astree_iterative,
+    "codegen": _astree_tree,
+}
+
+_AS_FUNCS_MAPPING: dict[str, Callable[..., Any]] = {
     "dict": _asdict_inner,
     "tuple": _astuple_inner,
     "tree": _astree_inner,
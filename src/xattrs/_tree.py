@@ -1,11 +1,34 @@
 # SPDX-License-Identifier: MIT
+"""
+Pytree helpers backed by ``optree``.
+
+Classes created by `xattrs.define` and `xattrs.dataclass` are registered as
+pytree nodes in the `NAMESPACE_STRUCT_DICT` namespace, so instances of them
+could be flattened and rebuilt by the C++ implementation of ``optree``.
+"""
+
 from __future__ import annotations
 
+from xattrs._compat.typing import Any, Callable, Mapping
+
+from collections import OrderedDict, defaultdict
 from functools import partial
+from threading import RLock
 
+import optree
 from optree import register_pytree_node, tree_flatten, tree_unflatten
 
-__all__ = ["flatten", "register_de_node", "register_ser_node", "unflatten"]
+from xattrs._plan import _gen_fields_getter
+from xattrs._types import _ATOMIC_TYPES
+from xattrs._uni import (
+    _fields,
+    _init_name,
+    _is_data_class_like,
+    _is_data_class_like_instance,
+)
+from xattrs.constants import NAMESPACE_STRUCT_DICT
+
+__all__ = ["flatten", "register_de_node", "register_ser_node", "tree_map", "unflatten"]
 
 _SER_NAMESPACE = "__attrs_ser__"
 _DE_NAMESPACE = "__attrs_deser__"
@@ -13,8 +36,209 @@ _DE_NAMESPACE = "__attrs_deser__"
 _FLATTEN_ATTR = "__attrs_flatten__"
 _UNFLATTEN_ATTR = "__attrs_unflatten__"
 
+_TREE_NAMESPACE = NAMESPACE_STRUCT_DICT
+
 register_ser_node = partial(register_pytree_node, namespace=_SER_NAMESPACE)
 register_de_node = partial(register_pytree_node, namespace=_DE_NAMESPACE)
 
-# flatten = partial(tree_flatten, namespace=_TREE_NAMESPACE)
-# unflatten = tree_unflatten
+# Keep dicts in insertion order in our own namespace, like `asdict` does. The
+# mode is a global setting of ``optree``, so it is only set while our own trees
+# are flattened, under a lock which keeps concurrent calls from restoring it
+# while another one is still flattening.
+_dict_order_lock = RLock()
+
+
+def flatten(tree: Any) -> tuple[list[Any], optree.PyTreeSpec]:
+    """Flatten ``tree`` in our namespace, keeping dicts in insertion order."""
+    with (
+        _dict_order_lock,
+        optree.dict_insertion_ordered(True, namespace=_TREE_NAMESPACE),
+    ):
+        return tree_flatten(tree, none_is_leaf=True, namespace=_TREE_NAMESPACE)
+
+
+unflatten = tree_unflatten
+
+
+def _gen_struct_node(
+    cls: type,
+) -> tuple[Callable[[Any], Any], Callable[[Any, Any], Any]]:
+    """
+    Generate the flatten and unflatten functions of ``cls`` as a pytree node.
+
+    Names of fields, the getter of values and the metadata are computed once
+    here instead of on every call. Instances are rebuilt by position, unless
+    some fields are not positional arguments of ``__init__``.
+    """
+    fields = _fields(cls)
+    names = tuple(f.name for f in fields)
+    getter = _gen_fields_getter(names)
+
+    def flatten(inst: Any) -> tuple[tuple[Any, ...], tuple[str, ...], tuple[str, ...]]:
+        return getter(inst), names, names
+
+    if all(f.init and not f.kw_only for f in fields):
+
+        def unflatten(metadata: Any, children: Any) -> Any:
+            return cls(*children)
+
+    else:
+        # fields with ``init=False`` are left to their defaults
+        init_names = [_init_name(f) if f.init else None for f in fields]
+
+        def unflatten(metadata: Any, children: Any) -> Any:
+            return cls(**{
+                name: value
+                for name, value in zip(init_names, children)
+                if name is not None
+            })
+
+    return flatten, unflatten
+
+
+def tree_map(
+    func: Callable[..., Any],
+    tree: Any,
+    /,
+    *rests: Any,
+    is_leaf: Callable[[Any], bool] | None = None,
+    none_is_leaf: bool = False,
+) -> Any:
+    """
+    Map ``func`` over the leaves of ``tree`` and rebuild it with the results.
+
+    Instances of classes created by `xattrs.define` or `xattrs.dataclass` are
+    traversed as nodes, as well as lists, tuples, dicts and namedtuples. If
+    ``rests`` are given, they must have the same structure as ``tree`` and
+    their leaves are passed to ``func`` as extra positional arguments.
+    """
+    with (
+        _dict_order_lock,
+        optree.dict_insertion_ordered(True, namespace=_TREE_NAMESPACE),
+    ):
+        return optree.tree_map(
+            func,
+            tree,
+            *rests,
+            is_leaf=is_leaf,
+            none_is_leaf=none_is_leaf,
+            namespace=_TREE_NAMESPACE,
+        )
+
+
+class _NotATree(Exception):
+    """Raised when an instance contains nodes not handled by ``optree``."""
+
+
+_STRUCT, _LIST, _TUPLE, _NAMEDTUPLE, _DICT, _DEFAULTDICT = range(1, 7)
+
+# kinds of pytree nodes by their types, see also `_asdict_handlers`
+_node_kinds: dict[type, int] = {
+    list: _LIST,
+    tuple: _TUPLE,
+    dict: _DICT,
+    OrderedDict: _DICT,
+    defaultdict: _DEFAULTDICT,
+}
+_NODE_KINDS_MAXSIZE = 4096
+
+# dataclass-like classes which are not pytree nodes, e.g. of plain
+# `attrs.define`, so their instances are converted without flattening them first
+_struct_leaves: set[type] = set()
+
+
+def _resolve_node_kind(node_type: type) -> int:
+    if _is_data_class_like(node_type):
+        kind = _STRUCT
+    elif issubclass(node_type, tuple) and hasattr(node_type, "_fields"):
+        kind = _NAMEDTUPLE
+    else:
+        # nodes registered by others, or unknown to `astuple` and `astree`
+        raise _NotATree
+    if len(_node_kinds) < _NODE_KINDS_MAXSIZE:
+        _node_kinds[node_type] = kind
+    return kind
+
+
+def _flatten_leaves(
+    inst: Any, copy: Callable[[Any], Any], leaf_types: tuple[type, ...]
+) -> tuple[list[Any], optree.PyTreeSpec]:
+    if type(inst) in _struct_leaves:
+        raise _NotATree
+    leaves, treespec = flatten(inst)
+    if treespec.is_leaf() and _is_data_class_like_instance(inst):
+        if len(_struct_leaves) < _NODE_KINDS_MAXSIZE:
+            _struct_leaves.add(type(inst))
+        raise _NotATree
+    for i, leaf in enumerate(leaves):
+        if type(leaf) in _ATOMIC_TYPES:
+            continue
+        elif isinstance(leaf, leaf_types) or _is_data_class_like_instance(leaf):
+            # containers or dataclass-like instances which are not registered
+            raise _NotATree
+        leaves[i] = copy(leaf)
+    return leaves, treespec
+
+
+def _astuple_optree(
+    inst: Any, tuple_factory, copy, key_inner: Callable[[Any], Any]
+) -> Any:
+    """
+    Build the output of `astuple` from the pytree of ``inst``.
+
+    Raises `_NotATree` if some nodes of ``inst`` are not registered.
+    """
+
+    def keys_of(keys: list[Any]) -> list[Any]:
+        return [k if type(k) in _ATOMIC_TYPES else key_inner(k) for k in keys]
+
+    def node_builder(node_type: type, node_data: Any, children: tuple[Any, ...]):
+        kind = _node_kinds.get(node_type) or _resolve_node_kind(node_type)
+        if kind == _STRUCT:
+            return tuple_factory(children)
+        elif kind == _LIST:
+            return list(children)
+        elif kind == _TUPLE:
+            return children
+        elif kind == _NAMEDTUPLE:
+            return node_type(*children)
+        elif kind == _DICT:
+            return node_type(zip(keys_of(node_data), children))
+        default_factory, keys = node_data
+        result = node_type(default_factory)
+        result.update(zip(keys_of(keys), children))
+        return result
+
+    leaves, treespec = _flatten_leaves(inst, copy, (list, tuple, dict))
+    return treespec.walk(leaves, node_builder, None)
+
+
+def _astree_optree(
+    inst: Any, tuple_factory, copy, key_inner: Callable[[Any], Any]
+) -> Any:
+    """
+    Build the output of `astree` from the pytree of ``inst``.
+
+    Raises `_NotATree` if some nodes of ``inst`` are not registered.
+    """
+
+    def node_builder(node_type: type, node_data: Any, children: tuple[Any, ...]):
+        kind = _node_kinds.get(node_type) or _resolve_node_kind(node_type)
+        if kind == _STRUCT:
+            return tuple_factory(children)
+        elif kind == _LIST:
+            return list(children)
+        elif kind == _TUPLE:
+            return children
+        elif kind == _NAMEDTUPLE:
+            return node_type(*children)
+        keys = node_data if kind == _DICT else node_data[1]
+        return tuple(
+            zip(
+                [k if type(k) in _ATOMIC_TYPES else key_inner(k) for k in keys],
+                children,
+            )
+        )
+
+    leaves, treespec = _flatten_leaves(inst, copy, (list, tuple, Mapping))
+    return treespec.walk(leaves, node_builder, None)
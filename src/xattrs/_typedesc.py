@@ -0,0 +1,212 @@
+# SPDX-License-Identifier: MIT
+"""
+Compile type annotations into compact, hashable descriptor trees.
+
+Introspecting ``typing`` objects with ``get_origin`` / ``get_args`` is slow, so
+every annotation is described once and memoized. Serializers and
+deserializers dispatch on the kind of descriptor instead.
+"""
+
+from __future__ import annotations
+
+import collections.abc
+from xattrs._compat.typing import (
+    Any,
+    ForwardRef,
+    Literal,
+    TypeVar,
+    cast,
+    get_args,
+    get_origin,
+)
+
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass
+
+from xattrs._guards import (
+    is_annotated,
+    is_enum,
+    is_hetero_tuple,
+    is_new_type,
+    is_tuple,
+    is_union,
+)
+from xattrs._uni import _is_data_class_like
+
+
+@dataclass(slots=True, frozen=True)
+class _TypeDesc:
+    """Base of all type descriptors."""
+
+
+@dataclass(slots=True, frozen=True)
+class _AnyDesc(_TypeDesc):
+    """``Any``, unresolved forward references and type variables."""
+
+
+@dataclass(slots=True, frozen=True)
+class _ClassDesc(_TypeDesc):
+    """A plain class without any special handling, e.g. ``int``."""
+
+    cls: type
+
+
+@dataclass(slots=True, frozen=True)
+class _StructDesc(_TypeDesc):
+    """A dataclass or attrs class."""
+
+    cls: type
+
+
+@dataclass(slots=True, frozen=True)
+class _EnumDesc(_TypeDesc):
+    cls: type
+
+
+@dataclass(slots=True, frozen=True)
+class _LiteralDesc(_TypeDesc):
+    values: tuple[Any, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class _NewTypeDesc(_TypeDesc):
+    new_type: Any
+    supertype: _TypeDesc
+
+
+@dataclass(slots=True, frozen=True)
+class _AnnotatedDesc(_TypeDesc):
+    inner: _TypeDesc
+    metadata: tuple[Any, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class _OptionalDesc(_TypeDesc):
+    """``Optional[T]``, unions of other types are `_UnionDesc`."""
+
+    inner: _TypeDesc
+
+
+@dataclass(slots=True, frozen=True)
+class _UnionDesc(_TypeDesc):
+    arms: tuple[_TypeDesc, ...]
+    optional: bool
+
+
+@dataclass(slots=True, frozen=True)
+class _SequenceDesc(_TypeDesc):
+    """Homogeneous sequences and sets, ``tuple[T, ...]`` included."""
+
+    # the concrete class to construct, e.g. ``list`` for ``Sequence[T]``
+    container: type
+    item: _TypeDesc
+
+
+@dataclass(slots=True, frozen=True)
+class _TupleDesc(_TypeDesc):
+    """Tuples of fixed length, e.g. ``tuple[int, str]``."""
+
+    items: tuple[_TypeDesc, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class _MappingDesc(_TypeDesc):
+    container: type
+    key: _TypeDesc
+    value: _TypeDesc
+
+
+ANY = _AnyDesc()
+
+# Abstract containers are constructed as their builtin counterparts.
+_SEQUENCE_CONTAINERS: dict[Any, type] = {
+    list: list,
+    tuple: tuple,
+    set: set,
+    frozenset: frozenset,
+    deque: deque,
+    collections.abc.Sequence: list,
+    collections.abc.MutableSequence: list,
+    collections.abc.Iterable: list,
+    collections.abc.Collection: list,
+    collections.abc.Set: frozenset,
+    collections.abc.MutableSet: set,
+}
+_MAPPING_CONTAINERS: dict[Any, type] = {
+    dict: dict,
+    OrderedDict: OrderedDict,
+    defaultdict: defaultdict,
+    collections.abc.Mapping: dict,
+    collections.abc.MutableMapping: dict,
+}
+
+_descs: dict[Any, _TypeDesc] = {}
+_DESCS_MAXSIZE = 4096
+
+
+def _describe(tp: Any) -> _TypeDesc:
+    """Return the memoized descriptor of the annotation ``tp``."""
+    try:
+        return _descs[tp]
+    except KeyError:
+        pass
+    except TypeError:
+        # unhashable annotations, e.g. ``Annotated`` with a dict as metadata
+        return _compile(tp)
+
+    desc = _compile(tp)
+    if len(_descs) < _DESCS_MAXSIZE:
+        _descs[tp] = desc
+    return desc
+
+
+def _compile(tp: Any) -> _TypeDesc:  # noqa: PLR0911
+    if tp is Any or tp is None or isinstance(tp, (str, ForwardRef, TypeVar)):
+        # an unannotated attrs field has ``None`` as its type
+        return ANY
+    elif isinstance(tp, type) and _is_data_class_like(tp):
+        return _StructDesc(tp)
+    elif isinstance(tp, type) and is_enum(tp):
+        # ``is_enum`` narrows to members, ``tp`` is the enum class itself
+        return _EnumDesc(cast(type, tp))
+    elif is_annotated(tp):
+        return _AnnotatedDesc(_describe(tp.__origin__), tp.__metadata__)
+    elif is_new_type(tp):
+        return _NewTypeDesc(tp, _describe(tp.__supertype__))
+    elif is_union(tp):
+        arms = tuple(_describe(arg) for arg in get_args(tp) if arg is not type(None))
+        optional = len(arms) < len(get_args(tp))
+        if optional and len(arms) == 1:
+            return _OptionalDesc(arms[0])
+        return _UnionDesc(arms, optional)
+
+    origin = get_origin(tp) or tp
+    args = get_args(tp)
+    if origin is Literal:
+        return _LiteralDesc(args)
+    elif is_tuple(tp) and is_hetero_tuple(tp):
+        if args == ((),):
+            # ``tuple[()]``
+            return _TupleDesc(())
+        return _TupleDesc(tuple(_describe(arg) for arg in args))
+    elif origin in _SEQUENCE_CONTAINERS:
+        return _SequenceDesc(
+            _SEQUENCE_CONTAINERS[origin], _describe(args[0]) if args else ANY
+        )
+    elif origin in _MAPPING_CONTAINERS:
+        key, value = (_describe(args[0]), _describe(args[1])) if args else (ANY, ANY)
+        return _MappingDesc(_MAPPING_CONTAINERS[origin], key, value)
+    elif isinstance(tp, type):
+        return _ClassDesc(tp)
+    return ANY
+
+
+def _unwrap(desc: _TypeDesc) -> _TypeDesc:
+    """Strip ``Annotated`` and ``NewType`` wrappers off ``desc``."""
+    while True:
+        if isinstance(desc, _AnnotatedDesc):
+            desc = desc.inner
+        elif isinstance(desc, _NewTypeDesc):
+            desc = desc.supertype
+        else:
+            return desc
@@ -1,7 +1,9 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
-from xattrs._compat.typing import Any, TypeGuard, cast, overload
+from types import SimpleNamespace
+from typing_extensions import get_annotations
+from xattrs._compat.typing import Any, TypeGuard, cast, get_type_hints, overload
 from xattrs._typing import (
     AttrsInstance,
     DataclassInstance,
@@ -10,9 +12,9 @@ from xattrs._typing import (
     _DataclassParams,
 )
 
-from dataclasses import MISSING, Field
+import sys
+from dataclasses import MISSING, Field, is_dataclass
 from dataclasses import fields as dataclass_fields
-from dataclasses import is_dataclass
 
 from attr._make import _CountingAttr
 from attrs import NOTHING, Attribute
@@ -20,7 +22,7 @@ from attrs import fields as attrs_fields
 
 _ATTRS_ATTRS = "__attrs_attrs__"
 _DATACLASS_FIELDS = "__dataclass_fields__"
-_DATACLASS_PARAMS = "_dataclass_params__"
+_DATACLASS_PARAMS = "__dataclass_params__"
 
 
 def _is_attrs_instance(inst: Any) -> TypeGuard[AttrsInstance]:
@@ -74,9 +76,7 @@ def _get_params(
 
 
 @overload
-def _get_params(
-    obj: AttrsInstance | type[AttrsInstance],
-) -> _AttrsParams: ...
+def _get_params(obj: AttrsInstance | type[AttrsInstance]) -> _AttrsParams: ...
 
 
 def _get_params(obj: Any) -> _DataclassParams | _AttrsParams:
@@ -117,6 +117,50 @@ def _fields(obj: Any) -> tuple[Attribute[Any]] | tuple[Field[Any]]:
         return dataclass_fields(cls)  # pyright: ignore[reportReturnType]
 
 
+def _field_types(obj: Any, *, strict: bool = False) -> dict[str, Any]:
+    """Return a mapping of field names to their (resolved) types.
+
+    String annotations are resolved with `typing.get_type_hints`. If some of
+    them can not be, the others are still resolved one at a time, and the
+    declared ``type`` of the field is returned as it is, unless ``strict``, in
+    which case `NameError` is raised for the first of them.
+    """
+    cls = obj if isinstance(obj, type) else type(obj)
+    try:
+        hints = get_type_hints(cls, include_extras=True)
+    except (NameError, TypeError):
+        hints = _resolve_field_hints(cls, strict)
+    return {f.name: hints.get(f.name, f.type) for f in _fields(cls)}
+
+
+def _resolve_field_hints(cls: type, strict: bool) -> dict[str, Any]:
+    hints: dict[str, Any] = {}
+    for base in reversed(cls.__mro__):
+        module = sys.modules.get(base.__module__)
+        globalns = getattr(module, "__dict__", {})
+        localns = dict(vars(base))
+        for name, tp in get_annotations(base).items():
+            holder = SimpleNamespace(__annotations__={name: tp})
+            try:
+                hints[name] = get_type_hints(
+                    holder, globalns, localns, include_extras=True
+                )[name]
+            except (NameError, TypeError) as exc:
+                if strict:
+                    raise NameError(
+                        f"Can not resolve the annotation {tp!r} of field "
+                        f"{name!r} of {cls.__qualname__}: {exc}. Define it at "
+                        "module level, or resolve it by `attrs.resolve_types`."
+                    ) from exc
+                hints.pop(name, None)
+    return hints
+
+
+def _init_name(attribute: Field[Any] | Attribute[Any]) -> str:
+    """Return the name of the ``__init__`` argument of a field."""
+    return getattr(attribute, "alias", None) or attribute.name
+
+
 def _is_field_like_instance(inst: Any) -> bool:
     if isinstance(inst, (Field, _CountingAttr, Attribute)):
         return True
@@ -32,6 +32,7 @@ from attrs import (
 )
 from attrs import define as _define
 
+from xattrs._tree import _gen_struct_node
 from xattrs.constants import NAMESPACE_STRUCT_DICT
 
 # Keep the same with the `attrs` module. (except `make_class`)
@@ -39,24 +40,13 @@ from xattrs.constants import NAMESPACE_STRUCT_DICT
 __all__ = [*attrs.__all__]  # type: ignore[reportAttributeAccessIssue]  # noqa: PLE0604
 
 
-def _attrs_flatten(inst):
-    cls = inst.__class__
-    fs = fields(cls)
-    children = tuple(getattr(inst, f.name) for f in fs)
-    return (children, fields_dict(cls), {f.name: "*" for f in fs})
-
-
 def define(cls=None, **kwargs):
     def wrap(_cls):
         attrs_cls = _define(_cls, **kwargs)
-
-        def _attrs_unflatten(metadata, children):
-            return attrs_cls(**{f.name: v for f, v in zip(fields(attrs_cls), children)})
-
+        flatten, unflatten = _gen_struct_node(attrs_cls)
         optree.register_pytree_node(
-            attrs_cls, _attrs_flatten, _attrs_unflatten, namespace=NAMESPACE_STRUCT_DICT
+            attrs_cls, flatten, unflatten, namespace=NAMESPACE_STRUCT_DICT
         )
-
         return attrs_cls
 
     if cls is None:
@@ -5,6 +5,7 @@ from xattrs._typing import T
 from xattrs.typing import CaseConvention, CaseConverter
 
 import re
+from functools import wraps
 
 
 def identity(val: T) -> T:
@@ -30,12 +31,16 @@ def to_camel(value: str) -> str:
     return pascal[0].lower() + pascal[1:]
 
 
+_PASCAL_EXPR = re.compile(r"(?:^|_)(.)")
+_SNAKE_EXPR0 = re.compile(r"(.)([A-Z][a-z]+)")
+_SNAKE_EXPR1 = re.compile(r"([a-z0-9])([A-Z])")
+
+
 def to_pascal(value: str) -> str:
     if "-" in value:
         value = value.replace("-", "_")
 
-    expr = re.compile(r"(?:^|_)(.)")
-    return expr.sub(lambda m: m.group(1).lower().title(), value)
+    return _PASCAL_EXPR.sub(lambda m: m.group(1).lower().title(), value)
 
 
 def to_snake(value: str) -> str:
@@ -44,10 +49,8 @@ def to_snake(value: str) -> str:
             w.lower().capitalize() for w in value.replace("_", "-").split("-")
         )
 
-    expr0 = re.compile(r"(.)([A-Z][a-z]+)")
-    expr1 = re.compile(r"([a-z0-9])([A-Z])")
     repl = r"\1_\2"
-    return expr1.sub(repl, expr0.sub(repl, value)).lower()
+    return _SNAKE_EXPR1.sub(repl, _SNAKE_EXPR0.sub(repl, value)).lower()
 
 
 def to_kebab(value: str) -> str:
@@ -63,15 +66,54 @@ def to_const(value: str) -> str:
     return to_snake(value).upper()
 
 
+# Names are a small closed set, converted names are memoized by convention.
+_case_cache: dict[tuple[CaseConvention, str], str] = {}
+_case_cache_maxsize = 4096
+
+
+def clear_case_cache() -> None:
+    """Clear memoized names converted by case conventions."""
+    _case_cache.clear()
+
+
+def set_case_cache_size(maxsize: int) -> None:
+    """Set the max number of memoized names, 0 disables memoization."""
+    global _case_cache_maxsize  # noqa: PLW0603
+    if maxsize < 0:
+        raise ValueError(f"maxsize must be non-negative, got {maxsize!r}")
+    _case_cache_maxsize = maxsize
+    _case_cache.clear()
+
+
+def _memoized(convention: CaseConvention, func: CaseConverter) -> CaseConverter:
+    @wraps(func)
+    def convert(value: str) -> str:
+        key = (convention, value)
+        try:
+            return _case_cache[key]
+        except KeyError:
+            pass
+        result = func(value)
+        if len(_case_cache) < _case_cache_maxsize:
+            _case_cache[key] = result
+        return result
+
+    return convert
+
+
+_CASE_CONVERTERS: tuple[tuple[CaseConvention, CaseConverter], ...] = (
+    ("lowercase", to_lower),
+    ("uppercase", to_upper),
+    ("UPPERCASE", to_upper),
+    ("capitalcase", to_capital),
+    ("Capitalcase", to_capital),
+    ("snake_case", to_snake),
+    ("camelCase", to_camel),
+    ("kebab-case", to_kebab),
+    ("CONST_CASE", to_upper),
+    ("PascalCase", to_pascal),
+)
+
 _CASE_CONVERTER_MAPPING: dict[CaseConvention, CaseConverter] = {
-    "lowercase": to_lower,
-    "uppercase": to_upper,
-    "UPPERCASE": to_upper,
-    "capitalcase": to_capital,
-    "Capitalcase": to_capital,
-    "snake_case": to_snake,
-    "camelCase": to_camel,
-    "kebab-case": to_kebab,
-    "CONST_CASE": to_upper,
-    "PascalCase": to_pascal,
+    convention: _memoized(convention, func) for convention, func in _CASE_CONVERTERS
 }
@@ -1,8 +1,6 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
-from xattrs._typing import DataclassInstance
-
 from dataclasses import (
     KW_ONLY,
     MISSING,
@@ -20,7 +18,8 @@ from dataclasses import dataclass as _dataclass
 
 import optree
 
-from xattrs.constants import METANAME
+from xattrs._tree import _gen_struct_node
+from xattrs.constants import NAMESPACE_STRUCT_DICT
 
 # Keep the same with the `dataclasses` module of std lib, except `make_dataclass`.
 # `make_dataclass` is not a full replacement  in `xattrs`.
@@ -41,12 +40,8 @@ __all__ = [
 ]
 
 
-def _dataclass_flatten(ins: DataclassInstance):
-    return (ins.__dict__, fields(ins))  # type: ignore[reportArgumentType]
-
-
 def dataclass(  # noqa: PLR0913
-    cls,
+    cls=None,
     /,
     *,
     init=True,
@@ -73,11 +68,9 @@ def dataclass(  # noqa: PLR0913
             slots=slots,
         )
 
-        def _dataclass_unflatten(metadata, children) -> DataclassInstance:
-            return dataclass_cls(**metadata)
-
+        flatten, unflatten = _gen_struct_node(dataclass_cls)
         optree.register_pytree_node(
-            dataclass_cls, _dataclass_flatten, _dataclass_unflatten, namespace=METANAME
+            dataclass_cls, flatten, unflatten, namespace=NAMESPACE_STRUCT_DICT
         )
 
         return dataclass_cls
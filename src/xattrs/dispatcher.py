@@ -1,34 +1,47 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
+from types import MappingProxyType
 from typing import NoReturn
 from xattrs._compat.typing import (
     TYPE_CHECKING,
     Any,
     Callable,
-    ClassVar,
     Final,
     Mapping,
+    Union,
     cast,
+    get_origin,
 )
 from xattrs._typing import (
     Dispatchable,
     Hook,
+    HookFacatory,
+    HookPredicate,
     SingleDispatchCallable,
     T,
     UnarySingleDispatchCallable,
 )
 
+from abc import get_cache_token
 from functools import singledispatch
 
+from xattrs._guards import is_union
 from xattrs.abc import AbstractDispatcher
 from xattrs.exceptions import HookNotFoundError
 
+_TYPING_MODULES = frozenset({"typing", "typing_extensions"})
+
 
 def _dispatch_not_found(_, **kwargs) -> NoReturn:
     raise HookNotFoundError("Hook not found. This raised by not found fallback hook.")
 
 
+def _no_hook(_: Any) -> Any:
+    # the default of ``singledispatch``, for classes without any registered hook
+    raise AssertionError("unreachable")
+
+
 _unary_hook_registry: dict[type[T], Callable[[Any], T]] = {
     # builtin types
     # error/exception types
@@ -47,44 +60,189 @@ _warning_hook = {}
 # frozenset: lambda x: frozenset(x)
 
 
-class ConcreteDispatch(AbstractDispatcher[T]):
-    """Dispatch for concrete types."""
+class Dispatcher(AbstractDispatcher[T]):
+    """Unified dispatcher of hooks for types.
 
-    _registry: dict[type[T], Hook[T]] = _unary_hook_registry  # pyright: ignore[reportAssignmentType] # fmt: skip
+    Hooks of a type are resolved in order by:
 
-    # def register(self, cls: Dispatchable[T], func: Hook[T]) -> Hook[T]:
-    #     self._registry[cls] = func
-    #     return func
+    1. the :term:`method resolution order <MRO>` of the type, with registered
+       abstract base classes merged in, the most specific registered class
+       wins, the same as `functools.singledispatch`;
+    2. predicate hooks (`HookPredicate`), in order of registration;
+    3. the ``fallback`` hook.
+
+    The resolved hook is memoized per type, so dispatching costs a single dict
+    lookup after the first call. Registering a hook, or a virtual subclass of
+    an abstract base class by ``ABC.register``, invalidates the cache.
+    """
+
+    def __init__(
+        self,
+        fallback: Hook[T] | None = None,
+        registry: dict[type[T], Hook[T]] | None = None,
+    ) -> None:
+        self._registry: dict[type[T], Hook[T]] = {} if registry is None else registry
+        self._predicates: list[tuple[HookPredicate[T, ...], Hook[T]]] = []
+        self._fallback = fallback
+        self._cache: dict[Any, Hook[T] | None] = {}
+        self._cache_token: object = None
+        # resolves classes by their MRO with abstract base classes merged in
+        self._single = singledispatch(_no_hook)
+        for cls, func in self._registry.items():
+            self._register_class(cls, func)
+
+    @property
+    def registry(self) -> Mapping[type[T], Hook[T]]:
+        return MappingProxyType(self._registry)
+
+    def register(self, cls: Dispatchable[T], func: Hook[T] | None = None) -> Any:
+        """
+        Register ``func`` as the hook for the class or predicate ``cls``.
+
+        Returns a decorator if ``func`` is not given.
+        """
+        if func is None:
+            return lambda f: self.register(cls, f)
+
+        if isinstance(cls, type):
+            self._registry[cls] = func
+            self._register_class(cls, func)
+        elif callable(cls):
+            self._predicates.append((cls, func))
+        else:
+            raise TypeError(f"Expected a class or a predicate, got {cls!r}")
+        self._cache.clear()
+        return func
+
+    def _register_class(self, cls: type[T], func: Hook[T]) -> None:
+        self._single.register(cls, func)
+        if self._cache_token is None and hasattr(cls, "__abstractmethods__"):
+            # from now on, virtual subclasses may change resolved hooks
+            self._cache_token = get_cache_token()
 
     def dispatch(self, cls: type[T]) -> Hook[T]:
-        hook = self._registry.get(cls)
+        if self._cache_token is not None and self._cache_token != get_cache_token():
+            self._cache.clear()
+            self._cache_token = get_cache_token()
+        try:
+            hook = self._cache[cls]
+        except KeyError:
+            hook = self._cache[cls] = self._resolve(cls)
+        except TypeError:
+            # unhashable, e.g. ``Annotated`` with a dict as metadata
+            hook = self._resolve(cls)
+
         if hook is None:
             raise HookNotFoundError(f"Hook for {cls} not found.")
         return hook
 
+    def _resolve(self, cls: type[T]) -> Hook[T] | None:
+        if isinstance(cls, type):
+            hook = self._single.dispatch(cls)
+            if hook is not _no_hook:
+                return hook
+        for pred, hook in self._predicates:
+            if pred(cls):
+                return hook
+        return self._fallback
 
-class SingleDispatcher(AbstractDispatcher[T]):
-    """Single dispatch dispatcher
-
-    This is a dispatcher that uses the ``singledispatch`` function for ``covariant`` types.
-    """
 
-    _registry: ClassVar[...]
+class ConcreteDispatch(Dispatcher[T]):
+    """Dispatch for concrete types, and their subclasses."""
 
     def __init__(self) -> None:
-        self._singledispatch = singledispatch(_dispatch_not_found)
+        # a copy, so hooks registered on one instance do not leak into others
+        super().__init__(registry=dict(_unary_hook_registry))  # type: ignore[arg-type]
 
-    def register(self, cls: type[T], func: Hook[T]) -> Hook[T]:
-        return self._singledispatch.register(cls, func)
 
-    def dispatch(self, cls: type[T]) -> Hook[T]:
-        return self._singledispatch.dispatch(cls)
+class SingleDispatcher(Dispatcher[T]):
+    """Single dispatch dispatcher
 
+    This is a dispatcher for ``covariant`` types. Like ``singledispatch``, types
+    without any hook are dispatched to a hook which raises `HookNotFoundError`
+    on call.
+    """
 
-class GenericDispatcher:
+    def __init__(self) -> None:
+        super().__init__(fallback=_dispatch_not_found)
+
+
+class GenericDispatcher(AbstractDispatcher[T]):
     """Generic dispatcher
 
-    This is a dispatcher that uses the ``singledispatch`` function for ``contravariant`` types.
+    This is a dispatcher of hook factories (`HookFacatory`) for parametrized
+    generics, e.g. ``list[int]``, ``dict[str, Model]``, ``tuple[int, ...]`` or
+    ``Annotated[T, ...]``. Factories are registered for the origin of aliases:
+    a class, resolved by its MRO like `Dispatcher`, or a special form such as
+    ``Annotated``, ``Union`` or ``Literal``. Predicates are called with the
+    alias itself.
+
+    The factory is called once per distinct alias with the alias, and the hook
+    it produces is cached by the identity and equality of the alias. Factories
+    of containers can dispatch their arguments once to build specialized hooks,
+    instead of dispatching every element.
     """
 
-    _registry: ClassVar
+    def __init__(self, fallback: HookFacatory[T, ...] | None = None) -> None:
+        self._factories: Dispatcher[Any] = Dispatcher()
+        self._forms: dict[Any, HookFacatory[T, ...]] = {}
+        self._predicates: list[tuple[HookPredicate[T, ...], HookFacatory[T, ...]]] = []
+        self._fallback = fallback
+        self._cache: dict[Any, Hook[T]] = {}
+        self._cache_token: object = None
+
+    def register(  # type: ignore[override]
+        self, origin: Dispatchable[T], factory: HookFacatory[T, ...] | None = None
+    ) -> Any:
+        """
+        Register ``factory`` for aliases of ``origin``, or the predicate ``origin``.
+
+        Returns a decorator if ``factory`` is not given.
+        """
+        if factory is None:
+            return lambda f: self.register(origin, f)
+
+        if isinstance(origin, type):
+            self._factories.register(origin, factory)
+            if self._cache_token is None and hasattr(origin, "__abstractmethods__"):
+                self._cache_token = get_cache_token()
+        elif getattr(origin, "__module__", None) in _TYPING_MODULES:
+            # special forms, which are callable but not predicates
+            self._forms[origin] = factory
+        elif callable(origin):
+            self._predicates.append((origin, factory))
+        else:
+            raise TypeError(f"Expected a class or a predicate, got {origin!r}")
+        self._cache.clear()
+        return factory
+
+    def dispatch(self, cls: Any) -> Hook[T]:
+        if self._cache_token is not None and self._cache_token != get_cache_token():
+            self._cache.clear()
+            self._cache_token = get_cache_token()
+        try:
+            return self._cache[cls]
+        except KeyError:
+            hook = self._cache[cls] = self._make_hook(cls)
+        except TypeError:
+            # unhashable, e.g. ``Annotated`` with a dict as metadata
+            hook = self._make_hook(cls)
+        return hook
+
+    def _make_hook(self, tp: Any) -> Hook[T]:
+        # ``X | Y`` and ``Union[X, Y]`` have different origins
+        origin = Union if is_union(tp) else get_origin(tp) or tp
+
+        factory = self._forms.get(origin)
+        if factory is None and isinstance(origin, type):
+            try:
+                factory = cast("HookFacatory[T, ...]", self._factories.dispatch(origin))
+            except HookNotFoundError:
+                pass
+        if factory is None:
+            factory = next(
+                (f for pred, f in self._predicates if pred(tp)), self._fallback
+            )
+        if factory is None:
+            raise HookNotFoundError(f"Hook for {tp} not found.")
+        return factory(tp)
@@ -24,3 +24,9 @@ class HookNotFoundError(DispatchError):
     """
     Raised when a hook for a type is not found from dispatch register.
     """
+
+
+class DeserializeError(XAttrsException):
+    """
+    Raised when data could not be constructed into an instance of a class.
+    """
@@ -9,6 +9,10 @@ def keep_include(field: Any, value: Any) -> Literal[True]:
     return True
 
 
+def keep_exclude(field: Any, value: Any) -> Literal[False]:
+    return False
+
+
 def exclude_if_default(field: FieldLike[Any], value: Any) -> bool:
     if field.default is not None:
         if not callable(field.default):
@@ -0,0 +1,147 @@
+# SPDX-License-Identifier: MIT
+"""
+JSON backends with the same ``dumps`` / ``loads`` interface.
+
+The standard library ``json`` is the default backend. With ``"auto"``,
+installed accelerators are probed at first use, in order of speed: ``orjson``,
+``msgspec.json`` and ``ujson``, falling back to ``json``.
+
+Every backend supports the ``indent``, ``sort_keys`` and ``default`` options
+of ``dumps`` and outputs ``str``. Other options, e.g. ``ensure_ascii`` or
+``separators``, and options of ``loads`` are passed to the standard library
+``json`` instead. Separators of the output differ, e.g. ``orjson`` and
+``msgspec`` output compact JSON.
+"""
+
+from __future__ import annotations
+
+from xattrs._compat.typing import Any, Callable
+
+import json
+from dataclasses import dataclass
+from importlib import import_module
+
+__all__ = ("JSON_BACKENDS", "JsonBackend", "get_json_backend")
+
+
+@dataclass(slots=True, frozen=True)
+class JsonBackend:
+    name: str
+    # (obj, *, indent=None, sort_keys=False, default=None, **kwargs) -> str
+    dumps: Callable[..., str]
+    loads: Callable[..., Any]
+
+
+def _json_backend() -> JsonBackend:
+    return JsonBackend("json", json.dumps, json.loads)
+
+
+# options of ``dumps`` supported by all backends
+_DUMPS_OPTIONS = frozenset({"indent", "sort_keys", "default"})
+
+
+def _loads_with_fallback(loads: Callable[[Any], Any]) -> Callable[..., Any]:
+    def loads_or_json(s: Any, **kwargs: Any) -> Any:
+        # e.g. ``object_hook`` of `json.loads`
+        return json.loads(s, **kwargs) if kwargs else loads(s)
+
+    return loads_or_json
+
+
+def _orjson_backend() -> JsonBackend:
+    orjson = import_module("orjson")
+
+    def dumps(obj: Any, **kwargs: Any) -> str:
+        indent = kwargs.get("indent")
+        if indent not in {None, 2} or not kwargs.keys() <= _DUMPS_OPTIONS:
+            # only two spaces are supported
+            return json.dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if kwargs.get("sort_keys"):
+            option |= orjson.OPT_SORT_KEYS
+        data = orjson.dumps(obj, default=kwargs.get("default"), option=option)
+        return data.decode()  # type: ignore[no-any-return]
+
+    return JsonBackend("orjson", dumps, _loads_with_fallback(orjson.loads))
+
+
+def _msgspec_backend() -> JsonBackend:
+    msgspec_json = import_module("msgspec.json")
+    encoder = msgspec_json.Encoder()
+
+    def dumps(obj: Any, **kwargs: Any) -> str:
+        if not kwargs.keys() <= _DUMPS_OPTIONS:
+            return json.dumps(obj, **kwargs)
+        default = kwargs.get("default")
+        sort_keys = kwargs.get("sort_keys", False)
+        if default is None and not sort_keys:
+            data = encoder.encode(obj)
+        else:
+            data = msgspec_json.encode(
+                obj, enc_hook=default, order="sorted" if sort_keys else None
+            )
+        if (indent := kwargs.get("indent")) is not None:
+            data = msgspec_json.format(data, indent=indent)
+        return data.decode()  # type: ignore[no-any-return]
+
+    # a reusable decoder, instead of setting one up per call
+    decoder = msgspec_json.Decoder()
+    return JsonBackend("msgspec", dumps, _loads_with_fallback(decoder.decode))
+
+
+def _ujson_backend() -> JsonBackend:
+    ujson = import_module("ujson")
+    options = _DUMPS_OPTIONS | {"ensure_ascii"}
+
+    def dumps(obj: Any, **kwargs: Any) -> str:
+        if not kwargs.keys() <= options:
+            return json.dumps(obj, **kwargs)
+        indent = kwargs.pop("indent", None)
+        return ujson.dumps(obj, indent=indent or 0, **kwargs)  # type: ignore[no-any-return]
+
+    return JsonBackend("ujson", dumps, _loads_with_fallback(ujson.loads))
+
+
+# in order of preference for automatic selection
+JSON_BACKENDS: dict[str, Callable[[], JsonBackend]] = {
+    "orjson": _orjson_backend,
+    "msgspec": _msgspec_backend,
+    "ujson": _ujson_backend,
+    "json": _json_backend,
+}
+
+_backends: dict[str, JsonBackend] = {}
+
+
+def get_json_backend(name: str | None = None) -> JsonBackend:
+    """
+    Return the JSON backend called ``name``, the fastest installed one if
+    ``name`` is ``"auto"``, or the standard library ``json`` if None.
+
+    Backends are imported at first use and cached. Raises `ImportError` if the
+    library of ``name`` is not installed.
+    """
+    if name is None:
+        name = "json"
+    try:
+        return _backends[name]
+    except KeyError:
+        pass
+
+    if name == "auto":
+        for candidate in JSON_BACKENDS:
+            try:
+                backend = get_json_backend(candidate)
+            except ImportError:
+                continue
+            break
+    elif name in JSON_BACKENDS:
+        backend = JSON_BACKENDS[name]()
+    else:
+        raise ValueError(
+            f"unknown JSON backend: {name!r}, expected one of {list(JSON_BACKENDS)}"
+        )
+    _backends[name] = backend
+    return backend
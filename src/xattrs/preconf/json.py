@@ -1,17 +1,33 @@
 # SPDX-License-Identifier: MIT
 
-import types
-from xattrs._compat.typing import Any, AnyStr, Callable, TypeVar, Union
+from __future__ import annotations
+
+from xattrs._compat.typing import (
+    IO,
+    Any,
+    AnyStr,
+    Callable,
+    Iterable,
+    Iterator,
+    TypeVar,
+    Union,
+)
 from xattrs.typing import DeserializeFunc, SerializeFunc
 
 import json
+import math
 from datetime import datetime
+from json.encoder import encode_basestring_ascii
 
-from xattrs._struct_funcs import asdict_shallow
+from xattrs._de_funcs import _fromdict_many, fromdict
+from xattrs._events import END_ARRAY, END_MAP, MAP_KEY, SCALAR, START_MAP, iter_events
+from xattrs._struct_funcs import asdict
+from xattrs._uni import _is_data_class_like
 from xattrs.deserializer import Deserializer
+from xattrs.preconf._json_backends import JsonBackend, get_json_backend
 from xattrs.serializer import Serializer
 
-__all__ = ["from_json", "to_json"]
+__all__ = ["dump", "dump_lines", "from_json", "iter_json", "load_lines", "to_json"]
 
 # Supports the following objects and types by default:
 #
@@ -36,11 +52,62 @@ __all__ = ["from_json", "to_json"]
 
 T = TypeVar("T")
 
-Jsonable = Union[dict, list, tuple, str, int, float, bool, types.NoneType]  # type: ignore[type-arg,valid-type]
+Jsonable = Union[dict, list, tuple, str, int, float, bool, None]  # type: ignore[type-arg]
+
+
+# output of ``json.dumps`` with default options
+_ITEM_SEPARATOR = ", "
+_KEY_SEPARATOR = ": "
+_CHUNK_SIZE = 64 * 1024
+
+
+def _encode_float(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    elif value == float("inf"):
+        return "Infinity"
+    elif value == float("-inf"):
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+# encoders of exact types, everything else is encoded by ``json.dumps``
+_SCALAR_ENCODERS: dict[type, Callable[[Any], str]] = {
+    str: encode_basestring_ascii,
+    int: int.__repr__,
+    float: _encode_float,
+    bool: lambda value: "true" if value else "false",
+    type(None): lambda value: "null",
+}
+
+
+def _encode_key(key: Any) -> str:
+    # same coercion of keys as ``json.dumps``
+    if isinstance(key, str):
+        return encode_basestring_ascii(key)
+    elif key is True or key is False or key is None or isinstance(key, (int, float)):
+        return encode_basestring_ascii(json.dumps(key))
+    raise TypeError(
+        f"keys must be str, int, float, bool or None, not {type(key).__name__}"
+    )
 
 
 class JsonDeserializer(Deserializer[AnyStr, Jsonable]):
-    """JSON deserializer."""
+    """JSON deserializer.
+
+    ``backend`` is the name of a JSON library (see `JSON_BACKENDS`), a
+    `JsonBackend`, or ``"auto"`` for the fastest installed one. The standard
+    library ``json`` is used if None.
+    """
+
+    def __init__(self, backend: str | JsonBackend | None = None):
+        self._backend = backend
+
+    @property
+    def backend(self) -> JsonBackend:
+        if not isinstance(self._backend, JsonBackend):
+            self._backend = get_json_backend(self._backend)
+        return self._backend
 
     def _datetime_from_isoformat(self, value: str) -> datetime:
         """Convert the value to a Python object."""
@@ -48,52 +115,231 @@ class JsonDeserializer(Deserializer[AnyStr, Jsonable]):
 
     def loads(self, data: AnyStr, **kwargs: Any) -> Any:
         """Deserialize the JSON string to an object."""
-        return json.loads(data)
+        return self.backend.loads(data, **kwargs)
 
     def from_json(
         self,
         s: AnyStr,
         cls: type[T],
         /,
+        *,
+        key_serializer: Callable[[str], str] | None = None,
+        loads: Callable[..., Any] | None = None,
         **kw,
     ) -> T:
         """Deserialize ``s`` (a ``str``, ``bytes`` or ``bytearray`` instance
-        containing a JSON document) to a Python object.
+        containing a JSON document) to an instance of ``cls``.
         """
-        # deserializer = deserializer or default_json_deserializer
-        return json.loads(s, cls, **kw)
+        loads = loads or self.loads
+        return fromdict(loads(s, **kw), cls, key_serializer=key_serializer)
+
+    def load_lines(
+        self,
+        fp: IO[AnyStr],
+        cls: type[T],
+        /,
+        *,
+        key_serializer: Callable[[str], str] | None = None,
+        chunk_size: int = _CHUNK_SIZE,
+    ) -> Iterator[T]:
+        """
+        Deserialize the JSON Lines document of the file-like object ``fp``,
+        yielding an instance of ``cls`` per line.
+
+        ``fp`` is read in chunks of ``chunk_size``, and instances are yielded
+        as soon as their line is complete, so memory stays bounded by the
+        chunk size and the longest line instead of the size of the document.
+        Blank lines are skipped. The class is checked and the generated
+        ``fromdict`` function of its plan is looked up once, not per line.
+        """
+        if not _is_data_class_like(cls):
+            raise TypeError(f"Expected a dataclass-like type, got {cls!r}")
+        convert = _fromdict_many(cls, key_serializer, False)
+        return self._iter_lines(fp, convert, chunk_size)
+
+    def _iter_lines(
+        self, fp: IO[AnyStr], convert: Callable[[Any], T], chunk_size: int
+    ) -> Iterator[T]:
+        loads = self.backend.loads
+        read = fp.read
+        # the incomplete last line of previous chunks
+        pending: list[AnyStr] = []
+        newline = None
+        while chunk := read(chunk_size):
+            if newline is None:
+                newline = "\n" if isinstance(chunk, str) else b"\n"
+            if newline not in chunk:
+                pending.append(chunk)
+                continue
+            lines = chunk.split(newline)
+            if pending:
+                pending.append(lines[0])
+                lines[0] = chunk[:0].join(pending)
+                pending.clear()
+            pending.append(lines.pop())
+            for line in lines:
+                if line.strip():
+                    yield convert(loads(line))
+        if pending and (line := pending[0][:0].join(pending)).strip():
+            yield convert(loads(line))
 
 
 class JsonSerializer(Serializer[Jsonable, str]):
-    """JSON serializer."""
+    """JSON serializer.
+
+    ``backend`` is the name of a JSON library (see `JSON_BACKENDS`), a
+    `JsonBackend`, or ``"auto"`` for the fastest installed one. The standard
+    library ``json`` is used if None.
+    """
+
+    def __init__(self, backend: str | JsonBackend | None = None):
+        self._backend = backend
+
+    @property
+    def backend(self) -> JsonBackend:
+        if not isinstance(self._backend, JsonBackend):
+            self._backend = get_json_backend(self._backend)
+        return self._backend
 
     def _datetime_to_isoformat(self, value: datetime) -> str:
         """Convert the value to an intermediate data types."""
         return value.isoformat()
 
     def dumps(self, obj: Jsonable, **kwargs: Any) -> str:
-        """Serialize the object to a JSON-formatted string."""
-        return json.dumps(obj)
+        """
+        Serialize the object to a JSON-formatted string.
+
+        ``indent``, ``sort_keys`` and ``default`` are supported by all backends,
+        other ``kwargs`` of `json.dumps` fall back to the standard library.
+        """
+        return self.backend.dumps(obj, **kwargs)
 
     def to_json(
         self,
         obj: Any,
         *,
         key_serializer: Callable[[str], str] | None = None,
-        value_serializer: SerializeFunc | None = None,
-        dumps: Callable | None = None,
+        value_serializer: SerializeFunc[Any, Any] | None = None,
+        dumps: Callable[..., str] | None = None,
         **kwargs: Any,
     ) -> str:
         """Serialize ``obj`` to a JSON-formatted ``str``."""
         value_serializer = value_serializer or self
-        dumps = dumps or json.dumps
-        return dumps(
-            asdict_shallow(
-                obj, key_serializer=key_serializer, value_serializer=value_serializer
+        encode: Callable[..., str] = dumps or self.dumps
+        # the result is encoded right away, so leaves are never copied
+        return encode(
+            asdict(
+                obj,
+                key_serializer=key_serializer,
+                value_serializer=value_serializer,
+                copy=None,
             ),
             **kwargs,
         )
 
+    def iter_json(
+        self,
+        obj: Any,
+        *,
+        key_serializer: Callable[[str], str] | None = None,
+        default: Callable[[Any], Any] | None = None,
+        chunk_size: int = _CHUNK_SIZE,
+    ) -> Iterator[str]:
+        """
+        Serialize ``obj`` to chunks of JSON text, without building the dict of
+        `asdict` first.
+
+        Instances are walked by `iter_events` with the same class plans as
+        `to_json` (renamed keys, filters and tags), and the text is the same as
+        `json.dumps` with default options outputs, i.e. `to_json` with the
+        ``json`` backend. Other backends may differ in separators and escapes,
+        but not in values. Chunks are yielded once they reach
+        about ``chunk_size`` characters, so memory stays bounded by the chunk
+        size instead of the size of the output. Values which are not JSON
+        types are passed to ``default`` as `json.dumps` does.
+        """
+        parts: list[str] = []
+        size = 0
+        # whether an item separator precedes the next key or value
+        sep = False
+        for event, value in iter_events(obj, key_serializer=key_serializer):
+            if event is SCALAR:
+                encode = _SCALAR_ENCODERS.get(type(value))
+                chunk = (
+                    encode(value)
+                    if encode is not None
+                    else json.dumps(value, default=default)
+                )
+                next_sep = True
+            elif event is MAP_KEY:
+                chunk = _encode_key(value) + _KEY_SEPARATOR
+                next_sep = False
+            elif event is START_MAP:
+                chunk, next_sep = "{", False
+            elif event is END_MAP or event is END_ARRAY:
+                parts.append("}" if event is END_MAP else "]")
+                size += 1
+                sep = True
+                continue
+            else:
+                chunk, next_sep = "[", False
+
+            if sep:
+                chunk = _ITEM_SEPARATOR + chunk
+            parts.append(chunk)
+            sep = next_sep
+            size += len(chunk)
+            if size >= chunk_size:
+                yield "".join(parts)
+                parts.clear()
+                size = 0
+        if parts:
+            yield "".join(parts)
+
+    def dump(self, obj: Any, fp: IO[str], **kwargs: Any) -> None:
+        """
+        Serialize ``obj`` as JSON text into the file-like object ``fp``.
+
+        The text is written in chunks by `iter_json`, which ``kwargs`` are
+        passed to.
+        """
+        write = fp.write
+        for chunk in self.iter_json(obj, **kwargs):
+            write(chunk)
+
+    def dump_lines(
+        self,
+        objs: Iterable[Any],
+        fp: IO[str],
+        *,
+        key_serializer: Callable[[str], str] | None = None,
+        value_serializer: SerializeFunc[Any, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Serialize each of ``objs`` as a line of JSON text into the file-like
+        object ``fp``, i.e. a JSON Lines document.
+
+        ``objs`` is consumed lazily, one object is serialized at a time, so
+        generators of any length can be written with bounded memory. Other
+        ``kwargs`` are passed to `dumps`, except ``indent`` which would break
+        lines.
+        """
+        if kwargs.get("indent") is not None:
+            raise ValueError("indent is not supported by JSON Lines")
+        value_serializer = value_serializer or self
+        dumps = self.backend.dumps
+        write = fp.write
+        for obj in objs:
+            data = asdict(
+                obj,
+                key_serializer=key_serializer,
+                value_serializer=value_serializer,
+                copy=None,
+            )
+            write(dumps(data, **kwargs))
+            write("\n")
+
 
 json_serializer = JsonSerializer()
 json_deserializer = JsonDeserializer()
@@ -102,5 +348,8 @@ to_json = json_serializer.to_json
 from_json = json_deserializer.from_json
 dumps = json_serializer.dumps
 loads = json_deserializer.loads
-# dump = json_serializer.dump
+dump = json_serializer.dump
+iter_json = json_serializer.iter_json
+dump_lines = json_serializer.dump_lines
+load_lines = json_deserializer.load_lines
 # load = json_deserializer.load
@@ -2,15 +2,17 @@
 from __future__ import annotations
 
 import types
-from xattrs._compat.typing import Any, AnyStr, Callable, TypeVar
+from xattrs._compat.typing import Any, Callable, TypeVar
 from xattrs.typing import CaseConvention, DeserializeFunc, SerializeFunc
 
+import warnings
 from datetime import datetime
 from functools import partial
 from io import StringIO
 
 from ruamel.yaml import YAML
 
+from xattrs._de_funcs import fromdict
 from xattrs._struct_funcs import asdict_shallow
 from xattrs.deserializer import Deserializer
 from xattrs.serializer import Serializer
@@ -79,24 +81,37 @@ class YamlDeserializer(Deserializer[str, Yamlable]):
         """Convert the value to a Python object."""
         return datetime.fromisoformat(value)
 
-    def loads(self, s: AnyStr, **kw) -> Any: ...
+    def loads(self, s: str, **kw) -> Any:
+        """Deserialize the YAML string to an object."""
+        return self._loads(s, **kw)
+
     def load(self, fp: Any, **kw) -> Any: ...
 
     def from_yaml(
         self,
         cls: type[T],
-        s: AnyStr,
+        s: str,
         *,
-        deserializer: DeserializeFunc | None = None,
+        key_serializer: Callable[[str], str] | None = None,
         loads: Callable | None = None,
+        deserializer: DeserializeFunc | None = None,
         **kw,
     ) -> T:
-        """Deserialize ``s`` (a ``str``, ``bytes`` or ``bytearray`` instance
-        containing a JSON document) to a Python object.
+        """Deserialize ``s`` (a ``str`` instance containing a YAML document) to
+        an instance of ``cls``.
+
+        ``deserializer`` is deprecated and ignored, values are converted by
+        `fromdict` according to the type hints of fields.
         """
-        deserializer = deserializer or self
+        if deserializer is not None:
+            warnings.warn(
+                "The deserializer argument of from_yaml is deprecated and "
+                "ignored, values are converted according to type hints.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
         loads = loads or self.loads
-        return loads(fromdict(s, cls), **kw)
+        return fromdict(loads(s, **kw), cls, key_serializer=key_serializer)
 
 
 class YamlSerializer(Serializer[Yamlable, str]):
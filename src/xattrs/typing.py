@@ -17,6 +17,10 @@ from dataclasses import Field
 from attrs import Attribute
 
 StructAs = Literal["dict", "tuple"]
+StructEngine = Literal["recursive", "iterative", "codegen"]
+Event = Literal[
+    "start_map", "map_key", "end_map", "start_array", "end_array", "scalar"
+]
 
 # easy to remember?
 CaseConvention = Literal[
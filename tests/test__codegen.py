@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+import linecache
+import traceback
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from dataclasses import field as dataclass_field
+
+import pytest
+from attrs import define
+from attrs import field as attrs_field
+from hypothesis import given
+from hypothesis import strategies as st
+
+from xattrs import asdict, serde
+from xattrs._codegen import _make_asdict_func
+from xattrs._metadata import _Metadata
+from xattrs._plan import _get_ser_plan
+from xattrs.converters import to_upper
+
+MAPPING_TYPES = (dict, OrderedDict)
+
+
+class Point(NamedTuple):
+    x: Any
+    y: Any
+
+
+@pytest.fixture(scope="class")
+def A():
+    @define
+    class A:
+        x: Any
+        y: Any = attrs_field(default=0) | _Metadata(exclude_if_false=True)
+        z: Any = attrs_field(default=None) | _Metadata(name="zz")
+
+    return A
+
+
+@pytest.fixture(scope="class")
+def D():
+    @dataclass
+    class D:
+        x: Any
+        y: Any = dataclass_field(default=0) | _Metadata(exclude_if_false=True)
+        z: Any = dataclass_field(default=None) | _Metadata(name="zz")
+
+    return D
+
+
+class TestCodegenAsDict:
+    @given(dict_factory=st.sampled_from(MAPPING_TYPES))
+    def test_same_as_recursive(self, A, D, dict_factory):
+        ddict = defaultdict(list, {"k": [D(1)]})
+        for inst in (
+            A(1),
+            A(1, 2, 3),
+            D(A(1, 0, "z"), [D(2, 3), (A(4), "a")], {"k": D(5, 6)}),
+            A(Point(D(1), 2), ddict, OrderedDict(a=A(3))),
+        ):
+            expected = asdict(inst, dict_factory=dict_factory)
+            actual = asdict(inst, dict_factory=dict_factory, engine="codegen")
+            assert actual == expected
+            assert type(actual) is type(expected)
+            assert list(actual) == list(expected)
+
+    def test_defaultdict(self, A):
+        actual = asdict(A(defaultdict(int, a=1)), engine="codegen")
+        assert type(actual["x"]) is defaultdict
+        assert actual["x"].default_factory is int
+
+    def test_scope_key_serializer(self, A, D):
+        inst = D(A(1, 2))
+        expected = {"X": {"X": 1, "Y": 2, "zz": None}, "zz": None}
+        assert asdict(inst, key_serializer=to_upper, engine="codegen") == expected
+
+    def test_serde_rename(self):
+        @serde(rename="camelCase")
+        @define
+        class C:
+            first_name: str
+            last_name: str = attrs_field(default="") | _Metadata(exclude_if_false=True)
+
+        assert asdict(C("John"), engine="codegen") == {"firstName": "John"}
+        assert asdict(C("John", "Lowe"), engine="codegen") == {
+            "firstName": "John",
+            "lastName": "Lowe",
+        }
+
+    def test_cached_on_plan(self, A):
+        asdict(A(1), engine="codegen")
+        func = _get_ser_plan(A).asdict_func
+        assert func is not None
+        asdict(A(2), engine="codegen")
+        assert _get_ser_plan(A).asdict_func is func
+
+    def test_linecache(self, A):
+        func = _make_asdict_func(A, _get_ser_plan(A))
+        filename = func.__code__.co_filename
+        assert filename.startswith("<xattrs generated asdict")
+        assert "".join(linecache.getlines(filename)).startswith("def asdict(")
+
+    def test_traceback(self):
+        @define
+        class F:
+            x: Any = attrs_field() | _Metadata(exclude_if=lambda f, v: 1 / 0)
+
+        with pytest.raises(ZeroDivisionError) as exc_info:
+            asdict(F(1), engine="codegen")
+        lines = "".join(traceback.format_tb(exc_info.tb))
+        assert "if _filter_0(_field_0, _0):" in lines
+
+    def test_unknown_engine(self, A):
+        with pytest.raises(ValueError, match="Unknown engine"):
+            asdict(A(1), engine="unknown")  # type: ignore[arg-type]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+import sys
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+
+import pytest
+from attrs import define
+from hypothesis import given
+from hypothesis import strategies as st
+
+from xattrs import asdict, astree, astuple, get_default_engine, set_default_engine
+from xattrs.converters import to_upper
+
+FACTORIES = (dict, OrderedDict, list, tuple)
+
+
+class Point(NamedTuple):
+    x: Any
+    y: Any
+
+
+@define
+class A:
+    x: Any
+    y: Any = None
+
+
+@dataclass
+class D:
+    x: Any
+    y: Any = None
+
+
+def _samples():
+    return [
+        A(1),
+        D(A(1, "2"), D(3.0, b"4")),
+        A([D(1), (A(2), "a"), []], {"k": D(5, [6]), 7: ()}),
+        D(Point(A(1), 2), defaultdict(list, {"k": [D(1)]})),
+        A(OrderedDict(a=A(3), b={"c": (D(4),)}), {1, 2}),
+        [A(1), {"x": D(2)}],
+    ]
+
+
+def _linked(depth: int, cls: type = A) -> Any:
+    node = None
+    for i in range(depth):
+        node = cls(i, node)
+    return node
+
+
+class TestIterativeEngine:
+    @given(factory=st.sampled_from(FACTORIES))
+    def test_same_as_recursive(self, factory):
+        for inst in _samples():
+            if factory in {dict, OrderedDict}:
+                expected = asdict(inst, dict_factory=factory, key_serializer=to_upper)
+                actual = asdict(
+                    inst,
+                    dict_factory=factory,
+                    key_serializer=to_upper,
+                    engine="iterative",
+                )
+            else:
+                expected = astuple(inst, tuple_factory=factory)
+                actual = astuple(inst, tuple_factory=factory, engine="iterative")
+                assert actual == expected
+                expected = astree(inst, tuple_factory=factory)
+                actual = astree(inst, tuple_factory=factory, engine="iterative")
+            assert actual == expected
+            assert type(actual) is type(expected)
+
+    @pytest.mark.parametrize("func", [asdict, astuple, astree])
+    @pytest.mark.parametrize("cls", [A, D])
+    def test_deep_structure(self, func, cls):
+        depth = sys.getrecursionlimit() * 2
+        with pytest.raises(RecursionError):
+            func(_linked(depth, cls))
+
+        result = func(_linked(depth, cls), engine="iterative")
+        for i in reversed(range(depth)):
+            if func is asdict:
+                assert result["x"] == i
+                result = result["y"]
+            else:
+                assert result[0] == i
+                result = result[1]
+        assert result is None
+
+    def test_default_engine(self):
+        assert get_default_engine() == "recursive"
+        try:
+            set_default_engine("iterative")
+            depth = sys.getrecursionlimit() * 2
+            assert asdict(_linked(depth))["x"] == depth - 1
+        finally:
+            set_default_engine("recursive")
+
+        with pytest.raises(ValueError, match="Unknown engine"):
+            set_default_engine("unknown")  # type: ignore[arg-type]
@@ -125,33 +125,26 @@ class TestGenFieldFilter:
         [
             ({"exclude": True}, None, lambda f, v: False),
             ({"exclude": False}, lambda f, v: True, lambda f, v: True),
-            ({"exclude": False}, lambda f, v: False, lambda f, v: True),
+            ({"exclude": False}, lambda f, v: False, lambda f, v: False),
             (
                 {"exclude_if": lambda f, v: v // 2 == 0},
                 lambda f, v: False,
-                lambda f, v: v // 2 == 0,
-            ),
-            (
-                {"exclude_if": lambda f, v: v // 2 != 0},
-                None,
-                lambda f, v: v // 2 != 0,
-            ),
-            ({"exclude_if_default": True}, lambda f, v: True, exclude_if_default),
-            (
-                {"exclude_if_default": True},
                 lambda f, v: False,
-                exclude_if_default,
             ),
             (
-                {"exclude_if_default": False},
-                lambda f, v: False,
-                keep_include,
+                {"exclude_if": lambda f, v: v // 2 == 0},
+                lambda f, v: v > 100,
+                lambda f, v: v > 100 and v // 2 == 0,
             ),
+            ({"exclude_if": lambda f, v: v // 2 != 0}, None, lambda f, v: v // 2 != 0),
+            ({"exclude_if_default": True}, lambda f, v: True, exclude_if_default),
+            ({"exclude_if_default": True}, lambda f, v: False, lambda f, v: False),
+            ({"exclude_if_default": False}, lambda f, v: False, lambda f, v: False),
             ({"exclude_if_default": False}, None, keep_include),
             ({"exclude_if_false": True}, lambda f, v: True, exclude_if_false),
-            ({"exclude_if_false": True}, lambda f, v: False, exclude_if_false),
+            ({"exclude_if_false": True}, lambda f, v: False, lambda f, v: False),
             ({"exclude_if_false": False}, lambda f, v: True, keep_include),
-            ({"exclude_if_false": False}, lambda f, v: False, keep_include),
+            ({"exclude_if_false": False}, lambda f, v: False, lambda f, v: False),
             ({"exclude_if_false": False}, None, keep_include),
             ({}, None, keep_include),
             ({}, lambda f, v: v // 2 == 0, lambda f, v: v // 2 == 0),
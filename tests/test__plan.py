@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import Any
+
+from dataclasses import dataclass
+from dataclasses import field as dataclass_field
+
+import pytest
+from attrs import define
+from attrs import field as attrs_field
+
+from xattrs import asdict, serde
+from xattrs._metadata import _Metadata
+from xattrs._plan import _clear_ser_plans, _get_ser_plan, _ser_plans
+from xattrs.converters import to_upper
+from xattrs.filters import exclude_if_false, keep_include
+
+
+@pytest.fixture
+def A():
+    @define
+    class A:
+        first_name: Any
+        last_name: Any = attrs_field(default=None) | _Metadata(name="surname")
+
+    return A
+
+
+@pytest.fixture
+def D():
+    @dataclass
+    class D:
+        first_name: Any
+        last_name: Any = dataclass_field(default=None) | _Metadata(name="surname")
+
+    return D
+
+
+@pytest.mark.parametrize("cls_name", ["A", "D"])
+class TestSerPlan:
+    def test_resolved_keys(self, request, cls_name):
+        cls = request.getfixturevalue(cls_name)
+        plan = _get_ser_plan(cls)
+        assert [fp.name for fp in plan.fields] == ["first_name", "last_name"]
+        assert [fp.key for fp in plan.fields] == ["first_name", "surname"]
+
+        plan = _get_ser_plan(cls, None, to_upper)
+        assert [fp.key for fp in plan.fields] == ["FIRST_NAME", "surname"]
+
+    def test_cached_per_scope(self, request, cls_name):
+        cls = request.getfixturevalue(cls_name)
+        assert _get_ser_plan(cls) is _get_ser_plan(cls)
+        assert _get_ser_plan(cls, None, to_upper) is _get_ser_plan(cls, None, to_upper)
+        assert _get_ser_plan(cls) is not _get_ser_plan(cls, None, to_upper)
+
+    def test_invalidated_by_serde(self, request, cls_name):
+        cls = request.getfixturevalue(cls_name)
+        inst = cls("John", "Lowe")
+        assert asdict(inst) == {"first_name": "John", "surname": "Lowe"}
+
+        plan = _get_ser_plan(cls)
+        serde(rename="camelCase")(cls)
+        assert _get_ser_plan(cls) is not plan
+        assert asdict(inst) == {"firstName": "John", "surname": "Lowe"}
+
+    def test_precomputed_by_serde(self, request, cls_name):
+        cls = request.getfixturevalue(cls_name)
+        serde(rename="camelCase", lazy=True)(cls)
+        assert cls not in _ser_plans
+        serde(rename="camelCase")(cls)
+        plan = _ser_plans[cls][None, None]
+        assert [fp.key for fp in plan.fields] == ["firstName", "surname"]
+        assert _get_ser_plan(cls) is plan
+
+    def test_clear(self, request, cls_name):
+        cls = request.getfixturevalue(cls_name)
+        plan = _get_ser_plan(cls)
+        _clear_ser_plans(cls)
+        assert _get_ser_plan(cls) is not plan
+
+
+class TestFieldFilters:
+    def test_static_filters(self):
+        @define
+        class C:
+            x: int
+            y: int = attrs_field(default=0) | _Metadata(exclude=True)
+            z: int = attrs_field(default=0) | _Metadata(exclude_if_false=True)
+
+        plan = _get_ser_plan(C)
+        assert [fp.name for fp in plan.fields] == ["x", "z"]
+        assert plan.fields[0].filter is keep_include
+        assert plan.fields[1].filter is exclude_if_false
+
+    def test_chained(self):
+        @serde(filter=lambda f, v: f.name != "w")
+        @define
+        class C:
+            w: int = 1
+            x: int = 2
+            y: int = 0
+            z: int = attrs_field(default=3) | _Metadata(exclude_if_false=True)
+
+        assert asdict(C()) == {"x": 2, "y": 0, "z": 3}
+        assert asdict(C(z=0)) == {"x": 2, "y": 0}
+        # the scope filter, the class filter and field filters are all applied
+        for engine in ("recursive", "iterative", "codegen"):
+            actual = asdict(C(), filter=lambda f, v: v != 2, engine=engine)
+            assert actual == {"y": 0, "z": 3}
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from typing import Annotated, Any, Literal, NewType, Optional, TypeVar, Union
+
+from collections import OrderedDict, defaultdict, deque
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from enum import Enum
+
+import pytest
+
+from xattrs._guards import (
+    is_annotated,
+    is_defaultdict,
+    is_hetero_tuple,
+    is_new_type,
+    is_optional,
+    is_sequence,
+    is_tuple,
+)
+from xattrs._typedesc import (
+    ANY,
+    _AnnotatedDesc,
+    _ClassDesc,
+    _describe,
+    _EnumDesc,
+    _LiteralDesc,
+    _MappingDesc,
+    _NewTypeDesc,
+    _OptionalDesc,
+    _SequenceDesc,
+    _StructDesc,
+    _TupleDesc,
+    _UnionDesc,
+    _unwrap,
+)
+
+UserId = NewType("UserId", int)
+T = TypeVar("T")
+
+
+class Color(Enum):
+    RED = 1
+
+
+@dataclass
+class D:
+    x: int
+
+
+@pytest.mark.parametrize(
+    ("tp", "expected"),
+    [
+        (Any, ANY),
+        ("D", ANY),
+        (T, ANY),
+        (None, ANY),
+        (int, _ClassDesc(int)),
+        (D, _StructDesc(D)),
+        (Color, _EnumDesc(Color)),
+        (Literal["a", 1], _LiteralDesc(("a", 1))),
+        (UserId, _NewTypeDesc(UserId, _ClassDesc(int))),
+        (Annotated[int, "meta"], _AnnotatedDesc(_ClassDesc(int), ("meta",))),
+        (Optional[D], _OptionalDesc(_StructDesc(D))),
+        (D | None, _OptionalDesc(_StructDesc(D))),
+        (Union[int, str], _UnionDesc((_ClassDesc(int), _ClassDesc(str)), False)),
+        (Union[int, str, None], _UnionDesc((_ClassDesc(int), _ClassDesc(str)), True)),
+        (list[D], _SequenceDesc(list, _StructDesc(D))),
+        (Sequence[int], _SequenceDesc(list, _ClassDesc(int))),
+        (tuple[int, ...], _SequenceDesc(tuple, _ClassDesc(int))),
+        (deque, _SequenceDesc(deque, ANY)),
+        (tuple[int, D], _TupleDesc((_ClassDesc(int), _StructDesc(D)))),
+        (dict[str, D], _MappingDesc(dict, _ClassDesc(str), _StructDesc(D))),
+        (Mapping[str, Any], _MappingDesc(dict, _ClassDesc(str), ANY)),
+        (OrderedDict, _MappingDesc(OrderedDict, ANY, ANY)),
+        (
+            defaultdict[str, list[int]],
+            _MappingDesc(
+                defaultdict, _ClassDesc(str), _SequenceDesc(list, _ClassDesc(int))
+            ),
+        ),
+    ],
+)
+def test_describe(tp, expected):
+    assert _describe(tp) == expected
+    # memoized per annotation
+    assert _describe(tp) is _describe(tp)
+
+
+def test_describe_unhashable():
+    tp = Annotated[int, {"unhashable": True}]
+    assert _describe(tp) == _AnnotatedDesc(_ClassDesc(int), ({"unhashable": True},))
+
+
+def test_unwrap():
+    assert _unwrap(_describe(Annotated[UserId, "meta"])) == _ClassDesc(int)
+
+
+def test_guards():
+    assert is_optional(Optional[int])
+    assert is_optional(int | None)
+    assert not is_optional(Union[int, str])
+    assert is_annotated(Annotated[int, "meta"])
+    assert is_sequence(list[int])
+    assert is_sequence(tuple[int, ...])
+    assert not is_sequence(tuple[int, str])
+    assert not is_sequence(str)
+    assert is_tuple(tuple)
+    assert is_hetero_tuple(tuple[int, str])
+    assert not is_hetero_tuple(tuple[int, ...])
+    assert is_defaultdict(OrderedDict) is False
+    assert is_new_type(UserId)
+    assert not is_new_type(int)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass
 
 import pytest
@@ -10,7 +10,16 @@ from attrs import frozen
 from hypothesis import given
 from hypothesis import strategies as st
 
-from xattrs._struct_funcs import asdict
+from xattrs._struct_funcs import (
+    _asdict_defaultdict,
+    _asdict_handlers,
+    _asdict_mapping,
+    _asdict_other,
+    _asdict_sequence,
+    _asdict_struct,
+    asdict,
+    asdict_many,
+)
 
 MAPPING_TYPES = (dict, OrderedDict)
 SEQUENCE_TYPES = (list, tuple)
@@ -88,3 +97,112 @@ class TestAsDict:
             "x": 1,
             "y": seq([{"x": 2, "y": 3}, {"x": 4, "y": 5}, {"x": "6", "y": "7"}]),
         }
+
+    def test_dispatch_subclasses(self, A, D):
+        """
+        Handlers are resolved once per concrete type, including subclasses.
+        """
+
+        class MyList(list):
+            pass
+
+        class MyDict(OrderedDict):
+            pass
+
+        class MyDefaultDict(defaultdict):
+            pass
+
+        class MySet(set):
+            pass
+
+        actual = asdict(
+            D(
+                MyList([A(1, 2)]),
+                (MyDict(a=D(3, 4)), MyDefaultDict(int, b=A(5, 6)), MySet([7])),
+            )
+        )
+        expected = {
+            "x": [{"x": 1, "y": 2}],
+            "y": ({"a": {"x": 3, "y": 4}}, {"b": {"x": 5, "y": 6}}, {7}),
+        }
+        assert actual == expected
+        assert type(actual["x"]) is MyList
+        assert type(actual["y"][0]) is MyDict
+        assert type(actual["y"][1]) is MyDefaultDict
+        assert actual["y"][1].default_factory is int
+        assert type(actual["y"][2]) is MySet
+
+        assert _asdict_handlers[A] is _asdict_struct
+        assert _asdict_handlers[D] is _asdict_struct
+        assert _asdict_handlers[MyList] is _asdict_sequence
+        assert _asdict_handlers[MyDict] is _asdict_mapping
+        assert _asdict_handlers[MyDefaultDict] is _asdict_defaultdict
+        assert _asdict_handlers[MySet] is _asdict_other
+
+    @pytest.mark.parametrize("engine", ["recursive", "iterative", "codegen"])
+    def test_copy_none(self, A, engine):
+        """
+        Leaves are passed through as they are if copy is None.
+        """
+        leaf = {1, 2}
+        actual = asdict(A(leaf, [leaf]), copy=None, engine=engine)
+        assert actual["x"] is leaf
+        assert actual["y"][0] is leaf
+
+    @pytest.mark.parametrize("engine", ["recursive", "iterative", "codegen"])
+    def test_memo(self, A, D, engine):
+        """
+        Subobjects referenced multiple times are converted only once per memo.
+        """
+        shared = D(1, [2])
+        inst = A([shared, shared], {"k": shared})
+        memo: dict[int, Any] = {}
+        actual = asdict(inst, engine=engine, memo=memo)
+        assert actual == {
+            "x": [{"x": 1, "y": [2]}, {"x": 1, "y": [2]}],
+            "y": {"k": {"x": 1, "y": [2]}},
+        }
+        assert actual["x"][0] is actual["x"][1] is actual["y"]["k"]
+
+        # the same memo is reused across calls
+        assert asdict(A(shared, 0), engine=engine, memo=memo)["x"] is actual["x"][0]
+
+        without_memo = asdict(inst, engine=engine)
+        assert without_memo == actual
+        assert without_memo["x"][0] is not without_memo["x"][1]
+
+
+class TestAsDictMany:
+    """
+    Tests for `asdict_many`.
+    """
+
+    @given(
+        dict_factory=st.sampled_from(MAPPING_TYPES),
+        engine=st.sampled_from(["recursive", "iterative", "codegen"]),
+    )
+    def test_same_as_asdict(self, A, D, dict_factory, engine):
+        insts = [
+            A(1, 2),
+            A(D(3, [4]), {"k": A(5, 6)}),
+            D(7, 8),
+            D(A(9, 10), None),
+            "a",
+            [A(11, 12)],
+            A(13, 14),
+        ]
+        actual = asdict_many(insts, dict_factory=dict_factory, engine=engine)
+        expected = [asdict(inst, dict_factory=dict_factory) for inst in insts]
+        assert actual == expected
+        assert [type(d) for d in actual] == [type(d) for d in expected]
+
+    def test_lazy(self, A):
+        insts = (A(i, str(i)) for i in range(3))
+        results = asdict_many(insts, lazy=True)
+        assert not isinstance(results, list)
+        assert next(results) == {"x": 0, "y": "0"}
+        assert list(results) == [{"x": 1, "y": "1"}, {"x": 2, "y": "2"}]
+
+    def test_types_are_rejected(self, A):
+        with pytest.raises(TypeError, match="Must be an instance"):
+            asdict_many([A(1, 2), A])
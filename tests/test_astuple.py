@@ -10,7 +10,7 @@ from attrs import frozen
 from hypothesis import given
 from hypothesis import strategies as st
 
-from xattrs._struct_funcs import astuple
+from xattrs._struct_funcs import astuple, astuple_many
 
 MAPPING_TYPES = (dict, OrderedDict)
 SEQUENCE_TYPES = (list, tuple)
@@ -93,3 +93,37 @@ class TestAsTuple:
             ((2, 3), (4, 5), {"x": "6", "y": "7"}),
         )
         assert actual == expected
+
+
+class TestAsTupleMany:
+    """
+    Tests for `astuple_many`.
+    """
+
+    @given(seq=st.sampled_from(SEQUENCE_TYPES))
+    def test_same_as_astuple(self, A, D, seq):
+        @dataclass
+        class One:
+            x: Any
+
+        @dataclass
+        class Empty:
+            pass
+
+        insts = [
+            A(1, 2),
+            A(D(3, [4]), {"k": A(5, 6)}),
+            D(7, 8),
+            One(A(9, 10)),
+            Empty(),
+            "a",
+            [A(11, 12)],
+        ]
+        actual = astuple_many(insts, tuple_factory=seq)
+        expected = [astuple(inst, tuple_factory=seq) for inst in insts]
+        assert actual == expected
+
+    def test_lazy(self, A):
+        results = astuple_many((A(i, str(i)) for i in range(3)), lazy=True)
+        assert not isinstance(results, list)
+        assert list(results) == [(0, "0"), (1, "1"), (2, "2")]
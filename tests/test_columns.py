@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from array import array
+from dataclasses import dataclass
+from dataclasses import field as dataclass_field
+
+import pytest
+from attrs import define
+from attrs import field as attrs_field
+
+from xattrs import asdict, from_columns, serde, to_columns
+from xattrs._metadata import _Metadata
+from xattrs.converters import to_upper
+
+
+@define
+class Point:
+    x: int
+    y: int
+
+
+@serde(rename="camelCase")
+@define
+class Order:
+    order_id: int
+    price: float
+    name: str
+    note: Optional[str] = attrs_field(default=None) | _Metadata(exclude_if_false=True)
+    point: Any = None
+    _secret: str = attrs_field(default="") | _Metadata(exclude=True)
+
+
+@dataclass
+class Row:
+    a: int
+    b: float = dataclass_field(default=0.0) | _Metadata(name="B")
+    c: Any = None
+
+
+@define
+class Line:
+    start: Point
+    points: list[Point]
+    end: Optional[Point] = Point(0, 0)
+
+
+def _orders():
+    return [
+        Order(1, 1.5, "a", "first", Point(1, 2)),
+        Order(2, 2.5, "b"),
+        Order(3, 3.5, "c", "third"),
+    ]
+
+
+class TestToColumns:
+    def test_attrs(self):
+        columns = to_columns(_orders(), Order)
+        assert list(columns) == ["orderId", "price", "name", "note", "point"]
+        assert columns["orderId"] == array("q", [1, 2, 3])
+        assert columns["price"] == array("d", [1.5, 2.5, 3.5])
+        assert columns["name"] == ["a", "b", "c"]
+        assert columns["note"] == ["first", None, "third"]
+        assert columns["point"] == [{"x": 1, "y": 2}, None, None]
+
+    def test_same_as_asdict(self):
+        rows = [Row(1, 2.0, [Point(3, 4)]), Row(5, c={"k": Point(6, 7)})]
+        columns = to_columns(rows, Row, key_serializer=to_upper, arrays=False)
+        assert columns == {
+            key: [asdict(row, key_serializer=to_upper)[key] for row in rows]
+            for key in ("A", "B", "C")
+        }
+        assert all(type(col) is list for col in columns.values())
+
+    def test_fallback_to_list(self):
+        columns = to_columns([Row(2**64), Row(None)], Row)  # type: ignore[arg-type]
+        assert columns["a"] == [2**64, None]
+        assert type(columns["a"]) is list
+
+    def test_fallback_not_exact_type(self):
+        columns = to_columns([Row(1, 1.0), Row(True, 2)], Row)  # type: ignore[arg-type]
+        assert columns["a"] == [1, True]
+        assert type(columns["a"][1]) is bool
+        assert columns["B"] == [1.0, 2]
+        assert type(columns["B"][1]) is int
+
+    def test_empty(self):
+        assert to_columns([], Row) == {"a": array("q"), "B": array("d"), "c": []}
+
+    def test_wrong_type(self):
+        with pytest.raises(TypeError):
+            to_columns([Row(1), Point(1, 2)], Row)  # type: ignore[list-item]
+        with pytest.raises(TypeError):
+            to_columns([1], int)
+
+
+class TestFromColumns:
+    def test_roundtrip(self):
+        rows = [Row(1, 2.0, "x"), Row(3, 4.0, None)]
+        assert from_columns(to_columns(rows, Row), Row) == rows
+
+        orders = [Order(1, 1.5, "a", "first"), Order(2, 2.5, "b", "second")]
+        assert from_columns(to_columns(orders, Order), Order) == orders
+
+    def test_nested(self):
+        lines = [Line(Point(1, 2), [Point(3, 4)]), Line(Point(5, 6), [], None)]
+        columns = to_columns(lines, Line)
+        assert columns["start"] == [{"x": 1, "y": 2}, {"x": 5, "y": 6}]
+        assert from_columns(columns, Line) == lines
+
+    def test_defaults(self):
+        assert from_columns({"a": [1, 2]}, Row) == [Row(1), Row(2)]
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError, match="same length"):
+            from_columns({"a": [1, 2], "B": [1.0]}, Row)
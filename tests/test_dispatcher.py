@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from collections.abc import Collection, Mapping, MutableSequence, Sequence
+from typing import Annotated, Any, Optional, Union, get_args
+
+from abc import ABC
+
+from xattrs.dispatcher import (
+    ConcreteDispatch,
+    Dispatcher,
+    GenericDispatcher,
+    SingleDispatcher,
+)
+from xattrs.exceptions import HookNotFoundError
+
+import pytest
+
+
+class Base:
+    pass
+
+
+class Child(Base):
+    pass
+
+
+class GrandChild(Child):
+    pass
+
+
+class TestDispatcher:
+    """
+    Tests for `Dispatcher`.
+    """
+
+    def test_mro(self):
+        dispatcher = Dispatcher()
+        dispatcher.register(Base, "base")
+        assert dispatcher.dispatch(GrandChild) == "base"
+        dispatcher.register(Child, "child")
+        assert dispatcher.dispatch(GrandChild) == "child"
+        assert dispatcher.dispatch(Base) == "base"
+
+    def test_virtual_subclass(self):
+        dispatcher = Dispatcher()
+        dispatcher.register(Mapping, "mapping")
+        assert dispatcher.dispatch(dict) == "mapping"
+
+    def test_most_specific_abc(self):
+        dispatcher = Dispatcher()
+        dispatcher.register(Collection, "collection")
+        dispatcher.register(Sequence, "sequence")
+        dispatcher.register(MutableSequence, "mutable_sequence")
+        assert dispatcher.dispatch(list) == "mutable_sequence"
+        assert dispatcher.dispatch(tuple) == "sequence"
+        assert dispatcher.dispatch(frozenset) == "collection"
+
+    def test_late_virtual_subclass(self):
+        class Shape(ABC):
+            pass
+
+        class Square:
+            pass
+
+        dispatcher = Dispatcher(fallback="fallback")
+        dispatcher.register(Shape, "shape")
+        assert dispatcher.dispatch(Square) == "fallback"
+        Shape.register(Square)
+        assert dispatcher.dispatch(Square) == "shape"
+
+    def test_predicate_and_fallback(self):
+        dispatcher = Dispatcher(fallback="fallback")
+        dispatcher.register(lambda cls: getattr(cls, "__name__", "") == "Child")("pred")
+        dispatcher.register(Base, "base")
+        assert dispatcher.dispatch(Child) == "base"
+        assert dispatcher.dispatch(type("Child", (), {})) == "pred"
+        assert dispatcher.dispatch(int) == "fallback"
+
+    def test_not_found(self):
+        dispatcher = Dispatcher()
+        with pytest.raises(HookNotFoundError, match="Hook for <class 'int'> not found"):
+            dispatcher.dispatch(int)
+        # misses are cached until a hook is registered
+        dispatcher.register(int, "int")
+        assert dispatcher.dispatch(int) == "int"
+
+    def test_cache(self):
+        calls = []
+        dispatcher = Dispatcher()
+        dispatcher.register(lambda cls: calls.append(cls) or True, "pred")
+        assert dispatcher.dispatch(Base) == "pred"
+        assert dispatcher.dispatch(Base) == "pred"
+        assert calls == [Base]
+        dispatcher.register(Child, "child")
+        assert dispatcher.dispatch(Base) == "pred"
+        assert calls == [Base, Base]
+
+    def test_invalid(self):
+        with pytest.raises(TypeError, match="Expected a class or a predicate"):
+            Dispatcher().register(1, "one")  # type: ignore[arg-type]
+
+
+def test_single_dispatcher():
+    dispatcher = SingleDispatcher()
+    dispatcher.register(Base, len)
+    assert dispatcher.dispatch(Child) is len
+    with pytest.raises(HookNotFoundError):
+        dispatcher.dispatch(int)(1)
+
+
+def test_concrete_dispatch():
+    with pytest.raises(HookNotFoundError):
+        ConcreteDispatch().dispatch(Child)
+
+
+def test_concrete_dispatch_registries_are_separate():
+    a, b = ConcreteDispatch(), ConcreteDispatch()
+    a.register(Base, "base")
+    assert a.dispatch(Child) == "base"
+    b.register(Child, "child")
+    assert a.dispatch(Child) == "base"
+    assert b.dispatch(Child) == "child"
+    assert Base not in b.registry
+    assert not ConcreteDispatch().registry
+
+
+class TestGenericDispatcher:
+    """
+    Tests for `GenericDispatcher`.
+    """
+
+    @pytest.fixture
+    def dispatcher(self):
+        dispatcher = GenericDispatcher(fallback=lambda tp: tp)
+        calls = dispatcher.calls = []
+        # ``str`` is a ``Sequence`` as well
+        dispatcher.register(str, lambda tp: str)
+
+        @dispatcher.register(Sequence)
+        def sequence_factory(tp):
+            calls.append(tp)
+            origin = tp.__origin__
+            (item,) = get_args(tp)[:1] or (Any,)
+            item_hook = dispatcher.dispatch(item)
+            return lambda v: origin(item_hook(x) for x in v)
+
+        @dispatcher.register(dict)
+        def dict_factory(tp):
+            calls.append(tp)
+            key_hook, value_hook = map(dispatcher.dispatch, get_args(tp))
+            return lambda v: {key_hook(k): value_hook(x) for k, x in v.items()}
+
+        @dispatcher.register(Annotated)
+        def annotated_factory(tp):
+            calls.append(tp)
+            return dispatcher.dispatch(tp.__origin__)
+
+        @dispatcher.register(Union)
+        def union_factory(tp):
+            calls.append(tp)
+            return lambda v: v
+
+        return dispatcher
+
+    def test_dispatch(self, dispatcher):
+        assert dispatcher.dispatch(list[int])(["1", 2.0]) == [1, 2]
+        assert dispatcher.dispatch(tuple[int, ...])(["1"]) == (1,)
+        assert dispatcher.dispatch(dict[str, list[int]])({1: ["2"]}) == {"1": [2]}
+        assert dispatcher.dispatch(Annotated[list[str], "meta"])([1]) == ["1"]
+        assert dispatcher.dispatch(int)("3") == 3
+
+    def test_union(self, dispatcher):
+        assert dispatcher.dispatch(Optional[int])(None) is None
+        assert dispatcher.dispatch(int | None)(None) is None
+
+    def test_factory_called_once_per_alias(self, dispatcher):
+        hook = dispatcher.dispatch(list[int])
+        assert dispatcher.dispatch(list[int]) is hook
+        assert dispatcher.calls == [list[int]]
+        assert dispatcher.dispatch(list[str]) is not hook
+        assert dispatcher.calls == [list[int], list[str]]
+
+    def test_predicate(self, dispatcher):
+        dispatcher.register(lambda tp: tp is Point, lambda tp: "point")
+        assert dispatcher.dispatch(Point) == "point"
+
+    def test_unhashable(self, dispatcher):
+        tp = Annotated[list[int], {"unhashable": []}]
+        assert dispatcher.dispatch(tp)(["1"]) == [1]
+
+    def test_late_virtual_subclass(self):
+        class Bag(ABC):
+            pass
+
+        class Items(list):
+            pass
+
+        dispatcher = GenericDispatcher(fallback=lambda tp: "fallback")
+        dispatcher.register(Bag, lambda tp: "bag")
+        assert dispatcher.dispatch(Items) == "fallback"
+        Bag.register(Items)
+        assert dispatcher.dispatch(Items) == "bag"
+
+    def test_not_found(self):
+        with pytest.raises(HookNotFoundError, match=r"Hook for list\[int\] not found"):
+            GenericDispatcher().dispatch(list[int])
+
+
+class Point:
+    pass
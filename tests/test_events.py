@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import pytest
+from attrs import define
+from attrs import field as attrs_field
+
+from xattrs import asdict, iter_events, serde
+from xattrs._metadata import _Metadata
+from xattrs.converters import to_upper
+
+
+class Point(NamedTuple):
+    x: Any
+    y: Any
+
+
+@define
+class A:
+    x: Any
+    y: Any = attrs_field(default=None) | _Metadata(exclude_if_false=True)
+
+
+@dataclass
+class D:
+    x: Any
+    y: Any = None
+
+
+def _rebuild(events):
+    """Rebuild the output of `asdict` (with lists for arrays) from events."""
+    stack: list[Any] = []
+    keys: list[Any] = []
+    result = None
+
+    def add(value):
+        nonlocal result
+        if not stack:
+            result = value
+        elif isinstance(stack[-1], dict):
+            stack[-1][keys.pop()] = value
+        else:
+            stack[-1].append(value)
+
+    for event, value in events:
+        if event in {"start_map", "start_array"}:
+            container: Any = {} if event == "start_map" else []
+            add(container)
+            stack.append(container)
+        elif event in {"end_map", "end_array"}:
+            stack.pop()
+        elif event == "map_key":
+            keys.append(value)
+        else:
+            add(value)
+    return result
+
+
+def _listify(obj):
+    if isinstance(obj, dict):
+        return {k: _listify(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [_listify(v) for v in obj]
+    return obj
+
+
+class TestIterEvents:
+    def test_events(self):
+        assert list(iter_events(A(1, [D("a"), Point(2, 3)]))) == [
+            ("start_map", None),
+            ("map_key", "x"),
+            ("scalar", 1),
+            ("map_key", "y"),
+            ("start_array", None),
+            ("start_map", None),
+            ("map_key", "x"),
+            ("scalar", "a"),
+            ("map_key", "y"),
+            ("scalar", None),
+            ("end_map", None),
+            ("start_array", None),
+            ("scalar", 2),
+            ("scalar", 3),
+            ("end_array", None),
+            ("end_array", None),
+            ("end_map", None),
+        ]
+
+    def test_scalars(self):
+        assert list(iter_events(1)) == [("scalar", 1)]
+        leaf = {1, 2}
+        assert list(iter_events(D(leaf))) == [
+            ("start_map", None),
+            ("map_key", "x"),
+            ("scalar", leaf),
+            ("map_key", "y"),
+            ("scalar", None),
+            ("end_map", None),
+        ]
+        assert next(e for e in iter_events(D(leaf)) if e[0] == "scalar")[1] is leaf
+
+    @pytest.mark.parametrize(
+        "inst",
+        [
+            A(1),
+            D(A(1, 0), [D(2, 3), (A(4, 5), "a")]),
+            A(OrderedDict(a=A(3), b={"c": (D(4),)}), {"k": D(5, [6])}),
+            [A(1), {"x": D(2)}],
+        ],
+    )
+    def test_same_as_asdict(self, inst):
+        expected = _listify(asdict(inst, key_serializer=to_upper))
+        assert _rebuild(iter_events(inst, key_serializer=to_upper)) == expected
+
+    def test_serde_rename(self):
+        @serde(rename="camelCase")
+        @define
+        class C:
+            first_name: str
+
+        assert list(iter_events(C("John"))) == [
+            ("start_map", None),
+            ("map_key", "firstName"),
+            ("scalar", "John"),
+            ("end_map", None),
+        ]
+
+    def test_deep_structure(self):
+        depth = sys.getrecursionlimit() * 2
+        node = None
+        for i in range(depth):
+            node = D(i, node)
+        events = list(iter_events(node))
+        assert len(events) == depth * 5 + 1
+
+    def test_types_are_rejected(self):
+        with pytest.raises(TypeError, match="Must be an instance"):
+            list(iter_events(A))
@@ -0,0 +1,606 @@
+from __future__ import annotations
+
+from typing import Annotated, Any, NewType, Optional, Union
+
+import gc
+import weakref
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from dataclasses import field as dataclass_field
+from enum import Enum
+
+from attrs import Factory, define, field, frozen
+
+from xattrs import (
+    asdict,
+    asdict_many,
+    astuple,
+    fromdict,
+    fromtuple,
+    get_unknown_fields,
+    serde,
+)
+from xattrs._metadata import _Metadata
+from xattrs._plan import _clear_ser_plans, _get_de_plan, _get_union_plan
+from xattrs._typedesc import _describe
+from xattrs.exceptions import DeserializeError
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+UserId = NewType("UserId", int)
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+@frozen
+class Point:
+    x: int
+    y: int
+
+
+@dataclass
+class Line:
+    start: Point
+    end: Point
+    color: Color = Color.RED
+
+
+@define
+class Shape:
+    name: str
+    lines: list[Line]
+    points: tuple[Point, ...] = ()
+    anchors: dict[str, Point] = field(factory=dict)
+    tags: frozenset[str] = frozenset()
+    origin: Optional[Point] = None
+    owner: Annotated[UserId, "owner"] = UserId(0)
+    pair: tuple[Point, int] = (Point(0, 0), 0)
+    history: deque[Point] = field(factory=deque)
+    extra: Any = None
+
+
+@serde(rename="camelCase")
+@define
+class Renamed:
+    first_name: str
+    last_name: str = field(default="", metadata={"name": "surname"})
+    _private: int = 0
+    computed: int = field(init=False, default=-1)
+
+
+@dataclass
+class Converted:
+    value: int = dataclass_field(metadata={"converter_from": lambda v: int(v) * 2})
+
+
+def make_shape() -> Shape:
+    return Shape(
+        "triangle",
+        [Line(Point(0, 0), Point(1, 0)), Line(Point(1, 0), Point(0, 1), Color.BLUE)],
+        points=(Point(2, 2),),
+        anchors={"center": Point(3, 3)},
+        tags=frozenset({"a", "b"}),
+        origin=Point(4, 4),
+        owner=UserId(42),
+        pair=(Point(5, 5), 6),
+        history=deque([Point(7, 7)]),
+        extra={"raw": [1, 2]},
+    )
+
+
+class TestFromDict:
+    """
+    Tests for `fromdict`.
+    """
+
+    def test_roundtrip(self):
+        shape = make_shape()
+        data = asdict(shape)
+        data["lines"][1]["color"] = "blue"
+        assert fromdict(data, Shape) == shape
+
+    def test_defaults(self):
+        shape = fromdict({"name": "empty", "lines": []}, Shape)
+        assert shape == Shape("empty", [])
+
+    def test_missing_field(self):
+        with pytest.raises(DeserializeError, match="Missing required field 'lines'"):
+            fromdict({"name": "empty"}, Shape)
+        with pytest.raises(DeserializeError, match="Expected a mapping"):
+            fromdict({"name": "bad", "lines": [[1, 2]]}, Shape)
+
+    @pytest.mark.parametrize("pair", [[{"x": 1, "y": 2}], [{"x": 1, "y": 2}, 3, 4]])
+    def test_fixed_tuple_length(self, pair):
+        with pytest.raises(
+            DeserializeError, match=f"Expected 2 values, got {len(pair)}"
+        ):
+            fromdict({"name": "bad", "lines": [], "pair": pair}, Shape)
+
+    def test_defaultdict(self):
+        @define
+        class Index:
+            groups: defaultdict[str, list[Point]]
+            counts: defaultdict[str, int] = field(factory=lambda: defaultdict(int))
+            points: defaultdict[str, Point] = field(factory=lambda: defaultdict(None))
+
+        data = {"groups": {"a": [{"x": 1, "y": 2}]}, "counts": {"a": 1}, "points": {}}
+        inst = fromdict(data, Index)
+        assert type(inst.groups) is defaultdict
+        assert inst.groups == {"a": [Point(1, 2)]}
+        assert inst.groups["b"] == []
+        assert inst.counts["b"] == 0
+        # not a builtin type
+        assert inst.points.default_factory is None
+        # the factory of input defaultdicts is kept
+        inst = fromdict({"groups": defaultdict(tuple)}, Index)
+        assert inst.groups["b"] == ()
+
+    def test_renamed_keys(self):
+        inst = Renamed("John", "Lowe", 3)
+        data = asdict(inst)
+        assert data == {
+            "firstName": "John",
+            "surname": "Lowe",
+            "_private": 3,
+            "computed": -1,
+        }
+        assert fromdict(data, Renamed) == Renamed("John", "Lowe", 3)
+
+    @given(x=st.integers(), y=st.integers())
+    def test_scope_key_serializer(self, x, y):
+        data = asdict(Line(Point(x, y), Point(y, x)), key_serializer=str.upper)
+        actual = fromdict(data, Line, key_serializer=str.upper)
+        assert actual == Line(Point(x, y), Point(y, x))
+
+    def test_converter_from(self):
+        assert fromdict({"value": "21"}, Converted) == Converted(42)
+
+    def test_hook(self):
+        @frozen
+        class Hooked:
+            x: int
+
+            @classmethod
+            def __attrs_fromdict__(cls, data):
+                return cls(data["X"])
+
+        assert fromdict({"X": 1}, Hooked) == Hooked(1)
+
+    def test_plan_is_cached(self):
+        _clear_ser_plans(Line)
+        fromdict(asdict(Line(Point(0, 0), Point(1, 1))), Line)
+        plan = _get_de_plan(Line)
+        assert plan.fromdict_func is not None
+        fromdict(asdict(Line(Point(0, 0), Point(1, 1))), Line)
+        assert _get_de_plan(Line) is plan
+
+    @pytest.mark.parametrize("trusted", [False, True])
+    @pytest.mark.parametrize("decorator", [define, frozen, dataclass])
+    def test_plan_does_not_keep_class_alive(self, decorator, trusted):
+        @decorator
+        class Temp:
+            x: int
+            y: int = 0
+
+        fromdict({"x": 1}, Temp, trusted=trusted)
+        fromtuple((1, 2), Temp)
+        with pytest.raises(DeserializeError, match="Missing required field"):
+            fromdict({}, Temp, trusted=trusted)
+        ref = weakref.ref(Temp)
+        del Temp
+        gc.collect()
+        assert ref() is None
+
+    def test_types_are_rejected(self):
+        with pytest.raises(TypeError, match="Expected a dataclass-like type"):
+            fromdict({}, dict)
+
+
+class TestFromTuple:
+    """
+    Tests for `fromtuple`.
+    """
+
+    def test_roundtrip(self):
+        line = Line(Point(0, 1), Point(2, 3), Color.BLUE)
+        data = astuple(line)
+        assert data == ((0, 1), (2, 3), Color.BLUE)
+        assert fromtuple(data, Line) == line
+
+    def test_init_false(self):
+        inst = Renamed("John", "Lowe", 3)
+        assert fromtuple(astuple(inst), Renamed) == inst
+
+    def test_wrong_length(self):
+        with pytest.raises(DeserializeError, match="Expected 2 values for Point"):
+            fromtuple((1, 2, 3), Point)
+
+
+@frozen
+class Validated:
+    x: int = field(validator=lambda _, __, v: v >= 0 or 1 / 0)
+    y: list[int] = field(factory=list)
+    z: int = field(default=Factory(lambda self: self.x + 1, takes_self=True))
+    computed: int = field(init=False)
+
+    def __attrs_post_init__(self):
+        object.__setattr__(self, "computed", self.x * 10)
+
+
+@dataclass(frozen=True)
+class FrozenDict:
+    point: Validated
+    tags: list[str] = dataclass_field(default_factory=list)
+    flag: bool = False
+
+
+class TestFromDictTrusted:
+    """
+    Tests for `fromdict` with ``trusted=True``.
+    """
+
+    @pytest.mark.parametrize("cls", [Point, Line, Shape, Renamed, Validated])
+    def test_same_as_init(self, cls):
+        inst = {
+            Point: Point(1, 2),
+            Line: Line(Point(0, 0), Point(1, 1), Color.BLUE),
+            Shape: make_shape(),
+            Renamed: Renamed("John", "Lowe", 3),
+            Validated: Validated(1, [2]),
+        }[cls]
+        data = asdict(inst, copy=None)
+        if cls is Shape:
+            data["lines"][1]["color"] = "blue"
+        assert fromdict(data, cls, trusted=True) == inst
+
+    def test_bypass_init(self):
+        # validators and post init hooks are skipped
+        inst = fromdict({"x": -1, "computed": 5}, Validated, trusted=True)
+        assert (inst.x, inst.y, inst.z, inst.computed) == (-1, [], 0, 5)
+        assert not hasattr(fromdict({"x": 1}, Validated, trusted=True), "computed")
+
+    def test_frozen_dict_backed(self):
+        inst = fromdict(
+            {"point": {"x": -1, "computed": 0}, "tags": ["a"]}, FrozenDict, trusted=True
+        )
+        assert inst == FrozenDict(
+            fromdict({"x": -1, "computed": 0}, Validated, trusted=True), ["a"]
+        )
+        assert inst.__dict__ == {"point": inst.point, "tags": ["a"], "flag": False}
+        with pytest.raises(AttributeError):
+            inst.flag = True  # type: ignore[misc]
+
+    def test_missing_field(self):
+        with pytest.raises(DeserializeError, match="Missing required field 'x'"):
+            fromdict({}, Validated, trusted=True)
+
+
+@define
+class Event:
+    at: int
+
+
+@serde(tag="click")
+@define
+class Click(Event):
+    x: int = 0
+
+
+@serde(tag=lambda cls: cls.__name__.lower(), tag_field="kind")
+@define
+class KeyPress(Event):
+    key: str = ""
+
+
+@serde(tag="scroll")
+@define
+class Scroll(Event):
+    delta: int = 0
+
+
+@define
+class Log:
+    events: list[Event]
+    last: Union[Click, Scroll, None] = None
+
+
+class TestTagged:
+    """
+    Tests for classes tagged by ``serde(tag=...)``.
+    """
+
+    @pytest.mark.parametrize("engine", ["recursive", "iterative", "codegen"])
+    def test_asdict_emits_tag(self, engine):
+        assert asdict(Click(1, 2), engine=engine) == {"type": "click", "at": 1, "x": 2}
+        assert asdict(KeyPress(1, "a"), engine=engine) == {
+            "kind": "keypress",
+            "at": 1,
+            "key": "a",
+        }
+        assert asdict_many([Event(0), Scroll(1, 2)], engine=engine) == [
+            {"at": 0},
+            {"type": "scroll", "at": 1, "delta": 2},
+        ]
+
+    @pytest.mark.parametrize("trusted", [False, True])
+    def test_polymorphic_list(self, trusted):
+        log = Log([Click(1, 2), KeyPress(2, "a"), Event(3), Scroll(4, 5)], Scroll(6))
+        actual = fromdict(asdict(log), Log, trusted=trusted)
+        assert actual == log
+        assert [type(e) for e in actual.events] == [Click, KeyPress, Event, Scroll]
+
+    def test_union(self):
+        assert fromdict({"events": [], "last": {"type": "click", "at": 1}}, Log) == Log(
+            [], Click(1)
+        )
+        assert fromdict({"events": [], "last": None}, Log) == Log([])
+        data = {"events": [], "last": {"type": "key", "at": 1}}
+        with pytest.raises(DeserializeError, match="Unknown tag {'type': 'key'}"):
+            fromdict(data, Log)
+
+    def test_base_class(self):
+        assert fromdict({"type": "scroll", "at": 1}, Event) == Scroll(1)
+        assert fromdict({"type": "unknown", "at": 1}, Event) == Event(1)
+        assert fromdict({"kind": "keypress", "at": 1}, Event) == KeyPress(1)
+
+    def test_inherited_tag(self):
+        @define
+        class DoubleClick(Click):
+            count: int = 2
+
+        assert asdict(DoubleClick(1)) == {"at": 1, "x": 0, "count": 2}
+        with pytest.raises(ValueError, match="DoubleClick inherits serde"):
+            fromdict({"at": 1}, DoubleClick)
+
+        serde(tag="double_click")(DoubleClick)
+        data = asdict(DoubleClick(1))
+        assert data == {"type": "double_click", "at": 1, "x": 0, "count": 2}
+        assert fromdict(data, Event) == DoubleClick(1)
+
+    def test_late_registration(self):
+        assert fromdict({"type": "late", "at": 1}, Event) == Event(1)
+
+        @serde(tag="late")
+        @define
+        class Late(Event):
+            pass
+
+        assert fromdict({"type": "late", "at": 1}, Event) == Late(1)
+
+    def test_retag(self):
+        @define
+        class Retagged(Event):
+            pass
+
+        serde(Retagged, tag="old")
+        serde(Retagged, tag="new")
+        assert fromdict({"type": "old", "at": 1}, Event) == Event(1)
+        assert fromdict({"type": "new", "at": 1}, Event) == Retagged(1)
+        assert asdict(Retagged(1)) == {"type": "new", "at": 1}
+
+
+@serde(rename="camelCase", unknown_fields="deny")
+@define
+class Strict:
+    first_name: str
+    computed: int = field(init=False, default=0)
+
+
+@serde(tag="loose", unknown_fields="allow")
+@define
+class Loose:
+    x: int
+
+
+class TestUnknownFields:
+    """
+    Tests for ``serde(unknown_fields=...)``.
+    """
+
+    @pytest.mark.parametrize("trusted", [False, True])
+    def test_deny(self, trusted):
+        data = asdict(Strict("John"))
+        assert fromdict(data, Strict, trusted=trusted) == Strict("John")
+        with pytest.raises(
+            DeserializeError, match="Unknown fields 'a', 'first_name' for Strict"
+        ):
+            fromdict({**data, "a": 1, "first_name": ""}, Strict, trusted=trusted)
+
+    @pytest.mark.parametrize("trusted", [False, True])
+    def test_allow(self, trusted):
+        inst = fromdict({"type": "loose", "x": 1, "y": [2]}, Loose, trusted=trusted)
+        assert inst == Loose(1)
+        assert get_unknown_fields(inst) == {"y": [2]}
+        assert get_unknown_fields(fromdict({"x": 1}, Loose)) == {}
+        assert get_unknown_fields(Point(0, 0)) == {}
+
+    def test_ignore(self):
+        assert fromdict({"x": 1, "y": 2, "z": 3}, Point) == Point(1, 2)
+
+    def test_allow_requires_weakref(self):
+        @serde(unknown_fields="allow")
+        @define(weakref_slot=False)
+        class NoWeakref:
+            x: int
+
+        with pytest.raises(TypeError, match="requires weakly referenceable"):
+            fromdict({"x": 1}, NoWeakref)
+
+    def test_invalid(self):
+        @serde(unknown_fields="keep")  # type: ignore[arg-type]
+        @define
+        class Invalid:
+            x: int
+
+        with pytest.raises(ValueError, match="unknown unknown_fields: 'keep'"):
+            fromdict({"x": 1}, Invalid)
+
+
+@define
+class Circle:
+    radius: float
+    center: Point = Point(0, 0)
+
+
+@define
+class Rect:
+    width: float
+    height: float
+    center: Point = Point(0, 0)
+
+
+@serde(rename="camelCase")
+@define
+class Square:
+    side_length: float
+
+
+@define
+class Sized:
+    width: float
+
+
+@define
+class Canvas:
+    shapes: list[Union[Circle, Rect, Square, Sized, int]]
+    main: Optional[Union[Circle, Rect]] = None
+
+
+@define
+class Label:
+    x: int
+    y: int = 0
+
+
+@define
+class Marker:
+    x: int
+    z: int = 0
+
+
+@define
+class Overlay:
+    # only optional keys tell the arms apart
+    shapes: list[Union[Label, Marker]]
+
+
+class TestUnion:
+    """
+    Tests for unions of dataclass-like classes without tags.
+    """
+
+    @pytest.mark.parametrize("trusted", [False, True])
+    def test_roundtrip(self, trusted):
+        canvas = Canvas(
+            [Circle(1.0), Rect(1.0, 2.0, Point(1, 1)), Square(3.0), Sized(4.0), 5],
+            Rect(6.0, 7.0),
+        )
+        actual = fromdict(asdict(canvas), Canvas, trusted=trusted)
+        assert actual == canvas
+        assert [type(s) for s in actual.shapes] == [Circle, Rect, Square, Sized, int]
+
+    def test_fallback_by_required_keys(self):
+        # ``width`` is accepted by both ``Rect`` and ``Sized``
+        data = {"shapes": [{"width": 1.0}, {"height": 2.0, "width": 1.0}]}
+        assert fromdict(data, Canvas).shapes == [Sized(1.0), Rect(1.0, 2.0)]
+
+    def test_discriminated_by_optional_keys(self):
+        data = {"shapes": [{"x": 1, "z": 2}, {"x": 1, "y": 2}, {"x": 1}]}
+        shapes = fromdict(data, Overlay).shapes
+        assert shapes == [Marker(1, 2), Label(1, 2), Label(1)]
+
+    def test_unknown_shape(self):
+        data = {"shapes": [{"center": {"x": 0, "y": 0}}]}
+        with pytest.raises(DeserializeError, match=r"No arm of .* \['center'\]"):
+            fromdict(data, Canvas)
+
+    def test_unknown_shape_passthrough(self):
+        @define
+        class Drawing:
+            shapes: list[Union[Circle, Rect, dict[str, Any]]]
+
+        data = {"shapes": [{"center": 0}, {"radius": 1.0}]}
+        assert fromdict(data, Drawing).shapes == [{"center": 0}, Circle(1.0)]
+
+    def test_plan_is_cached(self):
+        fromdict({"shapes": []}, Canvas)
+        desc = _describe(Union[Circle, Rect, Square, Sized, int])
+        plan = _get_union_plan(desc)
+        assert plan is _get_union_plan(desc)
+        assert plan.discriminators == {
+            "radius": Circle,
+            "height": Rect,
+            "sideLength": Square,
+        }
+
+
+@serde(rename="camelCase", unknown_fields="deny")
+@define
+class Aliased:
+    first_name: str = field(metadata={"alias": "name", "aliases": ["given_name"]})
+    last_name: str = field(default="") | _Metadata(name="surname", aliases=["family"])
+
+
+class TestAliases:
+    """
+    Tests for ``alias`` / ``aliases`` of fields.
+    """
+
+    def test_rename_tables(self):
+        plan = _get_de_plan(Aliased)
+        assert plan.names == {"first_name": "firstName", "last_name": "surname"}
+        assert plan.reverse == {
+            "firstName": "first_name",
+            "name": "first_name",
+            "given_name": "first_name",
+            "surname": "last_name",
+            "family": "last_name",
+        }
+
+    @pytest.mark.parametrize("trusted", [False, True])
+    def test_aliases(self, trusted):
+        expected = Aliased("John", "Lowe")
+        for data in (
+            {"firstName": "John", "surname": "Lowe"},
+            {"name": "John", "family": "Lowe"},
+            {"given_name": "John", "surname": "Lowe"},
+            # keys take precedence over aliases
+            {"firstName": "John", "name": "Jane", "surname": "Lowe"},
+        ):
+            assert fromdict(data, Aliased, trusted=trusted) == expected
+        assert asdict(expected) == {"firstName": "John", "surname": "Lowe"}
+        with pytest.raises(DeserializeError, match="field 'firstName' for Aliased"):
+            fromdict({"surname": "Lowe"}, Aliased, trusted=trusted)
+
+    def test_conflict(self):
+        @define
+        class Conflict:
+            x: int = field(metadata={"alias": "y"})
+            y: int = 0
+
+        with pytest.raises(ValueError, match="'y' of .*Conflict is used by both"):
+            fromdict({"x": 1}, Conflict)
+
+
+@define
+class PartlyResolvable:
+    x: int
+    y: Undefined  # noqa: F821
+
+
+def test_field_types_resolves_fields_one_at_a_time():
+    from xattrs._uni import _field_types
+
+    types = _field_types(PartlyResolvable)
+    assert types["x"] is int
+    assert types["y"] == "Undefined"
+
+
+def test_unresolvable_annotation_raises_clearly():
+    with pytest.raises(NameError, match="Can not resolve the annotation"):
+        fromdict({"x": 1, "y": 2}, PartlyResolvable)
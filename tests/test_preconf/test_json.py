@@ -1,9 +1,32 @@
 from __future__ import annotations
 
+from typing import Any, Optional
+
+import io
+import itertools
 import json
+from datetime import datetime
+
+import attrs
+import pytest
+from attrs import define
+from attrs import field as attrs_field
+from hypothesis import given
+from hypothesis import strategies as st
 
-from xattrs import frozen
-from xattrs.preconf.json import to_json
+from xattrs import _de_funcs, frozen, serde
+from xattrs._metadata import _Metadata
+from xattrs.preconf._json_backends import JSON_BACKENDS, JsonBackend, get_json_backend
+from xattrs.preconf.json import (
+    JsonDeserializer,
+    JsonSerializer,
+    dump,
+    dump_lines,
+    from_json,
+    iter_json,
+    load_lines,
+    to_json,
+)
 
 
 def test_to_json():
@@ -19,3 +42,234 @@ def test_to_json():
     assert repr(person) == "Person(name='John', age=25)"
 
     assert to_json(person) == json.dumps(obj)
+    assert to_json(person, ensure_ascii=False) == json.dumps(obj, ensure_ascii=False)
+
+
+def test_from_json():
+    @frozen
+    class Person:
+        name: str
+        age: int
+
+    person = from_json('{"name": "John", "age": 25, "unknown": null}', Person)
+    assert person == Person("John", 25)
+    assert from_json(to_json(person), Person) == person
+
+
+@define
+class Item:
+    name: str
+    price: float
+    tags: list[str]
+    extra: dict[Any, Any]
+
+
+@serde(rename="camelCase", tag="order")
+@define
+class Order:
+    order_id: int
+    items: list[Item]
+    note: Optional[str] = attrs_field(default=None) | _Metadata(exclude_if_false=True)
+    created: datetime = datetime(2024, 1, 1)
+
+
+class TestIterJson:
+    @given(
+        order_id=st.integers(),
+        names=st.lists(st.text(), max_size=5),
+        price=st.floats(),
+        note=st.one_of(st.none(), st.text()),
+    )
+    def test_same_as_to_json(self, order_id, names, price, note):
+        order = Order(
+            order_id,
+            [
+                Item(
+                    name,
+                    price,
+                    [name],
+                    {1: None, 2.5: [name], False: name, None: price},
+                )
+                for name in names
+            ],
+            note,
+        )
+        default = datetime.isoformat
+        expected = to_json(order, default=default)
+        assert "".join(iter_json(order, default=default)) == expected
+        assert "".join(iter_json(order, default=default, chunk_size=1)) == expected
+
+    def test_chunks(self):
+        items = [Item(str(i), 0.5, [], {}) for i in range(1_000)]
+        chunks = list(iter_json(items, chunk_size=1_024))
+        assert len(chunks) > 1
+        assert all(len(chunk) < 1_024 + 64 for chunk in chunks)
+        assert json.loads("".join(chunks)) == json.loads(to_json(items))
+
+    def test_dump(self):
+        fp = io.StringIO()
+        dump(Order(1, []), fp, default=str)
+        assert json.loads(fp.getvalue()) == {
+            "type": "order",
+            "orderId": 1,
+            "items": [],
+            "created": "2024-01-01 00:00:00",
+        }
+
+    def test_invalid(self):
+        with pytest.raises(TypeError, match="is not JSON serializable"):
+            "".join(iter_json(Order(1, [])))
+        with pytest.raises(TypeError, match="keys must be str, int"):
+            "".join(iter_json({(1, 2): 3}))
+
+
+def _installed(name):
+    try:
+        get_json_backend(name)
+    except ImportError:
+        return False
+    return True
+
+
+BACKENDS = [
+    pytest.param(
+        name,
+        marks=pytest.mark.skipif(not _installed(name), reason=f"{name} not installed"),
+    )
+    for name in JSON_BACKENDS
+]
+
+
+class TestBackends:
+    @pytest.mark.parametrize("name", BACKENDS)
+    def test_roundtrip(self, name):
+        order = Order(1, [Item("a", 0.5, ["x"], {"k": [1]})], "note")
+        serializer = JsonSerializer(backend=name)
+        deserializer = JsonDeserializer(backend=name)
+        assert serializer.backend.name == deserializer.backend.name == name
+
+        text = serializer.to_json(order, default=datetime.isoformat)
+        assert isinstance(text, str)
+        assert deserializer.loads(text) == json.loads(text)
+        # datetimes are not parsed back
+        expected = attrs.evolve(order, created="2024-01-01T00:00:00")
+        assert deserializer.from_json(text, Order) == expected
+
+    @pytest.mark.parametrize("name", BACKENDS)
+    def test_options(self, name):
+        dumps = JsonSerializer(backend=name).dumps
+        obj = {"b": 1, "a": [None]}
+        assert list(json.loads(dumps(obj, sort_keys=True))) == ["a", "b"]
+        assert dumps(obj, indent=2) == json.dumps(obj, indent=2)
+        assert json.loads(dumps(obj, indent=4)) == obj
+        assert dumps({1: 2}) in ('{"1": 2}', '{"1":2}')
+
+    @pytest.mark.parametrize("name", BACKENDS)
+    def test_stdlib_options(self, name):
+        serializer = JsonSerializer(backend=name)
+        deserializer = JsonDeserializer(backend=name)
+        obj = {"name": "é", "items": [1, 2]}
+        for kwargs in ({"ensure_ascii": False}, {"separators": (",", ":")}):
+            assert serializer.dumps(obj, **kwargs) == json.dumps(obj, **kwargs)
+        assert deserializer.loads('{"a": 1}', object_hook=len) == 1
+
+    def test_default(self):
+        assert get_json_backend().name == "json"
+        assert JsonSerializer().backend is get_json_backend("json")
+        assert JsonDeserializer().backend is get_json_backend("json")
+
+    def test_auto(self):
+        backend = get_json_backend("auto")
+        assert backend is get_json_backend("auto")
+        installed = [name for name in JSON_BACKENDS if _installed(name)]
+        assert backend.name == installed[0]
+        assert JsonSerializer(backend="auto").backend is backend
+
+    def test_custom(self):
+        backend = JsonBackend("custom", lambda obj, **kw: "null", lambda s: None)
+        assert JsonSerializer(backend=backend).to_json(Order(1, [])) == "null"
+
+    def test_unknown(self):
+        with pytest.raises(ValueError, match="unknown JSON backend: 'simdjson'"):
+            get_json_backend("simdjson")
+
+
+class TestJsonLines:
+    orders = [
+        Order(i, [Item(f"item{i}", i / 2, ["x"] * i, {"k": [i]})], note)
+        for i, note in enumerate([None, "a\u2028b", "multi\nline"])
+    ]
+
+    def dump(self, orders):
+        fp = io.StringIO()
+        dump_lines(orders, fp, default=datetime.isoformat)
+        return fp.getvalue()
+
+    def test_dump_lines(self):
+        text = self.dump(self.orders)
+        lines = text.splitlines()
+        assert text.endswith("\n")
+        assert len(text.split("\n")) == len(self.orders) + 1
+        assert [from_json(line, Order) for line in text.split("\n")[:-1]] == [
+            attrs.evolve(order, created="2024-01-01T00:00:00") for order in self.orders
+        ]
+        assert lines[0] == to_json(self.orders[0], default=datetime.isoformat)
+
+    def test_dump_lines_lazy(self):
+        consumed = []
+
+        def orders():
+            for order in self.orders:
+                consumed.append(order)
+                yield order
+
+        assert self.dump(orders()) == self.dump(self.orders)
+        assert consumed == self.orders
+        with pytest.raises(ValueError, match="indent"):
+            dump_lines(self.orders, io.StringIO(), indent=2)
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+    @pytest.mark.parametrize("binary", [False, True])
+    def test_load_lines(self, chunk_size, binary):
+        text = "\n" + self.dump(self.orders).replace("\n", "\r\n", 1) + "\n  \n"
+        fp = io.BytesIO(text.encode()) if binary else io.StringIO(text)
+        loaded = load_lines(fp, Order, chunk_size=chunk_size)
+        assert next(loaded).order_id == 0
+        assert list(loaded) == [
+            attrs.evolve(order, created="2024-01-01T00:00:00")
+            for order in self.orders[1:]
+        ]
+
+    def test_load_lines_lazy(self):
+        fp = io.StringIO(self.dump(self.orders) + "{not json")
+        loaded = load_lines(fp, Order, chunk_size=16)
+        assert [order.order_id for order in itertools.islice(loaded, 3)] == [0, 1, 2]
+        with pytest.raises(ValueError):
+            next(loaded)
+
+    @pytest.mark.parametrize("cls", [Item, Order])
+    def test_load_lines_looks_up_plan_once(self, cls, monkeypatch):
+        calls = []
+        get_de_plan = _de_funcs._get_de_plan
+
+        def counting(cls, *args):
+            calls.append(cls)
+            return get_de_plan(cls, *args)
+
+        if cls is Item:
+            objs = [Item(str(i), 0.5, [], {}) for i in range(3)]
+        else:
+            # tagged, but without any tagged subclass
+            objs = [Order(i, []) for i in range(3)]
+        fp = io.StringIO(self.dump(objs))
+        monkeypatch.setattr(_de_funcs, "_get_de_plan", counting)
+        assert len(list(load_lines(fp, cls))) == 3
+        assert calls == [cls]
+
+    def test_load_lines_no_trailing_newline(self):
+        fp = io.StringIO(self.dump(self.orders).rstrip("\n"))
+        assert len(list(load_lines(fp, Order))) == len(self.orders)
+
+    def test_load_lines_not_a_class(self):
+        with pytest.raises(TypeError, match="dataclass-like"):
+            load_lines(io.StringIO(), dict)
@@ -5,7 +5,9 @@ from textwrap import dedent
 from attrs import define, field
 
 from xattrs import asdict, serde
-from xattrs.preconf.yaml import to_yaml
+from xattrs.preconf.yaml import from_yaml, to_yaml
+
+import pytest
 
 
 def test_yaml__attrs_example():
@@ -44,3 +46,25 @@ def test_yaml__attrs_example():
         """
     )
     assert to_yaml(person).strip() == yaml_string.strip()
+
+
+def test_from_yaml():
+    @serde(rename="kebab-case")
+    @define
+    class Person:
+        first_name: str
+        last_name: str
+        age: int
+
+    person = Person("John", "Lowe", 25)
+    assert from_yaml(Person, to_yaml(person)) == person
+
+
+def test_from_yaml_deserializer_deprecated():
+    @define
+    class Person:
+        name: str
+
+    with pytest.deprecated_call(match="deserializer"):
+        person = from_yaml(Person, "name: John\n", deserializer=lambda v, cls: v)
+    assert person == Person("John")
@@ -5,7 +5,11 @@ import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
+from xattrs import converters
 from xattrs.converters import (
+    _CASE_CONVERTER_MAPPING,
+    clear_case_cache,
+    set_case_cache_size,
     to_camel,
     to_const,
     to_kebab,
@@ -87,3 +91,37 @@ class TestStringConverters:
 )
 def test_to_secret(value, expected, extra):
     assert to_secret(value, **extra) == expected
+
+
+class TestCaseCache:
+    @pytest.fixture(autouse=True)
+    def _reset(self):
+        clear_case_cache()
+        yield
+        set_case_cache_size(4096)
+
+    @given(value=st.sampled_from(SNAKE_CASES))
+    def test_same_as_converter(self, value):
+        for convention in ("camelCase", "PascalCase", "kebab-case", "snake_case"):
+            convert = _CASE_CONVERTER_MAPPING[convention]
+            assert convert(value) == convert.__wrapped__(value)
+            assert convert(value) == convert.__wrapped__(value)
+
+    def test_memoized(self):
+        to_camel_memo = _CASE_CONVERTER_MAPPING["camelCase"]
+        assert to_camel_memo("foo_bar") == "fooBar"
+        assert converters._case_cache == {("camelCase", "foo_bar"): "fooBar"}
+        clear_case_cache()
+        assert converters._case_cache == {}
+
+    def test_size(self):
+        set_case_cache_size(1)
+        to_snake_memo = _CASE_CONVERTER_MAPPING["snake_case"]
+        assert to_snake_memo("fooBar") == "foo_bar"
+        assert to_snake_memo("fooBarBaz") == "foo_bar_baz"
+        assert converters._case_cache == {("snake_case", "fooBar"): "foo_bar"}
+        set_case_cache_size(0)
+        assert to_snake_memo("fooBar") == "foo_bar"
+        assert converters._case_cache == {}
+        with pytest.raises(ValueError, match="maxsize must be non-negative"):
+            set_case_cache_size(-1)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from typing import Any
+
+from collections import OrderedDict, defaultdict, namedtuple
+from copy import deepcopy
+
+import pytest
+import optree
+from attrs import frozen
+
+from xattrs import astree, astuple, tree_map
+from xattrs._struct_funcs import _astree_inner, _astuple_inner
+from xattrs._tree import _astuple_optree, _NotATree, _struct_leaves, flatten, unflatten
+from xattrs.constants import NAMESPACE_STRUCT_DICT
+from xattrs.attrs import define
+from xattrs.dataclasses import dataclass
+
+P = namedtuple("P", ["a", "b"])
+
+
+@define
+class A:
+    x: Any
+    y: Any
+
+
+@dataclass(frozen=True)
+class D:
+    x: Any
+    y: Any
+
+
+@frozen
+class Unregistered:
+    x: Any
+
+
+def make_inst() -> A:
+    return A(
+        D(1, [2, None, P(3, "4")]),
+        {
+            "b": A(5.0, (6,)),
+            "a": OrderedDict(z=7, y=D(8, 9)),
+            P(10, 11): defaultdict(int, q=[A({12}, b"13")]),
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    ("func", "inner"), [(astuple, _astuple_inner), (astree, _astree_inner)]
+)
+@pytest.mark.parametrize("tuple_factory", [tuple, list])
+def test_same_as_python(func, inner, tuple_factory):
+    inst = make_inst()
+    expected = inner(inst, tuple_factory, None, None, deepcopy)
+    actual = func(inst, tuple_factory=tuple_factory)
+    assert actual == expected
+    assert repr(actual) == repr(expected)
+
+
+def test_fast_path():
+    inst = make_inst()
+    result = _astuple_optree(inst, tuple, deepcopy, lambda k: k)
+    assert result[1][P(10, 11)].default_factory is int
+    assert list(result[1]) == ["b", "a", P(10, 11)]
+    # leaves are still copied
+    assert result[1][P(10, 11)]["q"][0][0] == {12}
+    assert result[1][P(10, 11)]["q"][0][0] is not inst.y[P(10, 11)]["q"][0].x
+
+    # keys of dicts are converted by the given function
+    result = _astuple_optree({D(1, 2): 3}, tuple, deepcopy, astuple)
+    assert result == {(1, 2): 3}
+
+
+@pytest.mark.parametrize(
+    "inst",
+    [
+        A(1, Unregistered(2)),
+        A(1, [type("MyList", (list,), {})([2])]),
+        Unregistered(A(1, 2)),
+    ],
+)
+def test_fallback(inst):
+    with pytest.raises(_NotATree):
+        _astuple_optree(inst, tuple, deepcopy, lambda k: k)
+    assert astuple(inst) == _astuple_inner(inst, tuple, None, None, deepcopy)
+
+
+def test_flatten_unflatten():
+    inst = make_inst()
+    leaves, treespec = flatten(inst)
+    assert leaves[:4] == [1, 2, None, 3]
+    assert unflatten(treespec, leaves) == inst
+
+
+def test_tree_map():
+    inst = A(D(1, [2, 3]), {"k": A(4, None)})
+    assert tree_map(lambda v: v * 10, inst) == A(D(10, [20, 30]), {"k": A(40, None)})
+    assert tree_map(lambda v, w: v + w, inst, inst) == A(
+        D(2, [4, 6]), {"k": A(8, None)}
+    )
+
+
+def test_unflatten_by_keywords():
+    from xattrs.attrs import field
+
+    @define
+    class K:
+        _private: int
+        computed: int = field(init=False, default=0)
+        kw: int = field(kw_only=True)
+
+    inst = K(1, kw=2)
+    inst.computed = 3
+    leaves, treespec = flatten(inst)
+    assert leaves == [1, 3, 2]
+    rebuilt = unflatten(treespec, [10, 30, 20])
+    assert (rebuilt._private, rebuilt.computed, rebuilt.kw) == (10, 0, 20)
+
+
+def test_struct_leaves_skip_flatten():
+    inst = Unregistered(A(1, 2))
+    _struct_leaves.discard(Unregistered)
+    assert astuple(inst) == ((1, 2),)
+    assert Unregistered in _struct_leaves
+    # registered classes which contain unregistered ones are not cached
+    assert A not in _struct_leaves
+    assert astuple(A(1, Unregistered(2))) == (1, (2,))
+
+
+def test_dict_order_not_global():
+    tree = {"b": 1, "a": 2}
+    assert flatten(tree)[0] == [1, 2]
+    # the mode of the namespace is only set while flattening
+    assert optree.tree_flatten(tree, namespace=NAMESPACE_STRUCT_DICT)[0] == [2, 1]
+    assert list(tree_map(str, tree)) == ["b", "a"]